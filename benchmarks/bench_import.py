@@ -0,0 +1,98 @@
+'''
+Cold import-time benchmark for the dydx package.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --max-ms 400
+
+Each sample imports a module in a fresh interpreter. Results are printed as
+JSON. The run exits with status 1 when a module pulls in one of the
+deferred dependencies (web3, eth_account, eth_keys) at import time, or when
+--max-ms is given and the median import time exceeds it.
+'''
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = ['dydx.client', 'dydx.solo_orders', 'dydx.perp_orders']
+
+# Dependencies that must only be imported when they are first used
+DEFERRED_MODULES = ['web3', 'eth_account', 'eth_keys']
+
+_SAMPLE = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'ms': elapsed * 1000,
+    'loaded': [name for name in {deferred!r} if name in sys.modules],
+}}))
+'''
+
+
+def sample(module):
+    '''
+    Returns the import time in milliseconds of module in a fresh interpreter
+    and the deferred dependencies it loaded.
+    '''
+    output = subprocess.check_output([
+        sys.executable,
+        '-c',
+        _SAMPLE.format(module=module, deferred=DEFERRED_MODULES),
+    ])
+    result = json.loads(output.decode('utf-8'))
+    return result['ms'], result['loaded']
+
+
+def run(modules=None, repeat=5):
+    results = {}
+    for module in modules or MODULES:
+        times = []
+        loaded = set()
+        for _ in range(repeat):
+            ms, sample_loaded = sample(module)
+            times.append(ms)
+            loaded.update(sample_loaded)
+        results[module] = {
+            'median_ms': round(statistics.median(times), 1),
+            'min_ms': round(min(times), 1),
+            'loaded': sorted(loaded),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('modules', nargs='*', help='modules, default all')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-ms', type=float)
+    parser.add_argument('--output', help='also write results to this file')
+    args = parser.parse_args(argv)
+
+    results = run(args.modules, args.repeat)
+    failures = {}
+    for module, result in results.items():
+        if result['loaded']:
+            failures[module] = 'imports ' + ', '.join(result['loaded'])
+        elif args.max_ms is not None and result['median_ms'] > args.max_ms:
+            failures[module] = 'median above %.1f ms' % args.max_ms
+    report = {
+        'python': sys.version.split(' ')[0],
+        'results': results,
+        'failures': failures,
+    }
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output + '\n')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+'''
+JSON codec benchmark over the recorded API payloads in tests/test_json.py.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_json
+    python -m benchmarks.bench_json --scale 100 --output results.json
+
+Every installed codec decodes and encodes each payload. Lists in the
+payloads are repeated --scale times so that the one or two recorded rows
+approach the size of a full page. Results are printed as JSON, in
+operations per second and as a speedup over the standard library.
+'''
+import argparse
+import json
+import sys
+import tests.test_json
+from benchmarks.bench_signing import _measure
+from dydx.json_codec import CODEC_NAMES, get_codec
+
+PAYLOADS = {
+    'get_orders': tests.test_json.mock_get_orders_json,
+    'get_fills': tests.test_json.mock_get_fills_json,
+    'get_trades': tests.test_json.mock_get_trades_json,
+    'get_markets': tests.test_json.mock_get_markets_json,
+    'get_balances': tests.test_json.mock_get_balances_json,
+    'place_order': tests.test_json.mock_place_order_json,
+}
+
+
+def scale_payload(payload, scale):
+    '''
+    Returns payload with every list repeated scale times.
+    '''
+    if isinstance(payload, dict):
+        return dict(
+            (key, scale_payload(value, scale))
+            for key, value in payload.items()
+        )
+    if isinstance(payload, list):
+        return [scale_payload(value, scale) for value in payload] * scale
+    return payload
+
+
+def get_codecs(names=None):
+    codecs = {}
+    for name in names or CODEC_NAMES:
+        try:
+            codecs[name] = get_codec(name)
+        except ImportError:
+            pass
+    return codecs
+
+
+def run(codec_names=None, scale=100, min_time=0.2, repeat=3):
+    codecs = get_codecs(codec_names)
+    results = {}
+    for payload_name, payload in sorted(PAYLOADS.items()):
+        payload = scale_payload(payload, scale)
+        data = json.dumps(payload).encode('utf-8')
+        for codec_name, codec in sorted(codecs.items()):
+            results['%s.loads.%s' % (payload_name, codec_name)] = _measure(
+                lambda: codec.loads(data), min_time, repeat,
+            )
+            results['%s.dumps.%s' % (payload_name, codec_name)] = _measure(
+                lambda: codec.dumps(payload), min_time, repeat,
+            )
+    return results
+
+
+def speedups(results):
+    '''
+    Returns the throughput of each case relative to the standard library.
+    '''
+    ratios = {}
+    for name, value in results.items():
+        baseline = results.get(name.rsplit('.', 1)[0] + '.json')
+        if baseline:
+            ratios[name] = round(value / baseline, 2)
+    return ratios
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('codecs', nargs='*',
+                        help='codecs, default all installed')
+    parser.add_argument('--scale', type=int, default=100)
+    parser.add_argument('--min-time', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='also write results to this file')
+    args = parser.parse_args(argv)
+    for name in args.codecs:
+        if name not in CODEC_NAMES:
+            parser.error('unknown codec %s, choose from %s'
+                         % (name, ', '.join(CODEC_NAMES)))
+
+    codec_names = args.codecs
+    if codec_names and 'json' not in codec_names:
+        codec_names = codec_names + ['json']
+    results = run(codec_names, args.scale, args.min_time, args.repeat)
+    report = {
+        'unit': 'ops_per_sec',
+        'python': sys.version.split(' ')[0],
+        'scale': args.scale,
+        'codecs': sorted(get_codecs(codec_names)),
+        'results': {name: round(value, 1) for name, value in results.items()},
+        'speedup': speedups(results),
+    }
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+'''
+Offline throughput benchmarks for order hashing and signing.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_signing
+    python -m benchmarks.bench_signing --output results.json
+    python -m benchmarks.bench_signing --update-baseline
+
+Results are printed as JSON. The run exits with status 1 when any case
+falls more than --tolerance below benchmarks/baseline.json. Baselines are
+machine specific; regenerate them with --update-baseline on the machine
+that enforces them.
+'''
+import argparse
+import json
+import os
+import sys
+import time
+import requests_mock
+import dydx.constants as consts
+import dydx.perp_orders as perp_orders
+import dydx.solo_orders as solo_orders
+import dydx.util as utils
+from decimal import Decimal
+from dydx.client import Client
+
+PRIVATE_KEY = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+ADDRESS_1 = '0x90F8bf6A479f320ead074411a4B0e7944Ea8c9C1'
+ADDRESS_2 = '0xFFcf8FDEE72ac11b5c542428B35EEF5769C409f0'
+ORDER_HASH = '0x50538cce27ddd08a8a3732aaedb90b5ef55fd92a6819f5798edc043833776405'  # noqa: E501
+SALT = 98520959837884420232461297527105290253597439542504267862519345092558369505856  # noqa: E501
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+SOLO_ORDER = {
+    'isBuy': True,
+    'baseMarket': 0,
+    'quoteMarket': 3,
+    'amount': 10000,
+    'limitPrice': Decimal('250.01'),
+    'triggerPrice': Decimal(0),
+    'limitFee': Decimal('0.0050'),
+    'makerAccountOwner': ADDRESS_1,
+    'makerAccountNumber': 111,
+    'expiration': 1234,
+    'salt': SALT,
+}
+
+PERP_ORDER = {
+    'isBuy': True,
+    'amount': 10000,
+    'limitPrice': Decimal('9123.45'),
+    'triggerPrice': Decimal(0),
+    'limitFee': Decimal('-0.00025'),
+    'maker': ADDRESS_1,
+    'taker': ADDRESS_2,
+    'expiration': 1234,
+    'salt': SALT,
+}
+
+
+def _measure(fn, min_time, repeat):
+    '''
+    Returns the best calls per second over `repeat` runs of at least
+    `min_time` seconds each.
+    '''
+    fn()
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            for _ in range(10):
+                fn()
+            calls += 10
+            elapsed = time.perf_counter() - start
+        best = max(best, calls / elapsed)
+    return best
+
+
+def _place_order_case(client, market, price):
+
+    def place_order():
+        client.place_order(
+            market=market,
+            side=consts.SIDE_BUY,
+            amount=10000,
+            price=price,
+        )
+
+    return place_order
+
+
+def get_cases(client):
+    signer = utils.Signer(PRIVATE_KEY)
+    cases = {
+        'solo_order_hash': lambda: solo_orders.get_order_hash(SOLO_ORDER),
+        'solo_order_sign': lambda: solo_orders.sign_order(SOLO_ORDER, signer),
+        'solo_cancel_hash':
+            lambda: solo_orders.get_cancel_order_hash(ORDER_HASH),
+        'perp_cancel_hash':
+            lambda: perp_orders.get_cancel_order_hash(ORDER_HASH),
+        'order_flags':
+            lambda: solo_orders.get_order_flags(SALT, True, Decimal('-1')),
+        'place_order_solo': _place_order_case(
+            client, consts.PAIR_WETH_DAI, Decimal('250.01'),
+        ),
+    }
+    for pair in consts.PERPETUAL_PAIRS:
+        name = pair.lower().replace('-', '_')
+        cases['perp_order_hash_' + name] = \
+            lambda pair=pair: perp_orders.get_order_hash(PERP_ORDER, pair)
+        cases['perp_order_sign_' + name] = \
+            lambda pair=pair: perp_orders.sign_order(PERP_ORDER, pair, signer)
+        cases['place_order_' + name] = _place_order_case(
+            client, pair, Decimal('9123.45'),
+        )
+    return cases
+
+
+def run(names=None, min_time=0.2, repeat=3):
+    client = Client(PRIVATE_KEY)
+    results = {}
+    with requests_mock.mock() as rm:
+        rm.post(Client.BASE_API_URI + '/v2/orders', json={'order': {}})
+        cases = get_cases(client)
+        for name in sorted(cases):
+            if names and name not in names:
+                continue
+            results[name] = _measure(cases[name], min_time, repeat)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    '''
+    Returns the cases whose throughput fell below the baseline by more than
+    the tolerance, as { name: (ops_per_sec, baseline_ops_per_sec) }.
+    '''
+    regressions = {}
+    for name, expected in baseline.items():
+        if name in results and results[name] < expected * (1 - tolerance):
+            regressions[name] = (results[name], expected)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('cases', nargs='*', help='cases to run, default all')
+    parser.add_argument('--output', help='also write results to this file')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=0.5)
+    parser.add_argument('--min-time', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args(argv)
+
+    results = run(args.cases, args.min_time, args.repeat)
+    report = {
+        'unit': 'ops_per_sec',
+        'python': sys.version.split(' ')[0],
+        'results': {name: round(value, 1) for name, value in results.items()},
+    }
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(report['results'], baseline_file, indent=2,
+                      sort_keys=True)
+            baseline_file.write('\n')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+        report['regressions'] = {
+            name: {'ops_per_sec': value, 'baseline': expected}
+            for name, (value, expected)
+            in compare(results, baseline, args.tolerance).items()
+        }
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output + '\n')
+    return 1 if report.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,338 @@
+import asyncio
+import functools
+import json
+import aiohttp
+import dydx.perp_orders as perp_orders
+import dydx.solo_orders as solo_orders
+import dydx.util as utils
+from dydx.client import Client, _PageCursor
+from .exceptions import DydxAPIError
+
+DEFAULT_CONNECTION_LIMIT = 100
+
+
+class _AsyncResponse(object):
+    '''
+    A fully read aiohttp response in the shape DydxAPIError expects.
+    '''
+
+    def __init__(self, response, text):
+        self.status_code = response.status
+        self.text = text
+        self.request = response.request_info
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncClient(Client):
+    '''
+    Client whose API methods are coroutines, and whose iter_* methods are
+    async generators. All requests go through one pooled aiohttp session, so
+    many calls can be in flight on one event loop. Order and cancel
+    signatures are computed in an executor so that signing does not block
+    the loop.
+
+    Use as an async context manager, or call close() when done.
+    '''
+
+    def __init__(
+        self,
+        private_key,
+        account_number=0,
+        node=None,
+        connection_limit=DEFAULT_CONNECTION_LIMIT,
+        executor=None,
+        response_cache=None,
+        json_codec=None,
+    ):
+        '''
+        :param connection_limit: optional, maximum number of simultaneous
+            connections in the session pool
+        :type connection_limit: number
+
+        :param executor: optional, executor to sign in, defaults to the
+            event loop's default executor
+        :type executor: concurrent.futures.Executor
+        '''
+        self.connection_limit = connection_limit
+        self.executor = executor
+        # The event loop only keeps weak references to tasks
+        self._refresh_tasks = set()
+        super(AsyncClient, self).__init__(
+            private_key,
+            account_number=account_number,
+            node=node,
+            response_cache=response_cache,
+            json_codec=json_codec,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    # -----------------------------------------------------------
+    # Helper Methods
+    # -----------------------------------------------------------
+
+    def _init_session(self):
+        # The aiohttp session must be created inside the running event loop
+        return None
+
+    def _get_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers={
+                    'Accept': 'application/json',
+                    'Content-Type': 'application/json',
+                    'User-Agent': 'dydx/python'
+                },
+                connector=aiohttp.TCPConnector(limit=self.connection_limit),
+            )
+        return self.session
+
+    async def _request(self, method, uri, **kwargs):
+        complete_uri = self.BASE_API_URI + uri
+        session = self._get_session()
+        async with session.request(method, complete_uri, **kwargs) as response:
+            body = await response.read()
+            if not str(response.status).startswith('2'):
+                text = body.decode('utf-8', 'replace')
+                raise DydxAPIError(_AsyncResponse(response, text))
+        return self.json_codec.loads(body)
+
+    async def _get_records(self, uri, key, record_type):
+        response = await self._get(uri)
+        response[key] = record_type.from_json_list(response[key])
+        return response
+
+    async def _build_columns(self, columns, rows):
+        async for row in rows:
+            columns.append(row)
+        return columns
+
+    async def _get_cached(self, endpoint, uri):
+        cache = self.response_cache
+        if cache is None:
+            return await self._get(uri)
+        cached = cache.lookup(endpoint, uri)
+        if cached is None:
+            response = await self._get(uri)
+            cache.store(uri, response)
+            return response
+        response, is_stale = cached
+        if is_stale and cache.begin_refresh(uri):
+            task = asyncio.ensure_future(self._refresh_cached(uri))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(functools.partial(self._refresh_done, uri))
+        return response
+
+    async def _refresh_cached(self, uri):
+        response = None
+        try:
+            response = await self._get(uri)
+        except Exception:
+            # The stale response is served until it expires
+            pass
+        finally:
+            self.response_cache.end_refresh(uri, response)
+
+    def _refresh_done(self, uri, task):
+        self._refresh_tasks.discard(task)
+        if task.cancelled():
+            # A task cancelled before it started never reached end_refresh
+            self.response_cache.end_refresh(uri)
+
+    def _run_in_executor(self, fn, *args):
+        return asyncio.get_event_loop().run_in_executor(
+            self.executor,
+            functools.partial(fn, *args),
+        )
+
+    async def _cancel_orders(self, hashes, sign_cancel_orders, cancel_order,
+                             fallback):
+        if not hashes:
+            return {'orders': [], 'failures': []}
+
+        if self._use_batch_cancel(fallback):
+            signature = await self._run_in_executor(
+                sign_cancel_orders,
+                hashes,
+                self.signer,
+            )
+            try:
+                response = await self._delete(
+                    '/v2/orders',
+                    data=self.json_codec.dumps({'orderHashes': hashes}),
+                    headers=self._cancel_order_headers(signature)
+                )
+                response.setdefault('failures', [])
+                return response
+            except DydxAPIError as error:
+                self._check_batch_cancel_error(error, fallback)
+
+        results = await asyncio.gather(
+            *[cancel_order(hash) for hash in hashes],
+            return_exceptions=True
+        )
+        return self._merge_cancel_responses(hashes, results)
+
+    async def _iter_pages(self, fetch, get_rows, limit, startingBefore,
+                          prefetch, cursor='createdAt', key='uuid',
+                          record_type=None):
+        limit = self._page_limit(limit)
+        pages = _PageCursor(startingBefore, cursor, key)
+        next_page = None
+        try:
+            page = await fetch(limit, pages.startingBefore)
+            while True:
+                rows = get_rows(page)
+                has_more = len(rows) >= limit
+                rows = pages.take(rows, has_more)
+                if has_more and prefetch:
+                    next_page = asyncio.ensure_future(
+                        fetch(limit, pages.startingBefore)
+                    )
+                if record_type is not None:
+                    rows = map(record_type.from_json, rows)
+                for row in rows:
+                    yield row
+                if not has_more:
+                    return
+                if next_page is not None:
+                    page = await next_page
+                    next_page = None
+                else:
+                    page = await fetch(limit, pages.startingBefore)
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def close(self):
+        '''
+        Cancel any background cache refreshes, then close the HTTP session
+        and its pooled connections.
+        '''
+        if self._refresh_tasks:
+            tasks = list(self._refresh_tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    # -----------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------
+
+    async def sign_orders(
+        self,
+        specs,
+    ):
+        '''
+        Make and sign many orders at once. See Client.sign_orders.
+
+        :returns: list of Order, in the order of specs
+        '''
+        orders, digests = self._make_orders(specs)
+        signatures = await self._run_in_executor(
+            utils.sign_hashes,
+            digests,
+            self.signer,
+        )
+        for order, signature in zip(orders, signatures):
+            order['typedSignature'] = signature
+        return orders
+
+    async def place_order(
+        self,
+        market,
+        side,
+        amount,
+        price,
+        expiration=None,
+        limitFee=None,
+        fillOrKill=False,
+        postOnly=False,
+        clientId=None,
+        cancelAmountOnRevert=None,
+        cancelId=None,
+    ):
+        '''
+        Create an order. See Client.place_order.
+
+        :returns: Order
+
+        :raises: DydxAPIError
+        '''
+        order, digest = self._build_order(
+            market,
+            side,
+            amount,
+            price,
+            expiration,
+            limitFee,
+            postOnly,
+        )
+        order['typedSignature'] = await self._run_in_executor(
+            self.signer.sign_digest,
+            digest,
+        )
+        return await self._post('/v2/orders', data=self._make_place_order_body(
+            market,
+            order,
+            fillOrKill=fillOrKill,
+            postOnly=postOnly,
+            clientId=clientId,
+            cancelAmountOnRevert=cancelAmountOnRevert,
+            cancelId=cancelId,
+        ))
+
+    async def cancel_order(
+        self,
+        hash
+    ):
+        '''
+        Cancel an order in a solo market.
+
+        :param hash: required
+        :type hash: str
+
+        :returns: Order
+
+        :raises: DydxAPIError
+        '''
+        signature = await self._run_in_executor(
+            self.signer.sign_digest,
+            solo_orders.get_cancel_order_digest(hash),
+        )
+        return await self._delete(
+            '/v2/orders/' + hash,
+            headers=self._cancel_order_headers(signature)
+        )
+
+    async def cancel_perpetual_order(
+        self,
+        hash
+    ):
+        '''
+        Cancel an order in a perpetual market.
+
+        :param hash: required
+        :type hash: str
+
+        :returns: Order
+
+        :raises: DydxAPIError
+        '''
+        signature = await self._run_in_executor(
+            self.signer.sign_digest,
+            perp_orders.get_cancel_order_digest(hash),
+        )
+        return await self._delete(
+            '/v2/orders/' + hash,
+            headers=self._cancel_order_headers(signature)
+        )
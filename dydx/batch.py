@@ -0,0 +1,275 @@
+import json
+import threading
+import requests
+from eth_utils import to_checksum_address
+from web3.exceptions import BadFunctionCallOutput
+from dydx.contracts import get_call_data
+
+# Seconds before a batched HTTP request times out, as in web3
+DEFAULT_TIMEOUT = 10
+
+# One HTTP session per thread, as web3 keeps for its own requests
+_sessions = threading.local()
+
+
+def _to_block_param(block_identifier):
+    if isinstance(block_identifier, int):
+        return hex(block_identifier)
+    return block_identifier
+
+
+def _hex_to_int(value):
+    return int(value, 16)
+
+
+def _get_session():
+    session = getattr(_sessions, 'session', None)
+    if session is None:
+        session = _sessions.session = requests.Session()
+    return session
+
+
+def _get_type(output):
+    # Canonical type of an ABI input or output, with tuples spelled out
+    abi_type = output['type']
+    if not abi_type.startswith('tuple'):
+        return abi_type
+    return '(%s)%s' % (
+        ','.join(_get_type(component) for component in output['components']),
+        abi_type[len('tuple'):],
+    )
+
+
+def _checksum_addresses(abi_type, value):
+    # Decoded addresses are returned checksummed, as ContractFunction.call()
+    # does
+    if abi_type.endswith(']'):
+        item_type = abi_type[:abi_type.rindex('[')]
+        return type(value)(
+            _checksum_addresses(item_type, item) for item in value
+        )
+    if abi_type.startswith('('):
+        return type(value)(
+            _checksum_addresses(item_type, item)
+            for item_type, item in zip(_split_tuple(abi_type), value)
+        )
+    if abi_type == 'address':
+        return to_checksum_address(value)
+    return value
+
+
+def _split_tuple(abi_type):
+    # Component types of '(type1,type2,...)'
+    types = []
+    depth = 0
+    start = 1
+    for index, char in enumerate(abi_type[1:-1], 1):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            types.append(abi_type[start:index])
+            start = index + 1
+    types.append(abi_type[start:-1])
+    return types
+
+
+class RpcBatch(object):
+    '''
+    Queues JSON-RPC requests, mostly contract calls, and sends them to the
+    node in a single HTTP request. Results are decoded like
+    ContractFunction.call() and returned in the order the requests were
+    added.
+
+    Providers without an HTTP endpoint get the requests one at a time.
+    '''
+
+    def __init__(
+        self,
+        web3,
+        block_identifier='latest'
+    ):
+        '''
+        :param web3: required
+        :type web3: Web3
+
+        :param block_identifier: optional, block every call reads state
+            from, defaults to 'latest'
+        :type block_identifier: str or number
+        '''
+        self.web3 = web3
+        self.block_identifier = block_identifier
+        # (rpc method, params, decode)
+        self._requests = []
+
+    def __len__(self):
+        return len(self._requests)
+
+    # -----------------------------------------------------------
+    # Helper Methods
+    # -----------------------------------------------------------
+
+    def _decode_call(self, method, return_data):
+        output_types = [_get_type(output) for output in method.abi['outputs']]
+        try:
+            output_data = self.web3.codec.decode_abi(output_types, return_data)
+        except Exception as error:
+            raise BadFunctionCallOutput(
+                'Could not decode contract function call to %s with return '
+                'data: %s, output types: %s (%s)'
+                % (method.fn_name, return_data, output_types, error)
+            )
+        normalized_data = [
+            _checksum_addresses(output_type, value)
+            for output_type, value in zip(output_types, output_data)
+        ]
+        if len(normalized_data) == 1:
+            return normalized_data[0]
+        return normalized_data
+
+    def _send(self, requests):
+        endpoint_uri = getattr(self.web3.provider, 'endpoint_uri', None)
+        if endpoint_uri is None:
+            return [
+                self.web3.manager.request_blocking(method, params)
+                for method, params, _ in requests
+            ]
+
+        payload = [
+            {
+                'jsonrpc': '2.0',
+                'id': index,
+                'method': method,
+                'params': params,
+            }
+            for index, (method, params, _) in enumerate(requests)
+        ]
+        kwargs = dict(self.web3.provider.get_request_kwargs())
+        kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+        response = _get_session().post(
+            endpoint_uri,
+            data=json.dumps(payload).encode('utf-8'),
+            **kwargs
+        )
+        response.raise_for_status()
+        responses = response.json()
+        if isinstance(responses, dict):
+            # The node rejected the batch as a whole
+            raise ValueError(responses.get('error', responses))
+
+        results = [None] * len(requests)
+        for response in responses:
+            if 'error' in response:
+                raise ValueError(response['error'])
+            results[response['id']] = response['result']
+        return results
+
+    # -----------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------
+
+    def add_call(
+        self,
+        method,
+        options=None,
+        transform=None
+    ):
+        '''
+        Queue a contract call.
+
+        :param method: required, e.g. contract.functions.balanceOf(address)
+        :type method: ContractFunction
+
+        :param options: optional, call options such as 'from'
+        :type options: dict
+
+        :param transform: optional, applied to the decoded result
+        :type transform: function
+
+        :returns: number, the position of the result in execute()
+        '''
+        transaction = dict(options or {})
+        transaction['to'] = method.address
+        transaction['data'] = get_call_data(method)
+
+        def decode(result):
+            if isinstance(result, str):
+                result = bytes.fromhex(
+                    result[2:] if result[0:2] == '0x' else result
+                )
+            value = self._decode_call(method, bytes(result))
+            return value if transform is None else transform(value)
+
+        return self.add_rpc(
+            'eth_call',
+            [transaction, _to_block_param(self.block_identifier)],
+            transform=decode,
+        )
+
+    def add_balance(
+        self,
+        address,
+        transform=None
+    ):
+        '''
+        Queue a request for the ETH balance of an address in wei.
+
+        :param address: required
+        :type address: str (address)
+
+        :param transform: optional, applied to the balance
+        :type transform: function
+
+        :returns: number, the position of the result in execute()
+        '''
+        def decode(result):
+            balance = result if isinstance(result, int) else \
+                _hex_to_int(result)
+            return balance if transform is None else transform(balance)
+
+        return self.add_rpc(
+            'eth_getBalance',
+            [address, _to_block_param(self.block_identifier)],
+            transform=decode,
+        )
+
+    def add_rpc(
+        self,
+        method,
+        params,
+        transform=None
+    ):
+        '''
+        Queue any JSON-RPC request.
+
+        :param method: required, e.g. 'eth_blockNumber'
+        :type method: str
+
+        :param params: required
+        :type params: list
+
+        :param transform: optional, applied to the raw JSON result
+        :type transform: function
+
+        :returns: number, the position of the result in execute()
+        '''
+        self._requests.append((method, params, transform))
+        return len(self._requests) - 1
+
+    def execute(self):
+        '''
+        Send every queued request and clear the queue.
+
+        :returns: list of results, in the order the requests were added
+
+        :raises: ValueError if the node returned an error for any request
+        '''
+        requests, self._requests = self._requests, []
+        if not requests:
+            return []
+        results = self._send(requests)
+        return [
+            result if decode is None else decode(result)
+            for (_, _, decode), result in zip(requests, results)
+        ]
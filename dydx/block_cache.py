@@ -0,0 +1,159 @@
+import threading
+import time
+from dydx.contracts import get_call_data
+
+DEFAULT_BLOCK_POLL_INTERVAL = 1
+
+
+class BlockCache(object):
+    '''
+    Caches on-chain reads for the duration of one block.
+
+    Reads are pinned to the current block number and keyed by the contract
+    address and call data, so repeat reads within a block are served from
+    memory. The block number is polled at most once every
+    block_poll_interval seconds, and every entry is dropped when it changes.
+    All methods are thread safe.
+    '''
+
+    def __init__(
+        self,
+        web3,
+        block_poll_interval=DEFAULT_BLOCK_POLL_INTERVAL
+    ):
+        '''
+        :param web3: required
+        :type web3: Web3
+
+        :param block_poll_interval: optional, seconds a block number is
+            trusted before the node is asked again, defaults to 1
+        :type block_poll_interval: number
+        '''
+        self.web3 = web3
+        self.block_poll_interval = block_poll_interval
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._block_number = None
+        self._polled_at = None
+        # key => result, all read at _block_number
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    # -----------------------------------------------------------
+    # Helper Methods
+    # -----------------------------------------------------------
+
+    def _get(self, key, fetch):
+        block_number = self.get_block_number()
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        result = fetch(block_number)
+        with self._lock:
+            # Drop the result if the block changed while fetching
+            if block_number == self._block_number:
+                self._entries[key] = result
+        return result
+
+    # -----------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------
+
+    def get_block_number(self):
+        '''
+        Returns the latest block number, asking the node only when the
+        known one is older than block_poll_interval seconds.
+
+        :returns: number
+        '''
+        with self._lock:
+            if (
+                self._polled_at is not None and
+                time.monotonic() - self._polled_at < self.block_poll_interval
+            ):
+                return self._block_number
+        block_number = self.web3.eth.blockNumber
+        with self._lock:
+            self._polled_at = time.monotonic()
+            if block_number != self._block_number:
+                self._block_number = block_number
+                self._entries = {}
+            return self._block_number
+
+    def call(
+        self,
+        method,
+        options=None
+    ):
+        '''
+        Call a contract function at the current block, or return the result
+        of an identical call made earlier in the same block.
+
+        :param method: required
+        :type method: ContractFunction
+
+        :param options: optional, call options such as 'from'
+        :type options: dict
+
+        :returns: decoded result
+        '''
+        key = (
+            method.address.lower(),
+            get_call_data(method),
+            tuple(sorted((options or {}).items())),
+        )
+        return self._get(
+            key,
+            lambda block_number: method.call(
+                options,
+                block_identifier=block_number,
+            ),
+        )
+
+    def get_balance(
+        self,
+        address
+    ):
+        '''
+        Returns the ETH balance of an address in wei at the current block.
+
+        :param address: required
+        :type address: str (address)
+
+        :returns: number
+        '''
+        return self._get(
+            ('eth_getBalance', address.lower()),
+            lambda block_number: self.web3.eth.getBalance(
+                address,
+                block_number,
+            ),
+        )
+
+    def clear(self):
+        '''
+        Drop every cached read. The block number is asked for again on the
+        next read.
+        '''
+        with self._lock:
+            self._entries = {}
+            self._polled_at = None
+
+    def stats(self):
+        '''
+        :returns: dict with hits, misses, hit_rate, entries and block_number
+        '''
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'block_number': self._block_number,
+            }
@@ -1,34 +1,119 @@
-import json
 import random
+import threading
 import requests
 import dydx.util as utils
 import dydx.constants as consts
 import dydx.solo_orders as solo_orders
 import dydx.perp_orders as perp_orders
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
-from dydx.eth import Eth
+from dydx.json_codec import JsonCodec, get_codec
+from dydx.records import Fill, Order, Trade
 from .exceptions import DydxAPIError
 
+# Responses to a batched cancel that are retried as individual cancels
+BATCH_CANCEL_REJECTED_STATUS_CODES = (400, 404, 405, 501)
+
+# Responses that mean the API does not offer batched cancels at all
+BATCH_CANCEL_UNSUPPORTED_STATUS_CODES = (404, 405, 501)
+
+
+class _PageCursor(object):
+    '''
+    Where the next page of a paginated listing starts. startingBefore is
+    exclusive, so moving it to the last row's timestamp would skip the other
+    rows sharing that timestamp. Instead the next page starts one
+    millisecond later, and the rows already taken at that timestamp are
+    dropped from it.
+    '''
+
+    def __init__(self, startingBefore, cursor, key):
+        self.startingBefore = startingBefore
+        self.cursor = cursor
+        self.key = key
+        self._taken = frozenset()
+
+    def take(self, rows, has_more):
+        '''
+        :param rows: required, one page
+        :type rows: list of dict
+
+        :param has_more: required, whether another page follows
+        :type has_more: bool
+
+        :returns: list of the rows not taken from an earlier page
+        '''
+        cursor = self.cursor
+        key = self.key
+        taken = self._taken
+        if has_more:
+            last = rows[-1][cursor]
+            if rows[0][cursor] == last:
+                # A whole page of one timestamp cannot be paged within; move
+                # past it, as any further rows at that timestamp are beyond
+                # the API's reach
+                self.startingBefore = last
+                self._taken = frozenset()
+            else:
+                self.startingBefore = utils.iso_after(last)
+                self._taken = frozenset(
+                    row[key] for row in rows
+                    if row[cursor] == last and row.get(key) is not None
+                )
+        if taken:
+            rows = [row for row in rows if row.get(key) not in taken]
+        return rows
+
 
 class Client(object):
     BASE_API_URI = 'https://api.dydx.exchange'
+    CANCEL_ORDERS_MAX_WORKERS = 10
+    PAGE_LIMIT = 100
 
     def __init__(
         self,
         private_key,
         account_number=0,
-        node=None
+        node=None,
+        response_cache=None,
+        json_codec=None
     ):
-        self.private_key = utils.normalize_private_key(private_key)
+        self.signer = utils.Signer(private_key)
+        self.private_key = self.signer.private_key
         self.account_number = account_number
-        self.public_address = utils.private_key_to_address(self.private_key)
+        self.public_address = self.signer.address
         self.session = self._init_session()
-        self.eth = Eth(
-            node=node,
-            private_key=self.private_key,
-            public_address=self.public_address,
-            account_number=self.account_number
-        )
+        self.batch_cancel_supported = True
+        # Opt-in ResponseCache for market metadata
+        self.response_cache = response_cache
+        # Fastest installed JSON library unless a codec or name is given
+        self.json_codec = json_codec if isinstance(json_codec, JsonCodec) \
+            else get_codec(json_codec)
+        self.node = node
+        self._eth = None
+        self._eth_lock = threading.Lock()
+
+    @property
+    def eth(self):
+        '''
+        On-chain interface, created on first use so that clients which only
+        call the HTTP API do no blockchain work.
+
+        :returns: Eth
+        '''
+        if self._eth is None:
+            # web3 is only imported here, on first use
+            from dydx.eth import Eth
+            with self._eth_lock:
+                if self._eth is None:
+                    self._eth = Eth(
+                        node=self.node,
+                        private_key=self.private_key,
+                        public_address=self.public_address,
+                        account_number=self.account_number,
+                        signer=self.signer
+                    )
+        return self._eth
 
     # -----------------------------------------------------------
     # Helper Methods
@@ -48,7 +133,7 @@ class Client(object):
         response = getattr(self.session, method)(complete_uri, **kwargs)
         if not str(response.status_code).startswith('2'):
             raise DydxAPIError(response)
-        return response.json()
+        return self.json_codec.loads(response.content)
 
     def _get(self, *args, **kwargs):
         return self._request('get', *args, **kwargs)
@@ -62,7 +147,46 @@ class Client(object):
     def _delete(self, *args, **kwargs):
         return self._request('delete', *args, **kwargs)
 
-    def _make_solo_order(
+    def _get_records(self, uri, key, record_type):
+        response = self._get(uri)
+        response[key] = record_type.from_json_list(response[key])
+        return response
+
+    def _build_columns(self, columns, rows):
+        columns.extend(rows)
+        return columns
+
+    def _get_cached(self, endpoint, uri):
+        cache = self.response_cache
+        if cache is None:
+            return self._get(uri)
+        cached = cache.lookup(endpoint, uri)
+        if cached is None:
+            response = self._get(uri)
+            cache.store(uri, response)
+            return response
+        response, is_stale = cached
+        if is_stale and cache.begin_refresh(uri):
+            thread = threading.Thread(
+                target=self._refresh_cached,
+                args=(uri,),
+                name='dydx-response-cache',
+            )
+            thread.daemon = True
+            thread.start()
+        return response
+
+    def _refresh_cached(self, uri):
+        response = None
+        try:
+            response = self._get(uri)
+        except Exception:
+            # The stale response is served until it expires
+            pass
+        finally:
+            self.response_cache.end_refresh(uri, response)
+
+    def _build_solo_order(
         self,
         market,
         side,
@@ -73,7 +197,7 @@ class Client(object):
         postOnly=False,
     ):
         '''
-        Make an order object
+        Make an unsigned order object
 
         :param market: required
         :type market: str in list
@@ -120,11 +244,9 @@ class Client(object):
             'makerAccountNumber': self.account_number,
             'expiration': expiration or utils.epoch_in_four_weeks(),
         }
-        order['typedSignature'] = \
-            solo_orders.sign_order(order, self.private_key)
         return order
 
-    def _make_perp_order(
+    def _build_perp_order(
         self,
         market,
         side,
@@ -135,7 +257,7 @@ class Client(object):
         postOnly=False,
     ):
         '''
-        Make an order object
+        Make an unsigned order object
 
         :param market: required
         :type market: str in list [
@@ -182,14 +304,231 @@ class Client(object):
             'taker': consts.TAKER_ACCOUNT_OWNER,
             'expiration': expiration or utils.epoch_in_four_weeks(),
         }
-        order['typedSignature'] = \
-            perp_orders.sign_order(order, market, self.private_key)
         return order
 
+    def _build_order(self, market, *args, **kwargs):
+        '''
+        Make an unsigned order object for any market
+
+        :returns: (Order, bytes) the order and its signable hash
+        '''
+        if market in consts.PERPETUAL_PAIRS:
+            order = self._build_perp_order(market, *args, **kwargs)
+            return order, perp_orders.get_order_digest(order, market)
+        order = self._build_solo_order(market, *args, **kwargs)
+        return order, solo_orders.get_order_digest(order)
+
+    def _make_place_order_body(
+        self,
+        market,
+        order,
+        fillOrKill=False,
+        postOnly=False,
+        clientId=None,
+        cancelAmountOnRevert=None,
+        cancelId=None,
+    ):
+        '''
+        Make the JSON request body for placing a signed order
+        '''
+        if market in consts.PERPETUAL_PAIRS:
+
+            market_api_request = market
+
+            order_api_request = {
+                'isBuy': order['isBuy'],
+                'isDecreaseOnly': False,
+                'amount': str(order['amount']),
+                'limitPrice': utils.decimalToStr(order['limitPrice']),
+                'triggerPrice': utils.decimalToStr(order['triggerPrice']),
+                'limitFee': utils.decimalToStr(order['limitFee']),
+                'maker': order['maker'],
+                'taker': order['taker'],
+                'expiration': str(order['expiration']),
+                'salt': str(order['salt']),
+                'typedSignature': order['typedSignature'],
+            }
+
+        else:
+
+            market_api_request = None
+
+            order_api_request = {
+                'isBuy': order['isBuy'],
+                'isDecreaseOnly': False,
+                'baseMarket': str(order['baseMarket']),
+                'quoteMarket': str(order['quoteMarket']),
+                'amount': str(order['amount']),
+                'limitPrice': utils.decimalToStr(order['limitPrice']),
+                'triggerPrice': utils.decimalToStr(order['triggerPrice']),
+                'limitFee': utils.decimalToStr(order['limitFee']),
+                'makerAccountOwner': order['makerAccountOwner'],
+                'makerAccountNumber': str(order['makerAccountNumber']),
+                'expiration': str(order['expiration']),
+                'salt': str(order['salt']),
+                'typedSignature': order['typedSignature'],
+            }
+
+        return self.json_codec.dumps(
+            utils.remove_nones({
+                'fillOrKill': fillOrKill,
+                'postOnly': postOnly,
+                'clientId': clientId,
+                'cancelAmountOnRevert': cancelAmountOnRevert,
+                'cancelId': cancelId,
+                'market': market_api_request,
+                'order': order_api_request
+            })
+        )
+
+    def _make_orders(self, specs):
+        '''
+        Make unsigned order objects for a list of order specs
+
+        :returns: (Order[], bytes[]) the orders and their signable hashes
+        '''
+        orders = []
+        digests = []
+        for spec in specs:
+            order, digest = self._build_order(**spec)
+            orders.append(order)
+            digests.append(digest)
+        return orders, digests
+
+    def _cancel_order_headers(self, signature):
+        return {'Authorization': 'Bearer ' + signature}
+
+    def _use_batch_cancel(self, fallback):
+        return self.batch_cancel_supported or not fallback
+
+    def _check_batch_cancel_error(self, error, fallback):
+        '''
+        Re-raise a failed batched cancel unless it should be retried as
+        individual cancels
+        '''
+        if (
+            not fallback or
+            error.status_code not in BATCH_CANCEL_REJECTED_STATUS_CODES
+        ):
+            raise error
+        if error.status_code in BATCH_CANCEL_UNSUPPORTED_STATUS_CODES:
+            self.batch_cancel_supported = False
+
+    def _merge_cancel_responses(self, hashes, results):
+        '''
+        Combine individual cancel responses, keeping the errors of the ones
+        that failed rather than discarding the ones that succeeded
+        '''
+        orders = []
+        failures = []
+        for hash, result in zip(hashes, results):
+            if isinstance(result, Exception):
+                failures.append({'hash': hash, 'error': result})
+            else:
+                orders.extend(result['orders'])
+        return {'orders': orders, 'failures': failures}
+
+    def _cancel_orders(self, hashes, sign_cancel_orders, cancel_order,
+                       fallback):
+        if not hashes:
+            return {'orders': [], 'failures': []}
+
+        if self._use_batch_cancel(fallback):
+            signature = sign_cancel_orders(hashes, self.signer)
+            try:
+                response = self._delete(
+                    '/v2/orders',
+                    data=self.json_codec.dumps({'orderHashes': hashes}),
+                    headers=self._cancel_order_headers(signature)
+                )
+                response.setdefault('failures', [])
+                return response
+            except DydxAPIError as error:
+                self._check_batch_cancel_error(error, fallback)
+
+        def cancel(hash):
+            try:
+                return cancel_order(hash)
+            except Exception as error:
+                return error
+
+        max_workers = min(len(hashes), self.CANCEL_ORDERS_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(cancel, hashes))
+        return self._merge_cancel_responses(hashes, results)
+
+    def _iter_pages(self, fetch, get_rows, limit, startingBefore, prefetch,
+                    cursor='createdAt', key='uuid', record_type=None):
+        '''
+        Yield the rows of successive pages until a page comes back short,
+        using a _PageCursor to choose where each page starts. Rows are
+        converted to record_type when one is given.
+        '''
+        limit = self._page_limit(limit)
+        pages = _PageCursor(startingBefore, cursor, key)
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = fetch(limit, pages.startingBefore)
+            while True:
+                rows = get_rows(page)
+                has_more = len(rows) >= limit
+                rows = pages.take(rows, has_more)
+                if has_more and executor is not None:
+                    next_page = executor.submit(
+                        fetch,
+                        limit,
+                        pages.startingBefore,
+                    )
+                if record_type is not None:
+                    rows = map(record_type.from_json, rows)
+                for row in rows:
+                    yield row
+                if not has_more:
+                    return
+                if executor is not None:
+                    page = next_page.result()
+                else:
+                    page = fetch(limit, pages.startingBefore)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def _page_limit(self, limit):
+        # The API returns at most PAGE_LIMIT rows, so a larger page size
+        # would make the first page look like the last
+        if limit is None:
+            return self.PAGE_LIMIT
+        return min(limit, self.PAGE_LIMIT)
+
     # -----------------------------------------------------------
     # Public API
     # -----------------------------------------------------------
 
+    def sign_orders(
+        self,
+        specs,
+        executor=None,
+    ):
+        '''
+        Make and sign many orders at once, optionally across a process pool
+
+        :param specs: required
+        :type specs: list of dict, each with the keys market, side, amount,
+            price and optionally expiration, limitFee and postOnly as taken
+            by place_order
+
+        :param executor: optional, a concurrent.futures.ProcessPoolExecutor
+            to sign across, defaults to signing serially
+        :type executor: concurrent.futures.Executor
+
+        :returns: list of Order, in the order of specs
+        '''
+        orders, digests = self._make_orders(specs)
+        signatures = utils.sign_hashes(digests, self.signer, executor)
+        for order, signature in zip(orders, signatures):
+            order['typedSignature'] = signature
+        return orders
+
     def get_pairs(
         self
     ):
@@ -200,7 +539,7 @@ class Client(object):
 
         :raises: DydxAPIError
         '''
-        return self._get('/v2/markets')
+        return self._get_cached('get_pairs', '/v2/markets')
 
     def get_my_balances(
         self
@@ -273,7 +612,8 @@ class Client(object):
         market,
         limit=None,
         startingBefore=None,
-        status=None
+        status=None,
+        records=False
     ):
         '''
         Return open orders for the loaded account
@@ -303,6 +643,9 @@ class Client(object):
              "CANCELED",
              "UNTRIGGERED"]
 
+        :param records: optional, see get_orders
+        :type records: bool
+
         :returns: list of existing orders
 
         :raises: DydxAPIError
@@ -313,7 +656,8 @@ class Client(object):
             accountOwner=self.public_address,
             accountNumber=self.account_number,
             limit=limit,
-            startingBefore=startingBefore
+            startingBefore=startingBefore,
+            records=records
         )
 
     def get_orders(
@@ -326,6 +670,7 @@ class Client(object):
         accountNumber=None,
         limit=None,
         startingBefore=None,
+        records=False,
     ):
         '''
         Returns all open orders
@@ -368,6 +713,10 @@ class Client(object):
         :param startingBefore: optional, defaults to now
         :type startingBefore: str date and time (ISO-8601)
 
+        :param records: optional, return the orders as compact Order records
+            instead of dicts, defaults to False
+        :type records: bool
+
         :returns: list of existing orders
 
         :raises: DydxAPIError
@@ -382,8 +731,63 @@ class Client(object):
             'limit': limit,
             'startingBefore': startingBefore
         })
+        if records:
+            return self._get_records('/v2/orders' + params, 'orders', Order)
         return self._get('/v2/orders' + params)
 
+    def iter_orders(
+        self,
+        market=None,
+        side=None,
+        status=None,
+        orderType=None,
+        accountOwner=None,
+        accountNumber=None,
+        limit=None,
+        startingBefore=None,
+        prefetch=False,
+        records=False,
+    ):
+        '''
+        Iterate over all orders matching the filters, newest first, fetching
+        one page at a time. Takes the same filters as get_orders.
+
+        :param limit: optional, page size, defaults to and at most 100
+        :type limit: number
+
+        :param startingBefore: optional, defaults to now
+        :type startingBefore: str date and time (ISO-8601)
+
+        :param prefetch: optional, fetch the next page on a background thread
+            while the current one is consumed, defaults to False
+        :type prefetch: bool
+
+        :param records: optional, yield compact Order records instead of
+            dicts, defaults to False
+        :type records: bool
+
+        :returns: generator of orders
+
+        :raises: DydxAPIError
+        '''
+        return self._iter_pages(
+            lambda limit, startingBefore: self.get_orders(
+                market=market,
+                side=side,
+                status=status,
+                orderType=orderType,
+                accountOwner=accountOwner,
+                accountNumber=accountNumber,
+                limit=limit,
+                startingBefore=startingBefore,
+            ),
+            lambda page: page['orders'],
+            limit,
+            startingBefore,
+            prefetch,
+            record_type=Order if records else None,
+        )
+
     def get_order(
         self,
         orderId,
@@ -404,7 +808,8 @@ class Client(object):
         self,
         market,
         limit=None,
-        startingBefore=None
+        startingBefore=None,
+        records=False
     ):
         '''
         Return historical fills for the loaded account
@@ -425,6 +830,9 @@ class Client(object):
         :param startingBefore: optional, defaults to now
         :type startingBefore: str date and time (ISO-8601)
 
+        :param records: optional, see get_fills
+        :type records: bool
+
         :returns: list of processed fills
 
         :raises: DydxAPIError
@@ -435,7 +843,8 @@ class Client(object):
             accountNumber=self.account_number,
             transactionHash=None,
             limit=limit,
-            startingBefore=startingBefore
+            startingBefore=startingBefore,
+            records=records
         )
 
     def get_fills(
@@ -447,6 +856,7 @@ class Client(object):
         transactionHash=None,
         limit=None,
         startingBefore=None,
+        records=False,
     ):
         '''
         Returns all historical fills
@@ -479,6 +889,10 @@ class Client(object):
         :param startingBefore: optional, defaults to now
         :type startingBefore: str date and time (ISO-8601)
 
+        :param records: optional, return the fills as compact Fill records
+            instead of dicts, defaults to False
+        :type records: bool
+
         :returns: list of existing fills
 
         :raises: DydxAPIError
@@ -492,8 +906,105 @@ class Client(object):
             'limit': limit,
             'startingBefore': startingBefore
         })
+        if records:
+            return self._get_records('/v2/fills' + params, 'fills', Fill)
         return self._get('/v2/fills' + params)
 
+    def iter_fills(
+        self,
+        market=None,
+        side=None,
+        accountOwner=None,
+        accountNumber=None,
+        transactionHash=None,
+        limit=None,
+        startingBefore=None,
+        prefetch=False,
+        records=False,
+    ):
+        '''
+        Iterate over all fills matching the filters, newest first, fetching
+        one page at a time. Takes the same filters as get_fills.
+
+        :param limit: optional, page size, defaults to and at most 100
+        :type limit: number
+
+        :param startingBefore: optional, defaults to now
+        :type startingBefore: str date and time (ISO-8601)
+
+        :param prefetch: optional, fetch the next page on a background thread
+            while the current one is consumed, defaults to False
+        :type prefetch: bool
+
+        :param records: optional, yield compact Fill records instead of
+            dicts, defaults to False
+        :type records: bool
+
+        :returns: generator of fills
+
+        :raises: DydxAPIError
+        '''
+        return self._iter_pages(
+            lambda limit, startingBefore: self.get_fills(
+                market=market,
+                side=side,
+                accountOwner=accountOwner,
+                accountNumber=accountNumber,
+                transactionHash=transactionHash,
+                limit=limit,
+                startingBefore=startingBefore,
+            ),
+            lambda page: page['fills'],
+            limit,
+            startingBefore,
+            prefetch,
+            record_type=Fill if records else None,
+        )
+
+    def get_fill_columns(
+        self,
+        market=None,
+        side=None,
+        accountOwner=None,
+        accountNumber=None,
+        transactionHash=None,
+        limit=None,
+        startingBefore=None,
+        prefetch=False,
+        exact=False,
+        columns=None,
+    ):
+        '''
+        Collect all fills matching the filters into NumPy column arrays.
+        Takes the same filters as iter_fills. Requires
+        `pip install dydx-python[numpy]`.
+
+        :param exact: optional, keep prices and amounts as Decimal objects
+            instead of float64, defaults to False
+        :type exact: bool
+
+        :param columns: optional, a ColumnBuilder from an earlier call to
+            add these fills to, defaults to a new one
+        :type columns: ColumnBuilder
+
+        :returns: ColumnBuilder with the columns of FILL_COLUMNS
+
+        :raises: DydxAPIError
+        '''
+        from dydx.columns import ColumnBuilder, FILL_COLUMNS
+        if columns is None:
+            columns = ColumnBuilder(FILL_COLUMNS, exact=exact)
+        return self._build_columns(columns, self.iter_fills(
+            market=market,
+            side=side,
+            accountOwner=accountOwner,
+            accountNumber=accountNumber,
+            transactionHash=transactionHash,
+            limit=limit,
+            startingBefore=startingBefore,
+            prefetch=prefetch,
+        ))
+
     def get_trades(
         self,
         market=None,
@@ -503,6 +1014,7 @@ class Client(object):
         transactionHash=None,
         limit=None,
         startingBefore=None,
+        records=False,
     ):
         '''
         Returns all historical trades
@@ -535,6 +1047,10 @@ class Client(object):
         :param startingBefore: optional, defaults to now
         :type startingBefore: str date and time (ISO-8601)
 
+        :param records: optional, return the trades as compact Trade records
+            instead of dicts, defaults to False
+        :type records: bool
+
         :returns: list of existing trades
 
         :raises: DydxAPIError
@@ -548,13 +1064,111 @@ class Client(object):
             'limit': limit,
             'startingBefore': startingBefore,
         })
+        if records:
+            return self._get_records('/v2/trades' + params, 'trades', Trade)
         return self._get('/v2/trades' + params)
 
+    def iter_trades(
+        self,
+        market=None,
+        side=None,
+        accountOwner=None,
+        accountNumber=None,
+        transactionHash=None,
+        limit=None,
+        startingBefore=None,
+        prefetch=False,
+        records=False,
+    ):
+        '''
+        Iterate over all trades matching the filters, newest first, fetching
+        one page at a time. Takes the same filters as get_trades.
+
+        :param limit: optional, page size, defaults to and at most 100
+        :type limit: number
+
+        :param startingBefore: optional, defaults to now
+        :type startingBefore: str date and time (ISO-8601)
+
+        :param prefetch: optional, fetch the next page on a background thread
+            while the current one is consumed, defaults to False
+        :type prefetch: bool
+
+        :param records: optional, yield compact Trade records instead of
+            dicts, defaults to False
+        :type records: bool
+
+        :returns: generator of trades
+
+        :raises: DydxAPIError
+        '''
+        return self._iter_pages(
+            lambda limit, startingBefore: self.get_trades(
+                market=market,
+                side=side,
+                accountOwner=accountOwner,
+                accountNumber=accountNumber,
+                transactionHash=transactionHash,
+                limit=limit,
+                startingBefore=startingBefore,
+            ),
+            lambda page: page['trades'],
+            limit,
+            startingBefore,
+            prefetch,
+            record_type=Trade if records else None,
+        )
+
+    def get_trade_columns(
+        self,
+        market=None,
+        side=None,
+        accountOwner=None,
+        accountNumber=None,
+        transactionHash=None,
+        limit=None,
+        startingBefore=None,
+        prefetch=False,
+        exact=False,
+        columns=None,
+    ):
+        '''
+        Collect all trades matching the filters into NumPy column arrays.
+        Takes the same filters as iter_trades. Requires
+        `pip install dydx-python[numpy]`.
+
+        :param exact: optional, keep prices and amounts as Decimal objects
+            instead of float64, defaults to False
+        :type exact: bool
+
+        :param columns: optional, a ColumnBuilder from an earlier call to
+            add these trades to, defaults to a new one
+        :type columns: ColumnBuilder
+
+        :returns: ColumnBuilder with the columns of TRADE_COLUMNS
+
+        :raises: DydxAPIError
+        '''
+        from dydx.columns import ColumnBuilder, TRADE_COLUMNS
+        if columns is None:
+            columns = ColumnBuilder(TRADE_COLUMNS, exact=exact)
+        return self._build_columns(columns, self.iter_trades(
+            market=market,
+            side=side,
+            accountOwner=accountOwner,
+            accountNumber=accountNumber,
+            transactionHash=transactionHash,
+            limit=limit,
+            startingBefore=startingBefore,
+            prefetch=prefetch,
+        ))
+
     def get_my_trades(
         self,
         market,
         limit=None,
-        startingBefore=None
+        startingBefore=None,
+        records=False
     ):
         '''
         Return historical trades for the loaded account
@@ -568,6 +1182,9 @@ class Client(object):
         :param startingBefore: optional, defaults to now
         :type startingBefore: str date and time (ISO-8601)
 
+        :param records: optional, see get_trades
+        :type records: bool
+
         :returns: list of processed trades
 
         :raises: DydxAPIError
@@ -577,7 +1194,8 @@ class Client(object):
             accountOwner=self.public_address,
             accountNumber=self.account_number,
             limit=limit,
-            startingBefore=startingBefore
+            startingBefore=startingBefore,
+            records=records
         )
 
     def place_order(
@@ -642,78 +1260,24 @@ class Client(object):
         :raises: DydxAPIError
         '''
 
-        if market in [
-            consts.PAIR_PBTC_USDC,
-            consts.PAIR_PLINK_USDC,
-            consts.PAIR_WETH_PUSD,
-        ]:
-
-            order = self._make_perp_order(
-                market,
-                side,
-                amount,
-                price,
-                expiration,
-                limitFee,
-                postOnly,
-            )
-
-            market_api_request = market
-
-            order_api_request = {
-                'isBuy': order['isBuy'],
-                'isDecreaseOnly': False,
-                'amount': str(order['amount']),
-                'limitPrice': utils.decimalToStr(order['limitPrice']),
-                'triggerPrice': utils.decimalToStr(order['triggerPrice']),
-                'limitFee': utils.decimalToStr(order['limitFee']),
-                'maker': order['maker'],
-                'taker': order['taker'],
-                'expiration': str(order['expiration']),
-                'salt': str(order['salt']),
-                'typedSignature': order['typedSignature'],
-            }
-
-        else:
-
-            order = self._make_solo_order(
-                market,
-                side,
-                amount,
-                price,
-                expiration,
-                limitFee,
-                postOnly,
-            )
-
-            market_api_request = None
-
-            order_api_request = {
-                'isBuy': order['isBuy'],
-                'isDecreaseOnly': False,
-                'baseMarket': str(order['baseMarket']),
-                'quoteMarket': str(order['quoteMarket']),
-                'amount': str(order['amount']),
-                'limitPrice': utils.decimalToStr(order['limitPrice']),
-                'triggerPrice': utils.decimalToStr(order['triggerPrice']),
-                'limitFee': utils.decimalToStr(order['limitFee']),
-                'makerAccountOwner': order['makerAccountOwner'],
-                'makerAccountNumber': str(order['makerAccountNumber']),
-                'expiration': str(order['expiration']),
-                'salt': str(order['salt']),
-                'typedSignature': order['typedSignature'],
-            }
-
-        return self._post('/v2/orders', data=json.dumps(
-            utils.remove_nones({
-                'fillOrKill': fillOrKill,
-                'postOnly': postOnly,
-                'clientId': clientId,
-                'cancelAmountOnRevert': cancelAmountOnRevert,
-                'cancelId': cancelId,
-                'market': market_api_request,
-                'order': order_api_request
-            })
+        order, digest = self._build_order(
+            market,
+            side,
+            amount,
+            price,
+            expiration,
+            limitFee,
+            postOnly,
+        )
+        order['typedSignature'] = self.signer.sign_digest(digest)
+        return self._post('/v2/orders', data=self._make_place_order_body(
+            market,
+            order,
+            fillOrKill=fillOrKill,
+            postOnly=postOnly,
+            clientId=clientId,
+            cancelAmountOnRevert=cancelAmountOnRevert,
+            cancelId=cancelId,
         ))
 
     def cancel_order(
@@ -730,10 +1294,10 @@ class Client(object):
 
         :raises: DydxAPIError
         '''
-        signature = solo_orders.sign_cancel_order(hash, self.private_key)
+        signature = solo_orders.sign_cancel_order(hash, self.signer)
         return self._delete(
             '/v2/orders/' + hash,
-            headers={'Authorization': 'Bearer ' + signature}
+            headers=self._cancel_order_headers(signature)
         )
 
     def cancel_perpetual_order(
@@ -750,10 +1314,68 @@ class Client(object):
 
         :raises: DydxAPIError
         '''
-        signature = perp_orders.sign_cancel_order(hash, self.private_key)
+        signature = perp_orders.sign_cancel_order(hash, self.signer)
         return self._delete(
             '/v2/orders/' + hash,
-            headers={'Authorization': 'Bearer ' + signature}
+            headers=self._cancel_order_headers(signature)
+        )
+
+    def cancel_orders(
+        self,
+        hashes,
+        fallback=True
+    ):
+        '''
+        Cancel many orders in solo markets with one signature and one request.
+
+        If the API rejects the batched request and fallback is set, the orders
+        are cancelled with individual requests sent concurrently instead.
+        After the API has reported that it does not support batched cancels,
+        later calls go straight to individual requests. An individual cancel
+        that fails does not stop the others; its hash and exception are
+        listed in failures.
+
+        :param hashes: required
+        :type hashes: list of str
+
+        :param fallback: optional, defaults to True
+        :type fallback: bool
+
+        :returns: { orders: Order[], failures: { hash: str, error }[] }
+
+        :raises: DydxAPIError
+        '''
+        return self._cancel_orders(
+            hashes,
+            solo_orders.sign_cancel_orders,
+            self.cancel_order,
+            fallback,
+        )
+
+    def cancel_perpetual_orders(
+        self,
+        hashes,
+        fallback=True
+    ):
+        '''
+        Cancel many orders in perpetual markets with one signature and one
+        request. Falls back like cancel_orders.
+
+        :param hashes: required
+        :type hashes: list of str
+
+        :param fallback: optional, defaults to True
+        :type fallback: bool
+
+        :returns: { orders: Order[], failures: { hash: str, error }[] }
+
+        :raises: DydxAPIError
+        '''
+        return self._cancel_orders(
+            hashes,
+            perp_orders.sign_cancel_orders,
+            self.cancel_perpetual_order,
+            fallback,
         )
 
     def get_orderbook(
@@ -786,7 +1408,7 @@ class Client(object):
 
         :raises: DydxAPIError
         '''
-        return self._get('/v2/markets/' + market)
+        return self._get_cached('get_market', '/v2/markets/' + market)
 
     def get_markets(
         self
@@ -798,7 +1420,7 @@ class Client(object):
 
         :raises: DydxAPIError
         '''
-        return self._get('/v2/markets')
+        return self._get_cached('get_markets', '/v2/markets')
 
     def get_perpetual_market(
         self,
@@ -818,7 +1440,10 @@ class Client(object):
 
         :raises: DydxAPIError
         '''
-        return self._get('/v1/perpetual-markets/' + market)
+        return self._get_cached(
+            'get_perpetual_market',
+            '/v1/perpetual-markets/' + market,
+        )
 
     def get_perpetual_markets(
         self
@@ -830,7 +1455,10 @@ class Client(object):
 
         :raises: DydxAPIError
         '''
-        return self._get('/v1/perpetual-markets')
+        return self._get_cached(
+            'get_perpetual_markets',
+            '/v1/perpetual-markets',
+        )
 
     def get_funding_rates(
         self,
@@ -902,6 +1530,106 @@ class Client(object):
             '/v1/historical-funding-rates' + params,
         )
 
+    def iter_historical_funding_rates(
+        self,
+        market,
+        limit=None,
+        startingBefore=None,
+        prefetch=False,
+    ):
+        '''
+        Iterate over the funding rate history of one market, newest first,
+        fetching one page at a time.
+
+        :param market: required
+        :type market: str in list [
+            "PBTC-USDC",
+            "PLINK-USDC",
+            "WETH-PUSD",
+        ]
+
+        :param limit: optional, page size, defaults to and at most 100
+        :type limit: number
+
+        :param startingBefore: optional, defaults to now
+        :type startingBefore: str date and time (ISO-8601)
+
+        :param prefetch: optional, fetch the next page on a background thread
+            while the current one is consumed, defaults to False
+        :type prefetch: bool
+
+        :returns: generator of FundingRate
+
+        :raises: DydxAPIError
+        '''
+        return self._iter_pages(
+            lambda limit, startingBefore: self.get_historical_funding_rates(
+                markets=[market],
+                limit=limit,
+                startingBefore=startingBefore,
+            ),
+            lambda page: page[market]['history'],
+            limit,
+            startingBefore,
+            prefetch,
+            cursor='effectiveAt',
+            key='effectiveAt',
+        )
+
+    def get_historical_funding_rate_columns(
+        self,
+        market,
+        limit=None,
+        startingBefore=None,
+        prefetch=False,
+        exact=False,
+        columns=None,
+    ):
+        '''
+        Collect the funding rate history of one market into NumPy column
+        arrays. Requires `pip install dydx-python[numpy]`.
+
+        :param market: required
+        :type market: str in list [
+            "PBTC-USDC",
+            "PLINK-USDC",
+            "WETH-PUSD",
+        ]
+
+        :param limit: optional, page size, defaults to and at most 100
+        :type limit: number
+
+        :param startingBefore: optional, defaults to now
+        :type startingBefore: str date and time (ISO-8601)
+
+        :param prefetch: optional, see iter_historical_funding_rates
+        :type prefetch: bool
+
+        :param exact: optional, keep rates and prices as Decimal objects
+            instead of float64, defaults to False
+        :type exact: bool
+
+        :param columns: optional, a ColumnBuilder from an earlier call to
+            add this history to, defaults to a new one
+        :type columns: ColumnBuilder
+
+        :returns: ColumnBuilder with the columns of FUNDING_RATE_COLUMNS
+
+        :raises: DydxAPIError
+        '''
+        from dydx.columns import ColumnBuilder, FUNDING_RATE_COLUMNS
+        if columns is None:
+            columns = ColumnBuilder(FUNDING_RATE_COLUMNS, exact=exact)
+        return self._build_columns(
+            columns,
+            self.iter_historical_funding_rates(
+                market,
+                limit=limit,
+                startingBefore=startingBefore,
+                prefetch=prefetch,
+            ),
+        )
+
     def get_funding_index_price(
         self,
         markets=None,
@@ -0,0 +1,274 @@
+import threading
+import dydx.constants as consts
+from concurrent.futures import ThreadPoolExecutor
+from sortedcontainers import SortedList
+
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_POLL_INTERVAL = 5
+
+
+class CollateralizationScanner(object):
+    '''
+    Tracks the collateralization of many Solo accounts.
+
+    Each scan reads getAccountValues for every account at one block, in
+    chunks sent as JSON-RPC batches from a thread pool. Accounts are kept
+    ordered by their distance to MINIMUM_COLLATERALIZATION, riskiest first,
+    and an account is only re-sorted when its value changes.
+    '''
+
+    def __init__(
+        self,
+        eth,
+        accounts=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        max_workers=DEFAULT_MAX_WORKERS,
+        minimum=consts.MINIMUM_COLLATERALIZATION
+    ):
+        '''
+        :param eth: required
+        :type eth: Eth
+
+        :param accounts: optional
+        :type accounts: list of (owner address, account number)
+
+        :param chunk_size: optional, accounts per JSON-RPC batch
+        :type chunk_size: number
+
+        :param max_workers: optional, batches in flight at once
+        :type max_workers: number
+
+        :param minimum: optional, defaults to MINIMUM_COLLATERALIZATION
+        :type minimum: number
+        '''
+        self.eth = eth
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.minimum = minimum
+        self.block_number = None
+        self._accounts = []
+        self._tracked = set()
+        self._lock = threading.Lock()
+        # account => collateralization
+        self._values = {}
+        # (distance to minimum, account), riskiest first
+        self._ranking = SortedList()
+        self._stop_event = None
+        self._thread = None
+        if accounts is not None:
+            self.add_accounts(accounts)
+
+    def __len__(self):
+        return len(self._accounts)
+
+    # -----------------------------------------------------------
+    # Helper Methods
+    # -----------------------------------------------------------
+
+    def _fetch_chunk(self, accounts, block_number):
+        batch = self.eth.batch(block_identifier=block_number)
+        for owner, number in accounts:
+            self.eth.solo.get_collateralization(owner, number, batch=batch)
+        return list(zip(accounts, batch.execute()))
+
+    def _set_value(self, account, value):
+        previous = self._values.get(account)
+        if previous == value:
+            return False
+        if previous is not None:
+            self._ranking.remove((previous - self.minimum, account))
+        self._values[account] = value
+        self._ranking.add((value - self.minimum, account))
+        return True
+
+    def _run(self, interval, callback, stop_event):
+        while not stop_event.is_set():
+            try:
+                changed = self.refresh()
+            except Exception:
+                # Keep the last values and try again on the next poll
+                changed = None
+            if changed and callback is not None:
+                callback(self)
+            stop_event.wait(interval)
+
+    # -----------------------------------------------------------
+    # Accounts
+    # -----------------------------------------------------------
+
+    def add_accounts(
+        self,
+        accounts
+    ):
+        '''
+        Start tracking accounts. They are read on the next scan.
+
+        :param accounts: required
+        :type accounts: list of (owner address, account number)
+        '''
+        with self._lock:
+            for account in accounts:
+                account = (account[0], account[1])
+                if account not in self._tracked:
+                    self._tracked.add(account)
+                    self._accounts.append(account)
+
+    def remove_accounts(
+        self,
+        accounts
+    ):
+        '''
+        Stop tracking accounts.
+
+        :param accounts: required
+        :type accounts: list of (owner address, account number)
+        '''
+        with self._lock:
+            removed = set((account[0], account[1]) for account in accounts)
+            self._tracked -= removed
+            self._accounts = [
+                account for account in self._accounts
+                if account not in removed
+            ]
+            for account in removed:
+                value = self._values.pop(account, None)
+                if value is not None:
+                    self._ranking.remove((value - self.minimum, account))
+
+    # -----------------------------------------------------------
+    # Scanning
+    # -----------------------------------------------------------
+
+    def scan(
+        self,
+        block_number=None
+    ):
+        '''
+        Read every account at one block.
+
+        :param block_number: optional, defaults to the latest block
+        :type block_number: number
+
+        :returns: list of accounts whose collateralization changed
+        '''
+        if block_number is None:
+            block_number = self.eth.web3.eth.blockNumber
+        accounts = list(self._accounts)
+        chunks = [
+            accounts[i:i + self.chunk_size]
+            for i in range(0, len(accounts), self.chunk_size)
+        ]
+        changed = []
+        if chunks:
+            max_workers = min(len(chunks), self.max_workers)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(
+                    lambda chunk: self._fetch_chunk(chunk, block_number),
+                    chunks,
+                )
+                for chunk_results in results:
+                    with self._lock:
+                        for account, value in chunk_results:
+                            # Skip accounts removed while the scan ran
+                            if account not in self._tracked:
+                                continue
+                            if self._set_value(account, value):
+                                changed.append(account)
+        self.block_number = block_number
+        return changed
+
+    def refresh(self):
+        '''
+        Scan again if a new block has been mined since the last scan.
+
+        :returns: list of accounts whose collateralization changed, or None
+            if there was no new block
+        '''
+        block_number = self.eth.web3.eth.blockNumber
+        if block_number == self.block_number:
+            return None
+        return self.scan(block_number)
+
+    def start(
+        self,
+        interval=DEFAULT_POLL_INTERVAL,
+        callback=None
+    ):
+        '''
+        Refresh on a background daemon thread, polling for new blocks. A
+        refresh that fails is tried again on the next poll.
+
+        :param interval: optional, seconds between polls, defaults to 5
+        :type interval: number
+
+        :param callback: optional, called with the scanner after a scan
+            that changed at least one account
+        :type callback: function
+        '''
+        if self._thread is not None:
+            return
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(interval, callback, self._stop_event),
+            name='dydx-collateralization',
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        '''
+        Stop the background refresher started with start().
+        '''
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._stop_event = None
+
+    # -----------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------
+
+    def get_collateralization(
+        self,
+        owner,
+        number
+    ):
+        '''
+        :returns: number, or None if the account has not been scanned
+        '''
+        return self._values.get((owner, number))
+
+    def riskiest(
+        self,
+        n
+    ):
+        '''
+        Return the n accounts closest to (or furthest below) the minimum.
+
+        :param n: required
+        :type n: number
+
+        :returns: list of ((owner, number), collateralization)
+        '''
+        with self._lock:
+            return [
+                (account, self._values[account])
+                for _, account in self._ranking[:n]
+            ]
+
+    def undercollateralized(self):
+        '''
+        Return every account below the minimum, riskiest first.
+
+        :returns: list of ((owner, number), collateralization)
+        '''
+        with self._lock:
+            end = self._ranking.bisect_left((0,))
+            return [
+                (account, self._values[account])
+                for _, account in self._ranking[:end]
+            ]
@@ -0,0 +1,162 @@
+import numpy
+from decimal import Decimal
+
+# Column kinds
+TIME = 'time'  # int64 milliseconds since the epoch
+NUMBER = 'number'  # float64, or Decimal objects when exact
+CATEGORY = 'category'  # int32 codes into ColumnBuilder.categories
+
+# Code used for a missing category value
+MISSING = -1
+# Value of a missing timestamp, numpy's NaT
+MISSING_TIME = numpy.iinfo(numpy.int64).min
+
+FILL_COLUMNS = (
+    ('createdAt', TIME),
+    ('market', CATEGORY),
+    ('side', CATEGORY),
+    ('liquidity', CATEGORY),
+    ('price', NUMBER),
+    ('amount', NUMBER),
+    ('feeAmount', NUMBER),
+)
+
+TRADE_COLUMNS = (
+    ('createdAt', TIME),
+    ('market', CATEGORY),
+    ('side', CATEGORY),
+    ('price', NUMBER),
+    ('amount', NUMBER),
+)
+
+FUNDING_RATE_COLUMNS = (
+    ('effectiveAt', TIME),
+    ('rate', NUMBER),
+    ('price', NUMBER),
+)
+
+
+def _times(values):
+    # Timestamps are UTC with a Z suffix, which numpy will not parse
+    return numpy.array(
+        [None if value is None else value.rstrip('Z') for value in values],
+        dtype='datetime64[ms]',
+    ).astype(numpy.int64)
+
+
+def _decimals(values):
+    return numpy.array(
+        [None if value is None else Decimal(value) for value in values],
+        dtype=object,
+    )
+
+
+class ColumnBuilder(object):
+    '''
+    Collects API rows into NumPy column arrays. Rows can be added a page at
+    a time; they are converted in chunks so that a long history never holds
+    more than chunk_size rows as dicts.
+    '''
+
+    def __init__(self, columns, exact=False, chunk_size=10000):
+        '''
+        :param columns: required, (name, kind) pairs such as FILL_COLUMNS
+        :type columns: tuple
+
+        :param exact: optional, keep prices and amounts as Decimal objects
+            instead of float64, defaults to False
+        :type exact: bool
+
+        :param chunk_size: optional, rows held before being converted
+        :type chunk_size: number
+        '''
+        self.columns = tuple(columns)
+        self.exact = exact
+        self.chunk_size = chunk_size
+        # Category values in code order, per category column
+        self.categories = dict(
+            (name, []) for name, kind in self.columns if kind == CATEGORY
+        )
+        self._codes = dict((name, {}) for name in self.categories)
+        self._rows = []
+        self._chunks = dict((name, []) for name, _ in self.columns)
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, name):
+        '''
+        :returns: numpy.ndarray of every row added so far
+        '''
+        self._flush()
+        chunks = self._chunks[name]
+        if not chunks:
+            return self._convert(name, dict(self.columns)[name], [])
+        if len(chunks) > 1:
+            chunks[:] = [numpy.concatenate(chunks)]
+        return chunks[0]
+
+    def append(self, row):
+        '''
+        :param row: required, one row of an API response
+        :type row: dict
+        '''
+        self._rows.append(row)
+        self._length += 1
+        if len(self._rows) >= self.chunk_size:
+            self._flush()
+
+    def extend(self, rows):
+        '''
+        :param rows: required, such as one page of an API response
+        :type rows: iterable of dict
+        '''
+        for row in rows:
+            self.append(row)
+
+    def arrays(self):
+        '''
+        :returns: dict of column name to numpy.ndarray
+        '''
+        return dict((name, self[name]) for name, _ in self.columns)
+
+    def labels(self, name):
+        '''
+        :returns: numpy.ndarray of the category values of a category column,
+            with None for missing values
+        '''
+        values = numpy.array(self.categories[name] + [None], dtype=object)
+        return values[self[name]]
+
+    def _flush(self):
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        for name, kind in self.columns:
+            values = [row.get(name) for row in rows]
+            self._chunks[name].append(self._convert(name, kind, values))
+
+    def _convert(self, name, kind, values):
+        if kind == TIME:
+            return _times(values)
+        if kind == CATEGORY:
+            return numpy.array(self._encode(name, values), dtype=numpy.int32)
+        if self.exact:
+            return _decimals(values)
+        return numpy.array(values, dtype=numpy.float64)
+
+    def _encode(self, name, values):
+        codes = self._codes[name]
+        categories = self.categories[name]
+        encoded = []
+        for value in values:
+            code = codes.get(value)
+            if code is None:
+                if value is None:
+                    code = MISSING
+                else:
+                    code = codes[value] = len(categories)
+                    categories.append(value)
+            encoded.append(code)
+        return encoded
@@ -48,6 +48,12 @@ PAIR_PBTC_USDC = 'PBTC-USDC'
 PAIR_PLINK_USDC = 'PLINK-USDC'
 PAIR_WETH_PUSD = 'WETH-PUSD'
 
+PERPETUAL_PAIRS = [
+    PAIR_PBTC_USDC,
+    PAIR_PLINK_USDC,
+    PAIR_WETH_PUSD,
+]
+
 DECIMALS_WETH = 18
 DECIMALS_SAI = 18
 DECIMALS_USDC = 6
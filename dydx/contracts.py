@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+
+PACKAGE_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+# ABI file path => parsed ABI, shared by every contract in the process
+_abis = {}
+_abis_lock = threading.Lock()
+
+
+def load_abi(file_path):
+    '''
+    Return the ABI stored at a path relative to the dydx package. Each file
+    is read and parsed once per process.
+
+    :param file_path: required, e.g. 'abi/erc20.json'
+    :type file_path: str
+
+    :returns: list
+    '''
+    abi = _abis.get(file_path)
+    if abi is None:
+        with _abis_lock:
+            abi = _abis.get(file_path)
+            if abi is None:
+                path = os.path.join(PACKAGE_FOLDER, file_path)
+                with open(path, 'r') as abi_file:
+                    abi = json.load(abi_file)
+                _abis[file_path] = abi
+    return abi
+
+
+class LazyContract(object):
+    '''
+    Class attribute for a contract that is only created, with the owning
+    instance's create_contract(address, file_path), the first time it is
+    read. The contract is then stored on the instance.
+    '''
+
+    def __init__(
+        self,
+        address,
+        file_path
+    ):
+        self.address = address
+        self.file_path = file_path
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        contract = instance.create_contract(self.address, self.file_path)
+        instance.__dict__[self.name] = contract
+        return contract
+
+
+# ABI id => (ABI, contract class used to encode calls); each entry keeps its
+# ABI alive so the id cannot be reused
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+
+def get_call_data(method):
+    '''
+    Return the transaction data of a contract function call, encoded with
+    web3's public Contract.encodeABI. One contract class is created per ABI
+    for this and reused.
+
+    :param method: required, e.g. contract.functions.balanceOf(address)
+    :type method: ContractFunction
+
+    :returns: str (hex)
+    '''
+    abi = method.contract_abi
+    entry = _encoders.get(id(abi))
+    if entry is None:
+        with _encoders_lock:
+            entry = _encoders.get(id(abi))
+            if entry is None:
+                entry = (abi, method.web3.eth.contract(abi=abi))
+                _encoders[id(abi)] = entry
+    return entry[1].encodeABI(
+        fn_name=method.fn_name,
+        args=method.args,
+        kwargs=method.kwargs,
+    )
@@ -0,0 +1,141 @@
+from eth_hash.auto import keccak
+
+EIP712_DOMAIN_STRING = \
+  'EIP712Domain(' + \
+  'string name,' + \
+  'string version,' + \
+  'uint256 chainId,' + \
+  'address verifyingContract' + \
+  ')'
+
+EIP712_PREFIX = b'\x19\x01'
+
+# EIP712 domain separators, keyed by
+# (contract name, version, chain id, verifying contract)
+_domain_separators = {}
+
+
+# -----------------------------------------------------------
+# Field Encoders
+# -----------------------------------------------------------
+
+def _hex_to_bytes(value):
+    if value[0:2] == '0x':
+        value = value[2:]
+    return bytes.fromhex(value)
+
+
+def encode_bytes32(value):
+    if isinstance(value, str):
+        value = _hex_to_bytes(value)
+    if len(value) != 32:
+        raise ValueError('bytes32 value must be 32 bytes long')
+    return value
+
+
+def encode_uint256(value):
+    return int(value).to_bytes(32, 'big')
+
+
+def encode_address(value):
+    if isinstance(value, str):
+        value = _hex_to_bytes(value)
+    if len(value) != 20:
+        raise ValueError('address value must be 20 bytes long')
+    return b'\x00' * 12 + value
+
+
+def encode_string(value):
+    return keccak(value.encode('utf-8'))
+
+
+def encode_bytes32_array(values):
+    return keccak(b''.join([encode_bytes32(value) for value in values]))
+
+
+FIELD_ENCODERS = {
+    'bytes32': encode_bytes32,
+    'uint256': encode_uint256,
+    'address': encode_address,
+    'string': encode_string,
+    'bytes32[]': encode_bytes32_array,
+}
+
+
+# -----------------------------------------------------------
+# Hashing
+# -----------------------------------------------------------
+
+class StructHasher(object):
+    '''
+    Computes EIP712 struct hashes for one struct type. The type hash and the
+    field encoders are resolved once from the type string; each struct is
+    then packed as 32-byte words into a single buffer and hashed once.
+    '''
+
+    def __init__(
+        self,
+        type_string
+    ):
+        fields = type_string[type_string.index('(') + 1:-1].split(',')
+        self.type_string = type_string
+        self.type_hash = keccak(type_string.encode('utf-8'))
+        self._encoders = tuple(
+            FIELD_ENCODERS[field.split(' ')[0]] for field in fields
+        )
+        self._size = 32 * (len(self._encoders) + 1)
+
+    def hash(
+        self,
+        values
+    ):
+        '''
+        Returns the struct hash as raw bytes.
+
+        :param values: required, one value per field in declaration order
+        :type values: list
+
+        :returns: bytes
+
+        :raises: ValueError
+        '''
+        if len(values) != len(self._encoders):
+            raise ValueError(
+                'Expected %d values for %s'
+                % (len(self._encoders), self.type_string)
+            )
+        buffer = bytearray(self._size)
+        buffer[0:32] = self.type_hash
+        offset = 32
+        for encode, value in zip(self._encoders, values):
+            buffer[offset:offset + 32] = encode(value)
+            offset += 32
+        return keccak(buffer)
+
+
+_domain_hasher = StructHasher(EIP712_DOMAIN_STRING)
+
+
+def get_domain_separator(name, version, chain_id, verifying_contract):
+    '''
+    Returns the EIP712 domain separator for a verifying contract as raw
+    bytes. The separator is computed on first use and then served from memory.
+    '''
+    key = (name, version, chain_id, verifying_contract)
+    domain_separator = _domain_separators.get(key)
+    if domain_separator is None:
+        domain_separator = _domain_hasher.hash([
+            name,
+            version,
+            chain_id,
+            verifying_contract,
+        ])
+        _domain_separators[key] = domain_separator
+    return domain_separator
+
+
+def hash_typed_data(domain_separator, struct_hash):
+    '''
+    Returns the final signable EIP712 hash as raw bytes.
+    '''
+    return keccak(EIP712_PREFIX + domain_separator + struct_hash)
@@ -1,25 +1,57 @@
-import json
-import os
+import threading
 import dydx.constants as consts
+import dydx.util as utils
 from web3 import Web3
+from dydx.batch import RpcBatch
+from dydx.contracts import LazyContract, load_abi
+from dydx.gas_price import GasPriceProvider
+from dydx.gas_profiles import GasProfiles, get_profile_key
+from dydx.nonce_manager import NonceManager, is_nonce_too_low
+from dydx.receipt_tracker import ReceiptTracker
 from dydx.eth_solo import EthSolo
 from dydx.eth_perp import EthPerp
 
+# Sent transactions remembered until their receipt refines the gas profiles
+MAX_PENDING_PROFILE_KEYS = 1024
+
 
 class Eth(object):
+    weth_contract = LazyContract(consts.WETH_ADDRESS, 'abi/erc20.json')
+    sai_contract = LazyContract(consts.SAI_ADDRESS, 'abi/erc20.json')
+    usdc_contract = LazyContract(consts.USDC_ADDRESS, 'abi/erc20.json')
+    dai_contract = LazyContract(consts.DAI_ADDRESS, 'abi/erc20.json')
 
     def __init__(
         self,
         node,
         private_key,
         public_address,
-        account_number
+        account_number,
+        signer=None,
+        nonce_sync_interval=None,
+        gas_price_provider=None,
+        gas_profiles=None,
+        call_cache=None
     ):
         self.web3 = Web3(None if node is None else Web3.HTTPProvider(node))
         self.private_key = private_key
+        self.signer = signer or utils.Signer(private_key)
         self.public_address = public_address
         self.account_number = account_number
-        self.min_nonce = self.web3.eth.getTransactionCount(self.public_address)
+        self.nonce_manager = NonceManager(
+            self.web3,
+            self.public_address,
+            sync_interval=nonce_sync_interval,
+        )
+        self.gas_price_provider = \
+            gas_price_provider or GasPriceProvider(self.web3)
+        self.gas_profiles = \
+            GasProfiles() if gas_profiles is None else gas_profiles
+        # Opt-in BlockCache for unbatched reads
+        self.call_cache = call_cache
+        # transaction hash => (gas profile key, gas sent)
+        self._pending_profile_keys = {}
+        self._pending_profile_keys_lock = threading.Lock()
 
         self.solo = EthSolo(
             self,
@@ -31,23 +63,6 @@ class Eth(object):
             self.public_address,
         )
 
-        self.weth_contract = self.create_contract(
-            consts.WETH_ADDRESS,
-            'abi/erc20.json'
-        )
-        self.sai_contract = self.create_contract(
-            consts.SAI_ADDRESS,
-            'abi/erc20.json'
-        )
-        self.usdc_contract = self.create_contract(
-            consts.USDC_ADDRESS,
-            'abi/erc20.json'
-        )
-        self.dai_contract = self.create_contract(
-            consts.DAI_ADDRESS,
-            'abi/erc20.json'
-        )
-
     # -----------------------------------------------------------
     # Helper Functions
     # -----------------------------------------------------------
@@ -55,47 +70,173 @@ class Eth(object):
     def send_eth_transaction(
         self,
         method,
-        options=None
+        options=None,
+        profile_key=None
     ):
         if options is None:
             options = dict()
         if 'from' not in options:
             options['from'] = self.public_address
-        if 'nonce' not in options:
-            options['nonce'] = max(
-                self.min_nonce,
-                self.web3.eth.getTransactionCount(self.public_address)
-            )
-        if 'gasPrice' not in options:
-            try:
+        allocate_nonce = 'nonce' not in options
+        if allocate_nonce:
+            options['nonce'] = self.nonce_manager.get_nonce()
+        else:
+            self.nonce_manager.mark_used(options['nonce'])
+        try:
+            if 'gasPrice' not in options:
                 options['gasPrice'] = \
-                    self.web3.eth.gasPrice + consts.DEFAULT_GAS_PRICE_ADDITION
-            except Exception:
-                options['gasPrice'] = consts.DEFAULT_GAS_PRICE
-        if 'value' not in options:
-            options['value'] = 0
-        if 'gas' not in options:
+                    self.gas_price_provider.get_gas_price()
+            if 'value' not in options:
+                options['value'] = 0
+            if profile_key is None:
+                profile_key = get_profile_key(method)
+            if 'gas' not in options:
+                options['gas'] = \
+                    self._get_gas_limit(method, options, profile_key)
             try:
-                options['gas'] = int(
-                    method.estimateGas(options) *
-                    consts.DEFAULT_GAS_MULTIPLIER
-                )
-            except Exception:
-                options['gas'] = consts.DEFAULT_GAS_AMOUNT
-        self.min_nonce = max(self.min_nonce, options['nonce'] + 1)
+                tx_hash = self._send_signed_transaction(method, options)
+            except ValueError as error:
+                if not allocate_nonce or not is_nonce_too_low(error):
+                    raise
+                # Another sender used our nonce; catch up and retry once
+                self.nonce_manager.resync()
+                options['nonce'] = self.nonce_manager.get_nonce()
+                tx_hash = self._send_signed_transaction(method, options)
+        except Exception as error:
+            if allocate_nonce and not is_nonce_too_low(error):
+                self._release_nonce(options['nonce'])
+            raise
+        self._track_gas_used(tx_hash, profile_key, options['gas'])
+        return tx_hash
+
+    def _release_nonce(
+        self,
+        nonce
+    ):
+        # The transaction was never sent, so its nonce must be reused or
+        # every later transaction waits behind the gap
+        if self.nonce_manager.release(nonce):
+            return
+        try:
+            self.nonce_manager.resync(reset=True)
+        except Exception:
+            # Keep the send's error for the caller; the gap then remains
+            # until the next resync
+            pass
+
+    def _get_gas_limit(
+        self,
+        method,
+        options,
+        profile_key
+    ):
+        gas = self.gas_profiles.get_gas_limit(profile_key)
+        if gas is not None:
+            return gas
+        try:
+            estimate = method.estimateGas(options)
+        except Exception:
+            return consts.DEFAULT_GAS_AMOUNT
+        self.gas_profiles.record_estimate(profile_key, estimate)
+        return self.gas_profiles.get_gas_limit(profile_key)
+
+    def _track_gas_used(
+        self,
+        tx_hash,
+        profile_key,
+        gas
+    ):
+        with self._pending_profile_keys_lock:
+            pending = self._pending_profile_keys
+            if len(pending) >= MAX_PENDING_PROFILE_KEYS:
+                del pending[next(iter(pending))]
+            pending[tx_hash] = (profile_key, gas)
+
+    def _record_gas_used(
+        self,
+        tx_hash,
+        receipt
+    ):
+        if not isinstance(tx_hash, str):
+            tx_hash = '0x' + bytes(tx_hash).hex()
+        with self._pending_profile_keys_lock:
+            pending = self._pending_profile_keys.pop(tx_hash.lower(), None)
+        if pending is None:
+            return
+        profile_key, gas = pending
+        if receipt.get('status', 1) == 1:
+            self.gas_profiles.record_gas_used(profile_key, receipt['gasUsed'])
+        elif receipt['gasUsed'] >= gas:
+            # Out of gas: the learned limit is too low, and reusing it would
+            # fail every later send, so estimate again next time
+            self.gas_profiles.forget(profile_key)
+
+    def _send_signed_transaction(
+        self,
+        method,
+        options
+    ):
         tx = method.buildTransaction(options)
-        stx = self.web3.eth.account.sign_transaction(tx, self.private_key)
+        stx = self.signer.sign_transaction(tx)
         return self.web3.eth.sendRawTransaction(stx.rawTransaction).hex()
 
+    def batch(
+        self,
+        block_identifier='latest'
+    ):
+        '''
+        Start a batch of on-chain reads. Pass it as the batch argument of
+        the getters, then call execute() to send them to the node in one
+        request and get their results in order.
+
+        :param block_identifier: optional, defaults to 'latest'
+        :type block_identifier: str or number
+
+        :returns: RpcBatch
+        '''
+        return RpcBatch(self.web3, block_identifier)
+
+    def call(
+        self,
+        method,
+        options=None,
+        transform=None,
+        batch=None
+    ):
+        '''
+        Call a contract function now, or queue it on a batch. Unbatched
+        calls are served from call_cache when one is set.
+
+        :param method: required
+        :type method: ContractFunction
+
+        :param options: optional, call options such as 'from'
+        :type options: dict
+
+        :param transform: optional, applied to the result
+        :type transform: function
+
+        :param batch: optional, batch to queue the call on
+        :type batch: RpcBatch
+
+        :returns: result, or its position in batch.execute() when batched
+        '''
+        if batch is not None:
+            return batch.add_call(method, options, transform)
+        if self.call_cache is not None:
+            result = self.call_cache.call(method, options)
+        else:
+            result = method.call(options)
+        return result if transform is None else transform(result)
+
     def create_contract(
         self,
         address,
         file_path
     ):
-        this_folder = os.path.dirname(os.path.abspath(__file__))
         return self.web3.eth.contract(
             address=address,
-            abi=json.load(open(os.path.join(this_folder, file_path), 'r'))
+            abi=load_abi(file_path)
         )
 
     def get_token_contract(
@@ -125,7 +266,31 @@ class Eth(object):
 
         :returns: transactionReceipt
         '''
-        return self.web3.eth.waitForTransactionReceipt(tx_hash)
+        receipt = self.web3.eth.waitForTransactionReceipt(tx_hash)
+        self._record_gas_used(tx_hash, receipt)
+        return receipt
+
+    def get_receipts(
+        self,
+        tx_hashes,
+        timeout=120
+    ):
+        '''
+        Wait for many transactions to be mined, polling for all of their
+        receipts in one batched request per second. Use a ReceiptTracker
+        directly to get futures or callbacks instead.
+
+        :param tx_hashes: required
+        :type tx_hashes: list of str
+
+        :param timeout: optional, seconds, defaults to 120
+        :type timeout: number
+
+        :returns: list of transactionReceipt, in the order of tx_hashes
+
+        :raises: TimeExhausted
+        '''
+        return ReceiptTracker(self).wait(tx_hashes, timeout=timeout)
 
     # -----------------------------------------------------------
     # Transactions
@@ -175,7 +340,8 @@ class Eth(object):
 
     def get_my_wallet_balance(
         self,
-        market
+        market,
+        batch=None
     ):
         '''
         Gets the on-chain balance of the users wallet for some asset.
@@ -183,17 +349,22 @@ class Eth(object):
         :param market: required
         :type market: number
 
+        :param batch: optional, see get_wallet_balance
+        :type batch: RpcBatch
+
         :returns: number
         '''
         return self.get_wallet_balance(
             address=self.public_address,
-            market=market
+            market=market,
+            batch=batch
         )
 
     def get_wallet_balance(
         self,
         address,
-        market
+        market,
+        batch=None
     ):
         '''
         Gets the on-chain balance of a users wallet for some asset.
@@ -204,11 +375,19 @@ class Eth(object):
         :param market: required
         :type market: number
 
-        :returns: number
+        :param batch: optional, queue the read on this batch instead
+        :type batch: RpcBatch
+
+        :returns: number, or its position in batch.execute() when batched
         '''
         if market == consts.MARKET_ETH:
-            balance = self.web3.eth.getBalance(address)
-        else:
-            contract = self.get_token_contract(market)
-            balance = contract.functions.balanceOf(address).call()
-        return balance
+            if batch is not None:
+                return batch.add_balance(address)
+            if self.call_cache is not None:
+                return self.call_cache.get_balance(address)
+            return self.web3.eth.getBalance(address)
+        contract = self.get_token_contract(market)
+        return self.call(
+            contract.functions.balanceOf(address),
+            batch=batch,
+        )
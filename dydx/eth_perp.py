@@ -1,7 +1,36 @@
 import dydx.constants as consts
+from dydx.contracts import LazyContract
+
+
+def _oracle_price_to_number(price):
+    return price / (10 ** 18)
+
+
+def _account_balance_to_dict(balance):
+    (marginIsPositive, positionIsPositive, margin, position) = balance
+    return {
+        'margin': margin if marginIsPositive else -margin,
+        'position': position if positionIsPositive else -position
+    }
 
 
 class EthPerp(object):
+    btc_perpetual = LazyContract(
+        consts.BTC_PERPETUAL_ADDRESS,
+        'abi/perpetualv1.json'
+    )
+    link_perpetual = LazyContract(
+        consts.LINK_PERPETUAL_ADDRESS,
+        'abi/perpetualv1.json'
+    )
+    eth_perpetual = LazyContract(
+        consts.ETH_PERPETUAL_ADDRESS,
+        'abi/perpetualv1.json'
+    )
+    weth_proxy = LazyContract(
+        consts.WETH_PROXY_ADDRESS,
+        'abi/wethproxy.json'
+    )
 
     def __init__(
         self,
@@ -11,23 +40,12 @@ class EthPerp(object):
         self.eth = eth
         self.public_address = public_address
 
-        # initialize contracts
-        self.btc_perpetual = self.eth.create_contract(
-            consts.BTC_PERPETUAL_ADDRESS,
-            'abi/perpetualv1.json'
-        )
-        self.link_perpetual = self.eth.create_contract(
-            consts.LINK_PERPETUAL_ADDRESS,
-            'abi/perpetualv1.json'
-        )
-        self.eth_perpetual = self.eth.create_contract(
-            consts.ETH_PERPETUAL_ADDRESS,
-            'abi/perpetualv1.json'
-        )
-        self.weth_proxy = self.eth.create_contract(
-            consts.WETH_PROXY_ADDRESS,
-            'abi/wethproxy.json'
-        )
+    def create_contract(
+        self,
+        address,
+        file_path
+    ):
+        return self.eth.create_contract(address, file_path)
 
     def _get_perpetual_by_market(
         self,
@@ -152,34 +170,46 @@ class EthPerp(object):
 
     def get_oracle_price(
         self,
-        market
+        market,
+        batch=None
     ):
         '''
         Gets the on-chain price of an asset from the price oracle.
 
-        :returns: number
+        :param batch: optional, queue the read on this batch instead
+        :type batch: RpcBatch
+
+        :returns: number, or its position in batch.execute() when batched
         '''
         perpetual = self._get_perpetual_by_market(market)
-        price = perpetual.functions.getOraclePrice().call(
-            {'from': consts.CURRENCY_CONVERTER_PROXY_ADDRESS}
+        return self.eth.call(
+            perpetual.functions.getOraclePrice(),
+            {'from': consts.CURRENCY_CONVERTER_PROXY_ADDRESS},
+            transform=_oracle_price_to_number,
+            batch=batch,
         )
-        return price / (10 ** 18)
 
     def get_my_balances(
         self,
-        market
+        market,
+        batch=None
     ):
         '''
         Gets dYdX balances for my account.
 
-        :returns: Object { margin: number, position, number }
+        :param batch: optional, queue the read on this batch instead
+        :type batch: RpcBatch
+
+        :returns: Object { margin: number, position, number }, or its
+            position in batch.execute() when batched
         '''
-        return self.get_balances(market, self.public_address)
+        return self.get_balances(market, self.public_address, batch=batch)
 
     def get_balances(
         self,
         market,
-        address
+        address,
+        batch=None
     ):
         '''
         Gets dYdX balances for some account.
@@ -190,12 +220,15 @@ class EthPerp(object):
         :param accountNumber: required
         :type accountNumber: number
 
-        :returns: Object { margin: number, position, number }
+        :param batch: optional, queue the read on this batch instead
+        :type batch: RpcBatch
+
+        :returns: Object { margin: number, position, number }, or its
+            position in batch.execute() when batched
         '''
         perpetual = self._get_perpetual_by_market(market)
-        result = perpetual.functions.getAccountBalance(address).call()
-        (marginIsPositive, positionIsPositive, margin, position) = result
-        return {
-            'margin': margin if marginIsPositive else -margin,
-            'position': position if positionIsPositive else -position
-        }
+        return self.eth.call(
+            perpetual.functions.getAccountBalance(address),
+            transform=_account_balance_to_dict,
+            batch=batch,
+        )
@@ -1,33 +1,59 @@
 import dydx.constants as consts
+from dydx.contracts import LazyContract
+from dydx.gas_profiles import get_profile_key
 
 
-class EthSolo(object):
+def _price_to_usd(price):
+    return price[0] / (consts.PRICE_ORACLE_USD_MULTIPLIER)
+
+
+def _account_values_to_collateralization(values):
+    [supply], [borrow] = values
+    if borrow == 0:
+        return float('inf')
+    return supply / borrow
+
+
+def _account_balances_to_weis(balances):
+    _, _, weis = balances
+    return list(map(
+        lambda wei: wei[1] if wei[0] else -wei[1],
+        weis
+    ))
+
+
+class SoloOperation(object):
+    '''
+    Deposits and withdrawals for one Solo account, sent together as a single
+    operate transaction.
+
+    The transaction goes through the PayableProxy when any action deposits
+    or withdraws WETH as ETH. ETH deposited is sent as the transaction value
+    and ETH withdrawn is sent to a single address.
+    '''
 
     def __init__(
         self,
-        eth,
-        public_address,
-        account_number
+        solo
     ):
-        self.eth = eth
-        self.public_address = public_address
-        self.account_number = account_number
+        '''
+        :param solo: required
+        :type solo: EthSolo
+        '''
+        self.solo = solo
+        self.actions = []
+        self.value = 0
+        self.send_eth_to = None
+        self.use_payable_proxy = False
 
-        # initialize contracts
-        self.solo_margin = self.eth.create_contract(
-            consts.SOLO_MARGIN_ADDRESS,
-            'abi/solomargin.json'
-        )
-        self.payable_proxy = self.eth.create_contract(
-            consts.PAYABLE_PROXY_ADDRESS,
-            'abi/payableproxy.json'
-        )
+    def __len__(self):
+        return len(self.actions)
 
     # -----------------------------------------------------------
-    # Private Helper Functions
+    # Helper Methods
     # -----------------------------------------------------------
 
-    def _operate(
+    def _add(
         self,
         actionType,
         market,
@@ -40,61 +66,218 @@ class EthSolo(object):
             raise ValueError('Invalid market number')
 
         isDeposit = (actionType == consts.ACTION_TYPE_DEPOSIT)
-        accounts = [{
-            'owner': self.public_address,
-            'number': self.account_number
-        }]
-        amountField = {
-            'sign': isDeposit,
-            'denomination': 0,  # wei
-            'ref': ref,
-            'value': wei
-        }
-        actualWithdrawOrDepositAddress = (
-            consts.PAYABLE_PROXY_ADDRESS
-            if market == consts.MARKET_WETH and asEth
-            else otherAddress
-        )
-        operations = [{
+        viaPayableProxy = (market == consts.MARKET_WETH and asEth)
+        if viaPayableProxy:
+            if isDeposit:
+                self.value += wei
+            else:
+                if self.send_eth_to is not None and \
+                        self.send_eth_to.lower() != otherAddress.lower():
+                    raise ValueError(
+                        'ETH can only be withdrawn to one address per '
+                        'transaction'
+                    )
+                self.send_eth_to = otherAddress
+            self.use_payable_proxy = True
+
+        self.actions.append({
             'actionType': actionType,
             'accountId': 0,
-            'amount': amountField,
+            'amount': {
+                'sign': isDeposit,
+                'denomination': 0,  # wei
+                'ref': ref,
+                'value': wei
+            },
             'primaryMarketId': market,
             'secondaryMarketId': 0,
-            'otherAddress': actualWithdrawOrDepositAddress,
+            'otherAddress': (
+                consts.PAYABLE_PROXY_ADDRESS
+                if viaPayableProxy
+                else otherAddress
+            ),
             'otherAccountId': 0,
             'data': '0x'
-        }]
-        txOptions = dict(
-            value=(
-                wei
-                if (isDeposit and market == consts.MARKET_WETH and asEth)
-                else 0
-            )
+        })
+        return self
+
+    # -----------------------------------------------------------
+    # Actions
+    # -----------------------------------------------------------
+
+    def deposit(
+        self,
+        market,
+        wei,
+        asEth=True
+    ):
+        '''
+        Add a deposit. See EthSolo.deposit.
+
+        :returns: SoloOperation, so calls can be chained
+
+        :raises: ValueError
+        '''
+        return self._add(
+            actionType=consts.ACTION_TYPE_DEPOSIT,
+            market=market,
+            wei=wei,
+            ref=consts.REFERENCE_DELTA,
+            otherAddress=self.solo.public_address,
+            asEth=asEth
         )
 
-        if market == consts.MARKET_WETH and asEth:
-            return self.eth.send_eth_transaction(
-                self.payable_proxy.functions.operate(
-                    accounts,
-                    operations,
-                    otherAddress
-                ),
-                options=txOptions
+    def withdraw(
+        self,
+        market,
+        wei,
+        to=None,
+        asEth=True
+    ):
+        '''
+        Add a withdrawal. See EthSolo.withdraw.
+
+        :returns: SoloOperation, so calls can be chained
+
+        :raises: ValueError
+        '''
+        return self._add(
+            actionType=consts.ACTION_TYPE_WITHDRAW,
+            market=market,
+            wei=wei,
+            ref=consts.REFERENCE_DELTA,
+            otherAddress=(to or self.solo.public_address),
+            asEth=asEth
+        )
+
+    def withdraw_to_zero(
+        self,
+        market,
+        to=None
+    ):
+        '''
+        Add a withdrawal of all funds for one asset. See
+        EthSolo.withdraw_to_zero.
+
+        :returns: SoloOperation, so calls can be chained
+
+        :raises: ValueError
+        '''
+        return self._add(
+            actionType=consts.ACTION_TYPE_WITHDRAW,
+            market=market,
+            wei=0,
+            ref=consts.REFERENCE_TARGET,
+            otherAddress=(to or self.solo.public_address)
+        )
+
+    # -----------------------------------------------------------
+    # Sending
+    # -----------------------------------------------------------
+
+    def send(self):
+        '''
+        Send every action as one operate transaction.
+
+        :returns: transactionHash
+
+        :raises: ValueError
+        '''
+        if not self.actions:
+            raise ValueError('No actions to send')
+
+        accounts = [{
+            'owner': self.solo.public_address,
+            'number': self.solo.account_number
+        }]
+        if self.use_payable_proxy:
+            method = self.solo.payable_proxy.functions.operate(
+                accounts,
+                self.actions,
+                self.send_eth_to or self.solo.public_address
             )
         else:
-            return self.eth.send_eth_transaction(
-                self.solo_margin.functions.operate(
-                    accounts,
-                    operations
-                ),
-                options=txOptions
+            method = self.solo.solo_margin.functions.operate(
+                accounts,
+                self.actions
             )
 
+        # Gas depends on the actions and their markets' tokens, so learn it
+        # per combination rather than per operate function
+        profile_key = get_profile_key(method) + ':' + ','.join(
+            '%d.%d' % (action['actionType'], action['primaryMarketId'])
+            for action in self.actions
+        )
+        return self.solo.eth.send_eth_transaction(
+            method,
+            options=dict(value=self.value),
+            profile_key=profile_key
+        )
+
+
+class EthSolo(object):
+    solo_margin = LazyContract(
+        consts.SOLO_MARGIN_ADDRESS,
+        'abi/solomargin.json'
+    )
+    payable_proxy = LazyContract(
+        consts.PAYABLE_PROXY_ADDRESS,
+        'abi/payableproxy.json'
+    )
+
+    def __init__(
+        self,
+        eth,
+        public_address,
+        account_number
+    ):
+        self.eth = eth
+        self.public_address = public_address
+        self.account_number = account_number
+
+    # -----------------------------------------------------------
+    # Private Helper Functions
+    # -----------------------------------------------------------
+
+    def create_contract(
+        self,
+        address,
+        file_path
+    ):
+        return self.eth.create_contract(address, file_path)
+
+    def _operate(
+        self,
+        actionType,
+        market,
+        wei,
+        ref,
+        otherAddress,
+        asEth=True
+    ):
+        return SoloOperation(self)._add(
+            actionType=actionType,
+            market=market,
+            wei=wei,
+            ref=ref,
+            otherAddress=otherAddress,
+            asEth=asEth
+        ).send()
+
     # -----------------------------------------------------------
     # Transactions
     # -----------------------------------------------------------
 
+    def operation(self):
+        '''
+        Start a transaction with several deposits and withdrawals. Add
+        actions with deposit, withdraw and withdraw_to_zero, then call
+        send().
+
+        :returns: SoloOperation
+        '''
+        return SoloOperation(self)
+
     def set_allowance(
         self,
         market
@@ -214,7 +397,8 @@ class EthSolo(object):
 
     def get_oracle_price(
         self,
-        market
+        market,
+        batch=None
     ):
         '''
         Gets the on-chain price of an asset from the price oracle.
@@ -223,28 +407,40 @@ class EthSolo(object):
         :param market: required
         :type market: number
 
-        :returns: number
+        :param batch: optional, queue the read on this batch instead
+        :type batch: RpcBatch
+
+        :returns: number, or its position in batch.execute() when batched
         '''
-        price = self.solo_margin.functions.getMarketPrice(market).call()[0]
-        return price / (consts.PRICE_ORACLE_USD_MULTIPLIER)
+        return self.eth.call(
+            self.solo_margin.functions.getMarketPrice(market),
+            transform=_price_to_usd,
+            batch=batch,
+        )
 
     def get_my_collateralization(
-        self
+        self,
+        batch=None
     ):
         '''
         Gets collateralization of my account.
 
-        :returns: number
+        :param batch: optional, queue the read on this batch instead
+        :type batch: RpcBatch
+
+        :returns: number, or its position in batch.execute() when batched
         '''
         return self.get_collateralization(
             self.public_address,
-            self.account_number
+            self.account_number,
+            batch=batch
         )
 
     def get_collateralization(
         self,
         address,
-        accountNumber
+        accountNumber,
+        batch=None
     ):
         '''
         Gets collateralization of some account.
@@ -255,34 +451,43 @@ class EthSolo(object):
         :param accountNumber: required
         :type accountNumber: number
 
-        :returns: number
-        '''
-        [supply], [borrow] = self.solo_margin.functions.getAccountValues([
-            address,
-            accountNumber,
-        ]).call()
+        :param batch: optional, queue the read on this batch instead
+        :type batch: RpcBatch
 
-        if borrow == 0:
-            return float('inf')
-        return supply / borrow
+        :returns: number, or its position in batch.execute() when batched
+        '''
+        return self.eth.call(
+            self.solo_margin.functions.getAccountValues([
+                address,
+                accountNumber,
+            ]),
+            transform=_account_values_to_collateralization,
+            batch=batch,
+        )
 
     def get_my_balances(
-        self
+        self,
+        batch=None
     ):
         '''
         Gets dYdX balances for my account.
 
-        :returns: number
+        :param batch: optional, queue the read on this batch instead
+        :type batch: RpcBatch
+
+        :returns: number, or its position in batch.execute() when batched
         '''
         return self.get_balances(
             self.public_address,
-            self.account_number
+            self.account_number,
+            batch=batch
         )
 
     def get_balances(
         self,
         address,
-        accountNumber
+        accountNumber,
+        batch=None
     ):
         '''
         Gets dYdX balances for some account.
@@ -293,14 +498,16 @@ class EthSolo(object):
         :param accountNumber: required
         :type accountNumber: number
 
-        :returns: number
+        :param batch: optional, queue the read on this batch instead
+        :type batch: RpcBatch
+
+        :returns: number, or its position in batch.execute() when batched
         '''
-        _, _, weis = self.solo_margin.functions.getAccountBalances([
-            address,
-            accountNumber,
-        ]).call()
-        result = list(map(
-            lambda wei: wei[1] if wei[0] else -wei[1],
-            weis
-        ))
-        return result
+        return self.eth.call(
+            self.solo_margin.functions.getAccountBalances([
+                address,
+                accountNumber,
+            ]),
+            transform=_account_balances_to_weis,
+            batch=batch,
+        )
@@ -0,0 +1,236 @@
+import threading
+import time
+from dydx.records import iso_to_epoch_ms
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# Seconds after a boundary before the new data is expected to be served
+DEFAULT_GRACE = 2
+
+# Seconds between fetches of a dataset whose update for the current boundary
+# has not been served yet
+DEFAULT_PENDING_INTERVAL = 15
+
+# dataset => seconds between updates, aligned to the wall clock
+FUNDING_SCHEDULES = {
+    # `predicted` updates each minute and `current` each hour, on the hour
+    'funding_rates': MINUTE,
+    'index_price': MINUTE,
+    # A new funding rate is added to the history each hour, once it has been
+    # mined, which may be some time after the hour
+    'historical_funding_rates': HOUR,
+}
+
+
+def _has_rate_since(response, boundary):
+    # Whether a funding rate history is up to date with the hour starting at
+    # boundary. Histories without timestamps are taken as up to date.
+    newest = None
+    for market in response.values():
+        for rate in market.get('history') or []:
+            if rate.get('effectiveAt') is not None:
+                effective_at = iso_to_epoch_ms(rate['effectiveAt'])
+                if newest is None or effective_at > newest:
+                    newest = effective_at
+    return newest is None or newest >= boundary * 1000
+
+
+class FundingCache(object):
+    '''
+    Serves funding rates, funding index prices and the latest funding rate
+    history of a Client from memory between their scheduled updates.
+
+    Each dataset is fetched once for all markets and is kept until the next
+    boundary of its schedule plus a grace period, so callers polling every
+    second cause one request per update. The funding rate history is only
+    updated once the new rate is mined, so until it has an entry for the
+    current hour it is fetched again every pending_interval seconds.
+    Concurrent callers share a single fetch. With start(), datasets that
+    have been read are refreshed on a background thread right after each
+    boundary instead. Responses are shared between callers and should be
+    treated as read-only. All methods are thread safe.
+    '''
+
+    def __init__(
+        self,
+        client,
+        grace=DEFAULT_GRACE,
+        schedules=None,
+        pending_interval=DEFAULT_PENDING_INTERVAL
+    ):
+        '''
+        :param client: required
+        :type client: Client
+
+        :param grace: optional, seconds after a boundary before refreshing,
+            defaults to 2
+        :type grace: number
+
+        :param schedules: optional, overrides FUNDING_SCHEDULES, seconds
+            between updates per dataset
+        :type schedules: dict
+
+        :param pending_interval: optional, seconds between fetches of the
+            funding rate history until it has an entry for the current hour,
+            defaults to 15
+        :type pending_interval: number
+        '''
+        self.client = client
+        self.grace = grace
+        self.pending_interval = pending_interval
+        self.schedules = dict(FUNDING_SCHEDULES)
+        self.schedules.update(schedules or {})
+        self._fetchers = {
+            'funding_rates': client.get_funding_rates,
+            'index_price': client.get_funding_index_price,
+            'historical_funding_rates': client.get_historical_funding_rates,
+        }
+        self._locks = dict(
+            (dataset, threading.Lock()) for dataset in self._fetchers
+        )
+        # dataset => function of a response and the start of its period
+        # returning whether the response has the update of that period
+        self._checks = {
+            'historical_funding_rates': _has_rate_since,
+        }
+        # dataset => (response for all markets, schedule period, fetched at,
+        # whether the update of the period is still pending)
+        self._entries = {}
+        self._stop_event = None
+        self._thread = None
+
+    # -----------------------------------------------------------
+    # Helper Methods
+    # -----------------------------------------------------------
+
+    def _get_period(self, dataset, now):
+        return int((now - self.grace) // self.schedules[dataset])
+
+    def _is_stale(self, entry, period, now):
+        if entry is None or entry[1] != period:
+            return True
+        return entry[3] and now - entry[2] >= self.pending_interval
+
+    def _get(self, dataset, markets):
+        with self._locks[dataset]:
+            now = time.time()
+            period = self._get_period(dataset, now)
+            entry = self._entries.get(dataset)
+            if self._is_stale(entry, period, now):
+                response = self._fetchers[dataset]()
+                check = self._checks.get(dataset)
+                pending = check is not None and \
+                    not check(response, period * self.schedules[dataset])
+                entry = (response, period, now, pending)
+                self._entries[dataset] = entry
+        response = entry[0]
+        if markets is None:
+            return response
+        return dict(
+            (market, response[market])
+            for market in markets if market in response
+        )
+
+    def _run(self, stop_event):
+        interval = min(self.schedules.values())
+        while True:
+            # Wake up just after the next boundary
+            delay = interval - (time.time() - self.grace) % interval
+            # Or sooner, to fetch a pending update
+            if any(entry[3] for entry in list(self._entries.values())):
+                delay = min(delay, self.pending_interval)
+            if stop_event.wait(delay):
+                return
+            self.refresh()
+
+    # -----------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------
+
+    def get_funding_rates(
+        self,
+        markets=None
+    ):
+        '''
+        See Client.get_funding_rates. Cached until the next minute.
+
+        :returns: { [market: str]: { current: FundingRate, predicted:
+            FundingRate } }
+
+        :raises: DydxAPIError
+        '''
+        return self._get('funding_rates', markets)
+
+    def get_funding_index_price(
+        self,
+        markets=None
+    ):
+        '''
+        See Client.get_funding_index_price. Cached until the next minute.
+
+        :returns: { [market: str]: { price: str } }
+
+        :raises: DydxAPIError
+        '''
+        return self._get('index_price', markets)
+
+    def get_historical_funding_rates(
+        self,
+        markets=None
+    ):
+        '''
+        Latest page of Client.get_historical_funding_rates. Cached until the
+        next hour once it has the rate of the current hour.
+
+        :returns: { [market: str]: { history: FundingRate[] } }
+
+        :raises: DydxAPIError
+        '''
+        return self._get('historical_funding_rates', markets)
+
+    def refresh(self):
+        '''
+        Fetch every dataset that has been read and is past its boundary or
+        still waiting for its update.
+        Errors are ignored; the dataset is fetched again on the next read.
+        '''
+        for dataset in list(self._entries):
+            try:
+                self._get(dataset, None)
+            except Exception:
+                pass
+
+    def invalidate(self):
+        '''
+        Drop every cached response.
+        '''
+        for dataset in self._fetchers:
+            with self._locks[dataset]:
+                self._entries.pop(dataset, None)
+
+    def start(self):
+        '''
+        Refresh on a background daemon thread right after each boundary.
+        '''
+        if self._thread is not None:
+            return
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._stop_event,),
+            name='dydx-funding-cache',
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        '''
+        Stop the background refresher started with start().
+        '''
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._stop_event = None
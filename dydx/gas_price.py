@@ -0,0 +1,191 @@
+import threading
+import time
+import dydx.constants as consts
+
+DEFAULT_TTL = 15
+DEFAULT_PERCENTILE = 60
+DEFAULT_BLOCK_COUNT = 20
+
+
+def node_gas_price(web3):
+    '''
+    Strategy that asks the node for its suggested gas price.
+    '''
+    return web3.eth.gasPrice
+
+
+class PercentileGasPrice(object):
+    '''
+    Strategy that takes a percentile of the gas prices paid in the most
+    recent blocks. Prices are kept per block, so each refresh only fetches
+    the blocks mined since the previous one.
+    '''
+
+    def __init__(
+        self,
+        percentile=DEFAULT_PERCENTILE,
+        block_count=DEFAULT_BLOCK_COUNT
+    ):
+        '''
+        :param percentile: optional, between 0 and 100, defaults to 60
+        :type percentile: number
+
+        :param block_count: optional, number of recent blocks to sample,
+            defaults to 20
+        :type block_count: number
+        '''
+        if not 0 <= percentile <= 100:
+            raise ValueError('Percentile must be between 0 and 100')
+        self.percentile = percentile
+        self.block_count = block_count
+        # block number => gas prices of the transactions in it
+        self._block_prices = {}
+
+    def __call__(self, web3):
+        latest = web3.eth.blockNumber
+        numbers = range(max(0, latest - self.block_count + 1), latest + 1)
+        block_prices = {}
+        for number in numbers:
+            prices = self._block_prices.get(number)
+            if prices is None:
+                block = web3.eth.getBlock(number, full_transactions=True)
+                prices = [tx['gasPrice'] for tx in block['transactions']]
+            block_prices[number] = prices
+        self._block_prices = block_prices
+
+        prices = sorted(
+            price for prices in block_prices.values() for price in prices
+        )
+        if not prices:
+            return node_gas_price(web3)
+        index = int(round((len(prices) - 1) * self.percentile / 100.0))
+        return prices[index]
+
+
+class GasPriceProvider(object):
+    '''
+    Serves the gas price for new transactions from memory.
+
+    The price is recomputed with the strategy once it is older than ttl
+    seconds, or continuously on a background thread after start(). If the
+    strategy fails, the last known price is kept, or DEFAULT_GAS_PRICE is
+    used when there is none. All methods are thread safe.
+    '''
+
+    def __init__(
+        self,
+        web3,
+        strategy=node_gas_price,
+        ttl=DEFAULT_TTL,
+        addition=consts.DEFAULT_GAS_PRICE_ADDITION
+    ):
+        '''
+        :param web3: required
+        :type web3: Web3
+
+        :param strategy: optional, callable taking web3 and returning a gas
+            price in wei, defaults to the node's suggested gas price
+        :type strategy: function or PercentileGasPrice
+
+        :param ttl: optional, seconds a price is served before it is
+            recomputed, defaults to 15
+        :type ttl: number
+
+        :param addition: optional, wei added to the strategy's price
+        :type addition: number
+        '''
+        self.web3 = web3
+        self.strategy = strategy
+        self.ttl = ttl
+        self.addition = addition
+        self._lock = threading.Lock()
+        self._gas_price = None
+        self._updated_at = None
+        self._stop_event = None
+        self._thread = None
+
+    # -----------------------------------------------------------
+    # Helper Methods
+    # -----------------------------------------------------------
+
+    def _is_fresh(self):
+        return (
+            self._updated_at is not None and
+            time.monotonic() - self._updated_at < self.ttl
+        )
+
+    def _refresh(self):
+        try:
+            self._gas_price = self.strategy(self.web3) + self.addition
+        except Exception:
+            if self._gas_price is None:
+                self._gas_price = consts.DEFAULT_GAS_PRICE
+        self._updated_at = time.monotonic()
+
+    def _run(self, interval, stop_event):
+        while not stop_event.is_set():
+            self.refresh()
+            stop_event.wait(interval)
+
+    # -----------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------
+
+    def get_gas_price(self):
+        '''
+        Return the gas price to use for a new transaction.
+
+        :returns: number
+        '''
+        if not self._is_fresh():
+            with self._lock:
+                # Another thread may have refreshed while we waited
+                if not self._is_fresh():
+                    self._refresh()
+        return self._gas_price
+
+    def refresh(self):
+        '''
+        Recompute the gas price now.
+
+        :returns: number
+        '''
+        with self._lock:
+            self._refresh()
+        return self._gas_price
+
+    def start(
+        self,
+        interval=None
+    ):
+        '''
+        Refresh the gas price on a background daemon thread so that senders
+        never wait on the node.
+
+        :param interval: optional, seconds between refreshes, defaults to
+            half the ttl
+        :type interval: number
+        '''
+        if self._thread is not None:
+            return
+        if interval is None:
+            interval = self.ttl / 2.0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(interval, self._stop_event),
+            name='dydx-gas-price',
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        '''
+        Stop the background refresher started with start().
+        '''
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._stop_event = None
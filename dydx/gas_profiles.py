@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+import dydx.constants as consts
+from eth_utils import function_abi_to_4byte_selector
+
+
+def get_profile_key(method):
+    '''
+    Key a contract function call by contract address and 4-byte selector.
+
+    :param method: required, e.g. contract.functions.approve(...)
+    :type method: ContractFunction
+
+    :returns: str
+    '''
+    selector = function_abi_to_4byte_selector(method.abi)
+    return method.address.lower() + ':0x' + selector.hex()
+
+
+class GasProfiles(object):
+    '''
+    Learned gas limits per contract function.
+
+    A profile is seeded with the node's estimate the first time a function
+    is sent and refined with the gasUsed of its successful receipts, so
+    repeat calls do not need estimateGas. A profile whose limit proved too
+    low is forgotten and estimated again. The gas limit is the largest of
+    those observations times the multiplier. Profiles are optionally loaded
+    from and saved to a JSON file. All methods are thread safe.
+    '''
+
+    def __init__(
+        self,
+        path=None,
+        multiplier=consts.DEFAULT_GAS_MULTIPLIER
+    ):
+        '''
+        :param path: optional, JSON file to load profiles from and save
+            them to after every change
+        :type path: str
+
+        :param multiplier: optional, safety factor applied to the learned
+            gas, defaults to DEFAULT_GAS_MULTIPLIER
+        :type multiplier: number
+        '''
+        self.path = path
+        self.multiplier = multiplier
+        self._lock = threading.Lock()
+        # key => { estimate: number, gasUsed: number }
+        self._profiles = {}
+        if path is not None and os.path.exists(path):
+            with open(path, 'r') as profiles_file:
+                self._profiles = json.load(profiles_file)
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def __contains__(self, key):
+        return key in self._profiles
+
+    # -----------------------------------------------------------
+    # Helper Methods
+    # -----------------------------------------------------------
+
+    def _record(self, key, field, gas):
+        with self._lock:
+            profile = self._profiles.setdefault(key, {})
+            if gas <= profile.get(field, 0):
+                return
+            profile[field] = gas
+            if self.path is not None:
+                self._save()
+
+    def _save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as profiles_file:
+            json.dump(self._profiles, profiles_file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    # -----------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------
+
+    def get_gas_limit(
+        self,
+        key
+    ):
+        '''
+        :param key: required, see get_profile_key
+        :type key: str
+
+        :returns: number, or None if the function has no profile yet
+        '''
+        profile = self._profiles.get(key)
+        if not profile:
+            return None
+        gas = max(profile.values())
+        return int(gas * self.multiplier)
+
+    def record_estimate(
+        self,
+        key,
+        gas
+    ):
+        '''
+        Seed a profile with the gas estimated by the node.
+
+        :param key: required, see get_profile_key
+        :type key: str
+
+        :param gas: required
+        :type gas: number
+        '''
+        self._record(key, 'estimate', gas)
+
+    def record_gas_used(
+        self,
+        key,
+        gas
+    ):
+        '''
+        Refine a profile with the gasUsed of a successful receipt.
+
+        :param key: required, see get_profile_key
+        :type key: str
+
+        :param gas: required
+        :type gas: number
+        '''
+        self._record(key, 'gasUsed', gas)
+
+    def forget(
+        self,
+        key
+    ):
+        '''
+        Drop a profile, for example after a transaction ran out of the gas
+        it allowed, so that the next send estimates again.
+
+        :param key: required, see get_profile_key
+        :type key: str
+        '''
+        with self._lock:
+            if self._profiles.pop(key, None) is not None and \
+                    self.path is not None:
+                self._save()
+
+    def save(self):
+        '''
+        Write the profiles to path.
+        '''
+        if self.path is None:
+            raise ValueError('GasProfiles has no path to save to')
+        with self._lock:
+            self._save()
@@ -0,0 +1,99 @@
+import json
+
+# Tried in order by get_codec() when no codec is named
+CODEC_NAMES = ('orjson', 'ujson', 'json')
+
+
+class JsonCodec(object):
+    '''
+    Encodes request bodies and decodes response bodies with the standard
+    library. Subclasses use faster libraries and fall back to this one for
+    anything those cannot handle, such as integers above 64 bits.
+    '''
+    name = 'json'
+
+    def dumps(self, obj):
+        '''
+        :returns: bytes, UTF-8 encoded JSON
+        '''
+        return json.dumps(obj).encode('utf-8')
+
+    def loads(self, data):
+        '''
+        :param data: required
+        :type data: bytes or str
+
+        :raises: ValueError
+        '''
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj):
+        try:
+            return self._orjson.dumps(obj)
+        except TypeError:
+            return JsonCodec.dumps(self, obj)
+
+    def loads(self, data):
+        try:
+            return self._orjson.loads(data)
+        except ValueError:
+            return JsonCodec.loads(self, data)
+
+
+class UjsonCodec(JsonCodec):
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, obj):
+        try:
+            return self._ujson.dumps(obj).encode('utf-8')
+        except (TypeError, OverflowError):
+            return JsonCodec.dumps(self, obj)
+
+    def loads(self, data):
+        try:
+            return self._ujson.loads(data)
+        except ValueError:
+            return JsonCodec.loads(self, data)
+
+
+_CODECS = {
+    'orjson': OrjsonCodec,
+    'ujson': UjsonCodec,
+    'json': JsonCodec,
+}
+
+
+def get_codec(name=None):
+    '''
+    :param name: optional, one of CODEC_NAMES, defaults to the fastest one
+        installed
+    :type name: str
+
+    :returns: JsonCodec
+
+    :raises: ImportError if the named codec's library is not installed,
+        ValueError if the name is unknown
+    '''
+    if name is None:
+        for codec_name in CODEC_NAMES:
+            try:
+                return get_codec(codec_name)
+            except ImportError:
+                continue
+    if name not in _CODECS:
+        raise ValueError('Unknown JSON codec: %s' % name)
+    return _CODECS[name]()
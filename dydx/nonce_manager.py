@@ -0,0 +1,150 @@
+import threading
+import time
+
+
+def is_nonce_too_low(error):
+    '''
+    Whether a node rejected a transaction because its nonce was already used.
+    '''
+    return 'nonce too low' in str(error).lower()
+
+
+class NonceManager(object):
+    '''
+    Hands out transaction nonces for one account from memory.
+
+    The transaction count is read from the node on first use, when resync()
+    is called (e.g. after a "nonce too low" rejection), and at most once per
+    sync_interval seconds if one is given. A nonce whose send failed must be
+    given back with release() or the transactions after it never mine. All
+    methods are thread safe.
+    '''
+
+    def __init__(
+        self,
+        web3,
+        address,
+        sync_interval=None
+    ):
+        '''
+        :param web3: required
+        :type web3: Web3
+
+        :param address: required, the account sending transactions
+        :type address: str (address)
+
+        :param sync_interval: optional, seconds after which the next nonce
+            is checked against the node again, defaults to never
+        :type sync_interval: number
+        '''
+        self.web3 = web3
+        self.address = address
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._next_nonce = 0
+        self._synced_at = None
+
+    # -----------------------------------------------------------
+    # Helper Methods
+    # -----------------------------------------------------------
+
+    def _needs_sync(self):
+        if self._synced_at is None:
+            return True
+        return (
+            self.sync_interval is not None and
+            time.monotonic() - self._synced_at >= self.sync_interval
+        )
+
+    def _sync(self):
+        count = self.web3.eth.getTransactionCount(self.address, 'pending')
+        # Never step back over nonces already handed out but not yet seen by
+        # the node
+        self._next_nonce = max(self._next_nonce, count)
+        self._synced_at = time.monotonic()
+
+    # -----------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------
+
+    def get_nonce(self):
+        '''
+        Allocate the next nonce.
+
+        :returns: number
+        '''
+        return self.reserve(1)[0]
+
+    def reserve(
+        self,
+        count
+    ):
+        '''
+        Allocate a block of consecutive nonces, e.g. for a burst of deposits
+        and withdrawals sent with explicit nonces.
+
+        :param count: required
+        :type count: number
+
+        :returns: range of nonces
+
+        :raises: ValueError
+        '''
+        if count < 1:
+            raise ValueError('Count must be positive')
+        with self._lock:
+            if self._needs_sync():
+                self._sync()
+            start = self._next_nonce
+            self._next_nonce += count
+        return range(start, start + count)
+
+    def mark_used(
+        self,
+        nonce
+    ):
+        '''
+        Record a nonce chosen by the caller so it is not handed out again.
+
+        :param nonce: required
+        :type nonce: number
+        '''
+        with self._lock:
+            self._next_nonce = max(self._next_nonce, nonce + 1)
+
+    def release(
+        self,
+        nonce
+    ):
+        '''
+        Give back a nonce whose transaction was never sent. This only works
+        for the most recently allocated nonce; otherwise resync(reset=True)
+        is needed to close the gap.
+
+        :param nonce: required
+        :type nonce: number
+
+        :returns: bool, whether the nonce will be handed out again
+        '''
+        with self._lock:
+            if nonce != self._next_nonce - 1:
+                return False
+            self._next_nonce = nonce
+            return True
+
+    def resync(
+        self,
+        reset=False
+    ):
+        '''
+        Read the transaction count from the node now.
+
+        :param reset: optional, adopt the node's count even if it is below
+            nonces already handed out (e.g. after transactions were dropped),
+            defaults to False
+        :type reset: bool
+        '''
+        with self._lock:
+            if reset:
+                self._next_nonce = 0
+            self._sync()
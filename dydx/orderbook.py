@@ -0,0 +1,358 @@
+import operator
+import dydx.constants as consts
+from decimal import Decimal
+from sortedcontainers import SortedDict
+
+UPDATE_TYPE_NEW = 'NEW'
+UPDATE_TYPE_UPDATE = 'UPDATE'
+UPDATE_TYPE_REMOVED = 'REMOVED'
+
+
+class PriceLevel(object):
+    '''
+    The resting orders at one price, with their total amount.
+    '''
+
+    __slots__ = ('price', 'amount', 'orders')
+
+    def __init__(self, price):
+        self.price = price
+        self.amount = Decimal(0)
+        self.orders = {}
+
+
+class BookSide(object):
+    '''
+    One side of an order book. Price levels are kept in a SortedDict ordered
+    best price first, so the top of book is read in O(1) and levels are
+    added or removed in O(log n).
+    '''
+
+    def __init__(self, side):
+        self.side = side
+        self.levels = SortedDict(
+            operator.neg if side == consts.SIDE_BUY else None
+        )
+
+    def __len__(self):
+        return len(self.levels)
+
+    def add(self, id, price, amount):
+        level = self.levels.get(price)
+        if level is None:
+            level = PriceLevel(price)
+            self.levels[price] = level
+        level.orders[id] = amount
+        level.amount += amount
+
+    def remove(self, id, price):
+        level = self.levels[price]
+        level.amount -= level.orders.pop(id)
+        if not level.orders:
+            del self.levels[price]
+
+    def best(self):
+        if not self.levels:
+            return None
+        level = self.levels.peekitem(0)[1]
+        return (level.price, level.amount)
+
+    def depth(self, n):
+        return [
+            (level.price, level.amount)
+            for level in self.levels.values()[:n]
+        ]
+
+
+class OrderBook(object):
+    '''
+    Local replica of the order book of one market.
+
+    Build it from a snapshot returned by Client.get_orderbook and keep it
+    current with incremental NEW, UPDATE and REMOVED messages. Prices and
+    amounts are Decimals; amounts are in base units as returned by the API.
+    '''
+
+    def __init__(
+        self,
+        market,
+        snapshot=None
+    ):
+        '''
+        :param market: required, name of market (e.g. WETH-DAI)
+        :type market: str
+
+        :param snapshot: optional, { asks: OrderOnOrderbook[],
+            bids: OrderOnOrderbook[] } as returned by Client.get_orderbook
+        :type snapshot: dict
+        '''
+        self.market = market
+        self.bids = BookSide(consts.SIDE_BUY)
+        self.asks = BookSide(consts.SIDE_SELL)
+        # order id => (side, price, amount)
+        self.orders = {}
+        if snapshot is not None:
+            self.load_snapshot(snapshot)
+
+    def __len__(self):
+        return len(self.orders)
+
+    def __contains__(self, id):
+        return id in self.orders
+
+    # -----------------------------------------------------------
+    # Helper Methods
+    # -----------------------------------------------------------
+
+    def _get_side(self, side):
+        if side == consts.SIDE_BUY:
+            return self.bids
+        if side == consts.SIDE_SELL:
+            return self.asks
+        raise ValueError('Invalid side: ' + str(side))
+
+    # -----------------------------------------------------------
+    # Updates
+    # -----------------------------------------------------------
+
+    def load_snapshot(
+        self,
+        snapshot
+    ):
+        '''
+        Replace the contents of the book with a full snapshot.
+
+        :param snapshot: required, { asks: OrderOnOrderbook[],
+            bids: OrderOnOrderbook[] } as returned by Client.get_orderbook
+        :type snapshot: dict
+        '''
+        self.bids = BookSide(consts.SIDE_BUY)
+        self.asks = BookSide(consts.SIDE_SELL)
+        self.orders = {}
+        for side, orders in (
+            (consts.SIDE_BUY, snapshot['bids']),
+            (consts.SIDE_SELL, snapshot['asks']),
+        ):
+            for order in orders:
+                self.add(order['id'], side, order['price'], order['amount'])
+
+    def add(
+        self,
+        id,
+        side,
+        price,
+        amount
+    ):
+        '''
+        Add an order to the book, replacing any order with the same id.
+
+        :param id: required
+        :type id: str
+
+        :param side: required
+        :type side: str in list ["BUY", "SELL"]
+
+        :param price: required
+        :type price: Decimal or str
+
+        :param amount: required
+        :type amount: Decimal or str
+        '''
+        book_side = self._get_side(side)
+        if id in self.orders:
+            self.remove(id)
+        price = Decimal(price)
+        amount = Decimal(amount)
+        book_side.add(id, price, amount)
+        self.orders[id] = (side, price, amount)
+
+    def update(
+        self,
+        id,
+        amount
+    ):
+        '''
+        Change the remaining amount of an order in the book. An amount of
+        zero removes the order. Unknown orders are ignored.
+
+        :param id: required
+        :type id: str
+
+        :param amount: required
+        :type amount: Decimal or str
+        '''
+        if id not in self.orders:
+            return
+        side, price, _ = self.orders[id]
+        amount = Decimal(amount)
+        self.remove(id)
+        if amount > 0:
+            self._get_side(side).add(id, price, amount)
+            self.orders[id] = (side, price, amount)
+
+    def remove(
+        self,
+        id
+    ):
+        '''
+        Remove an order from the book. Unknown orders are ignored.
+
+        :param id: required
+        :type id: str
+        '''
+        if id not in self.orders:
+            return
+        side, price, _ = self.orders.pop(id)
+        self._get_side(side).remove(id, price)
+
+    def apply_update(
+        self,
+        update
+    ):
+        '''
+        Apply one incremental update message.
+
+        :param update: required, { type: "NEW", id, side, price, amount },
+            { type: "UPDATE", id, amount } or { type: "REMOVED", id }
+        :type update: dict
+
+        :raises: ValueError
+        '''
+        update_type = update['type']
+        if update_type == UPDATE_TYPE_NEW:
+            self.add(
+                update['id'],
+                update['side'],
+                update['price'],
+                update['amount'],
+            )
+        elif update_type == UPDATE_TYPE_UPDATE:
+            if update['id'] not in self.orders and 'price' in update:
+                self.add(
+                    update['id'],
+                    update['side'],
+                    update['price'],
+                    update['amount'],
+                )
+            else:
+                self.update(update['id'], update['amount'])
+        elif update_type == UPDATE_TYPE_REMOVED:
+            self.remove(update['id'])
+        else:
+            raise ValueError('Invalid update type: ' + str(update_type))
+
+    def apply_updates(
+        self,
+        updates
+    ):
+        '''
+        Apply incremental update messages in order.
+
+        :param updates: required
+        :type updates: list of dict, see apply_update
+        '''
+        for update in updates:
+            self.apply_update(update)
+
+    def consume(
+        self,
+        feed
+    ):
+        '''
+        Apply updates from a feed until it is exhausted. The feed can be any
+        iterable, for example a generator reading from a websocket. Each item
+        is either one update, a list of updates, or a websocket message with
+        contents. A channel_data message's contents hold { updates: [...] };
+        a subscribed message's contents are a full snapshot, which replaces
+        the book.
+
+        :param feed: required
+        :type feed: iterable
+        '''
+        for message in feed:
+            if isinstance(message, dict) and 'contents' in message:
+                contents = message['contents']
+                if 'updates' not in contents:
+                    self.load_snapshot(contents)
+                    continue
+                message = contents['updates']
+            if isinstance(message, dict):
+                self.apply_update(message)
+            else:
+                self.apply_updates(message)
+
+    # -----------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------
+
+    def best_bid(self):
+        '''
+        :returns: (price, amount) of the highest bid, or None
+        '''
+        return self.bids.best()
+
+    def best_ask(self):
+        '''
+        :returns: (price, amount) of the lowest ask, or None
+        '''
+        return self.asks.best()
+
+    def spread(self):
+        '''
+        :returns: Decimal, best ask minus best bid, or None
+        '''
+        best_bid = self.bids.best()
+        best_ask = self.asks.best()
+        if best_bid is None or best_ask is None:
+            return None
+        return best_ask[0] - best_bid[0]
+
+    def depth(
+        self,
+        n
+    ):
+        '''
+        Return the best n price levels on each side.
+
+        :param n: required
+        :type n: number
+
+        :returns: { bids: (price, amount)[], asks: (price, amount)[] }
+        '''
+        return {
+            'bids': self.bids.depth(n),
+            'asks': self.asks.depth(n),
+        }
+
+    def vwap(
+        self,
+        size,
+        side=consts.SIDE_BUY
+    ):
+        '''
+        Return the volume-weighted average price of filling size against the
+        book. Buying walks the asks; selling walks the bids.
+
+        :param size: required, amount in base units
+        :type size: Decimal or number
+
+        :param side: optional, side of the taker, defaults to BUY
+        :type side: str in list ["BUY", "SELL"]
+
+        :returns: Decimal
+
+        :raises: ValueError
+        '''
+        size = Decimal(size)
+        if size <= 0:
+            raise ValueError('Size must be positive')
+        book_side = self.asks if side == consts.SIDE_BUY else self.bids
+        remaining = size
+        cost = Decimal(0)
+        for level in book_side.levels.values():
+            fill = min(remaining, level.amount)
+            cost += fill * level.price
+            remaining -= fill
+            if remaining == 0:
+                return cost / size
+        raise ValueError('Not enough liquidity to fill ' + str(size))
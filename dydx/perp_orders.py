@@ -1,5 +1,5 @@
-from web3 import Web3
 import dydx.constants as consts
+import dydx.eip712 as eip712
 import dydx.util as utils
 
 EIP712_ORDER_STRUCT_STRING = \
@@ -14,13 +14,7 @@ EIP712_ORDER_STRUCT_STRING = \
   'uint256 expiration' + \
   ')'
 
-EIP712_DOMAIN_STRING = \
-  'EIP712Domain(' + \
-  'string name,' + \
-  'string version,' + \
-  'uint256 chainId,' + \
-  'address verifyingContract' + \
-  ')'
+EIP712_DOMAIN_STRING = eip712.EIP712_DOMAIN_STRING
 
 EIP712_CANCEL_ORDER_STRUCT_STRING = \
   'CancelLimitOrder(' + \
@@ -31,7 +25,15 @@ EIP712_CANCEL_ORDER_STRUCT_STRING = \
 EIP712_CANCEL_ACTION = 'Cancel Orders'
 
 
-def get_domain_hash(pair):
+_order_hasher = eip712.StructHasher(EIP712_ORDER_STRUCT_STRING)
+_cancel_order_hasher = eip712.StructHasher(EIP712_CANCEL_ORDER_STRUCT_STRING)
+
+
+def get_domain_separator(pair):
+    '''
+    Returns the EIP712 domain separator for the orders contract of a
+    perpetual pair as raw bytes.
+    '''
     contract_name = ''
     contract_address = ''
     if pair == consts.PAIR_PBTC_USDC:
@@ -46,93 +48,127 @@ def get_domain_hash(pair):
     else:
         raise ValueError('Invalid perpetual pair')
 
-    return Web3.solidityKeccak(
-        [
-            'bytes32',
-            'bytes32',
-            'bytes32',
-            'uint256',
-            'bytes32'
-        ],
-        [
-            utils.hash_string(EIP712_DOMAIN_STRING),
-            utils.hash_string(contract_name),
-            utils.hash_string('1.0'),
-            consts.NETWORK_ID,
-            utils.address_to_bytes32(contract_address)
-        ]
-    ).hex()
+    return eip712.get_domain_separator(
+        contract_name,
+        '1.0',
+        consts.NETWORK_ID,
+        contract_address
+    )
+
+
+def get_domain_hash(pair):
+    return '0x' + get_domain_separator(pair).hex()
+
+
+def get_order_digest(order, pair):
+    '''
+    Returns the final signable EIP712 hash for an order as raw bytes.
+    '''
+    struct_hash = _order_hasher.hash([
+        get_order_flags(order['salt'], order['isBuy'], order['limitFee']),
+        int(order['amount']),
+        int(order['limitPrice'] * consts.BASE_DECIMAL),
+        int(order['triggerPrice'] * consts.BASE_DECIMAL),
+        int(abs(order['limitFee']) * consts.BASE_DECIMAL),
+        order['maker'],
+        order['taker'],
+        int(order['expiration'])
+    ])
+    return eip712.hash_typed_data(get_domain_separator(pair), struct_hash)
 
 
 def get_order_hash(order, pair):
     '''
     Returns the final signable EIP712 hash for an order.
     '''
+    return '0x' + get_order_digest(order, pair).hex()
 
-    struct_hash = Web3.solidityKeccak(
-        [
-            'bytes32',
-            'bytes32',
-            'uint256',
-            'uint256',
-            'uint256',
-            'uint256',
-            'bytes32',
-            'bytes32',
-            'uint256'
-        ],
-        [
-            utils.hash_string(EIP712_ORDER_STRUCT_STRING),
-            get_order_flags(order['salt'], order['isBuy'], order['limitFee']),
-            int(order['amount']),
-            int(order['limitPrice'] * consts.BASE_DECIMAL),
-            int(order['triggerPrice'] * consts.BASE_DECIMAL),
-            int(abs(order['limitFee']) * consts.BASE_DECIMAL),
-            utils.address_to_bytes32(order['maker']),
-            utils.address_to_bytes32(order['taker']),
-            int(order['expiration'])
-        ]
-    ).hex()
-    return utils.get_eip712_hash(get_domain_hash(pair), struct_hash)
+
+def get_cancel_orders_digest(order_hashes):
+    '''
+    Returns the final signable EIP712 hash for cancelling many orders with one
+    API call as raw bytes.
+    '''
+    struct_hash = _cancel_order_hasher.hash([
+        EIP712_CANCEL_ACTION,
+        order_hashes,
+    ])
+    return eip712.hash_typed_data(get_domain_separator(
+        consts.PAIR_PBTC_USDC,  # Use BTC Market. Orderbook should accept it.
+    ), struct_hash)
+
+
+def get_cancel_order_digest(order_hash):
+    '''
+    Returns the final signable EIP712 hash for a cancel order API call as raw
+    bytes.
+    '''
+    return get_cancel_orders_digest([order_hash])
 
 
 def get_cancel_order_hash(order_hash):
     '''
     Returns the final signable EIP712 hash for a cancel order API call.
     '''
-    action_hash = Web3.solidityKeccak(
-        ['string'],
-        [EIP712_CANCEL_ACTION]
-    ).hex()
-    orders_hash = Web3.solidityKeccak(
-        ['bytes32'],
-        [order_hash]
-    ).hex()
-    struct_hash = Web3.solidityKeccak(
-        [
-            'bytes32',
-            'bytes32',
-            'bytes32',
-        ],
-        [
-            utils.hash_string(EIP712_CANCEL_ORDER_STRUCT_STRING),
-            action_hash,
-            orders_hash,
-        ]
-    ).hex()
-    return utils.get_eip712_hash(get_domain_hash(
-        consts.PAIR_PBTC_USDC,  # Use BTC Market. Orderbook should accept it.
-    ), struct_hash)
+    return '0x' + get_cancel_order_digest(order_hash).hex()
+
+
+def get_cancel_orders_hash(order_hashes):
+    '''
+    Returns the final signable EIP712 hash for cancelling many orders with one
+    API call.
+    '''
+    return '0x' + get_cancel_orders_digest(order_hashes).hex()
 
 
 def sign_order(order, pair, private_key):
-    order_hash = get_order_hash(order, pair)
-    return utils.sign_hash(order_hash, private_key)
+    return utils.get_signer(private_key).sign_digest(
+        get_order_digest(order, pair)
+    )
+
+
+def sign_orders(orders, pair, private_key, executor=None):
+    '''
+    Signs many orders and returns copies of them with typedSignature set, in
+    input order.
+
+    :param orders: required
+    :type orders: list of Order
+
+    :param pair: required
+    :type pair: str in list [
+        "PBTC-USDC",
+        "PLINK-USDC",
+        "WETH-PUSD",
+    ]
+
+    :param private_key: required
+    :type private_key: bytearray or utils.Signer
+
+    :param executor: optional, process pool to sign across, see
+        utils.sign_hashes
+    :type executor: concurrent.futures.Executor
+
+    :returns: list of Order
+    '''
+    hashes = [get_order_digest(order, pair) for order in orders]
+    signatures = utils.sign_hashes(hashes, private_key, executor)
+    return [
+        dict(order, typedSignature=signature)
+        for order, signature in zip(orders, signatures)
+    ]
 
 
 def sign_cancel_order(order_hash, private_key):
-    cancel_order_hash = get_cancel_order_hash(order_hash)
-    return utils.sign_hash(cancel_order_hash, private_key)
+    return utils.get_signer(private_key).sign_digest(
+        get_cancel_order_digest(order_hash)
+    )
+
+
+def sign_cancel_orders(order_hashes, private_key):
+    return utils.get_signer(private_key).sign_digest(
+        get_cancel_orders_digest(order_hashes)
+    )
 
 
 def get_order_flags(salt, isBuy, limitFee):
@@ -0,0 +1,205 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, wait
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+DEFAULT_POLL_INTERVAL = 1
+
+
+def _to_hex(tx_hash):
+    if not isinstance(tx_hash, str):
+        tx_hash = '0x' + bytes(tx_hash).hex()
+    return tx_hash.lower()
+
+
+class ReceiptTracker(object):
+    '''
+    Waits for the receipts of many transactions at once.
+
+    Each poll asks the node for the receipt of every pending transaction in
+    a single JSON-RPC batch. Transactions are resolved as soon as they are
+    mined: their futures get the receipt, their callbacks are called with
+    it, and its gasUsed refines the gas profiles of the Eth instance. Polls
+    run on a background thread after start(), or in the caller's thread in
+    wait(). All methods are thread safe.
+    '''
+
+    def __init__(
+        self,
+        eth,
+        poll_interval=DEFAULT_POLL_INTERVAL
+    ):
+        '''
+        :param eth: required
+        :type eth: Eth
+
+        :param poll_interval: optional, seconds between polls, defaults to 1
+        :type poll_interval: number
+        '''
+        self.eth = eth
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        # tx hash => Future
+        self._pending = OrderedDict()
+        self._stop_event = None
+        self._thread = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    # -----------------------------------------------------------
+    # Helper Methods
+    # -----------------------------------------------------------
+
+    def _run(self, stop_event):
+        while not stop_event.is_set():
+            try:
+                self.poll()
+            except Exception:
+                # Keep the last state and try again on the next poll
+                pass
+            stop_event.wait(self.poll_interval)
+
+    # -----------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------
+
+    def track(
+        self,
+        tx_hash,
+        callback=None
+    ):
+        '''
+        Start waiting for a transaction to be mined.
+
+        :param tx_hash: required
+        :type tx_hash: str or bytes
+
+        :param callback: optional, called with the receipt once mined
+        :type callback: function
+
+        :returns: Future resolved with the receipt
+        '''
+        tx_hash = _to_hex(tx_hash)
+        with self._lock:
+            future = self._pending.get(tx_hash)
+            if future is None:
+                future = Future()
+                self._pending[tx_hash] = future
+        if callback is not None:
+            def on_done(done):
+                if not done.cancelled() and done.exception() is None:
+                    callback(done.result())
+            future.add_done_callback(on_done)
+        return future
+
+    def poll(self):
+        '''
+        Ask the node for the receipts of every pending transaction in one
+        batched request, and resolve the ones that have been mined. Mined
+        receipts are read again through web3 so they are formatted like
+        web3.eth.getTransactionReceipt.
+
+        :returns: number of transactions resolved
+
+        :raises: ValueError if the node returned an error
+        '''
+        with self._lock:
+            tx_hashes = list(self._pending)
+        if not tx_hashes:
+            return 0
+
+        batch = self.eth.batch()
+        for tx_hash in tx_hashes:
+            batch.add_rpc('eth_getTransactionReceipt', [tx_hash])
+        mined = [
+            tx_hash
+            for tx_hash, receipt in zip(tx_hashes, batch.execute())
+            if receipt is not None
+        ]
+        receipts = []
+        for tx_hash in mined:
+            try:
+                receipts.append((
+                    tx_hash,
+                    self.eth.web3.eth.getTransactionReceipt(tx_hash),
+                ))
+            except TransactionNotFound:
+                # Dropped by a reorg since the batch; keep waiting
+                pass
+
+        resolved = []
+        with self._lock:
+            for tx_hash, receipt in receipts:
+                future = self._pending.pop(tx_hash, None)
+                if future is not None:
+                    resolved.append((tx_hash, future, receipt))
+        for tx_hash, future, receipt in resolved:
+            self.eth._record_gas_used(tx_hash, receipt)
+            future.set_result(receipt)
+        return len(resolved)
+
+    def wait(
+        self,
+        tx_hashes,
+        timeout=120
+    ):
+        '''
+        Wait for many transactions to be mined. Polls in the calling thread
+        unless the background thread is running.
+
+        :param tx_hashes: required
+        :type tx_hashes: list of str or bytes
+
+        :param timeout: optional, seconds, defaults to 120
+        :type timeout: number
+
+        :returns: list of receipts, in the order of tx_hashes
+
+        :raises: TimeExhausted
+        '''
+        futures = [self.track(tx_hash) for tx_hash in tx_hashes]
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._thread is None:
+                self.poll()
+            remaining = deadline - time.monotonic()
+            _, not_done = wait(
+                futures,
+                timeout=max(0, min(remaining, self.poll_interval)),
+            )
+            if not not_done:
+                return [future.result() for future in futures]
+            if time.monotonic() >= deadline:
+                raise TimeExhausted(
+                    '%d of %d transactions not mined after %s seconds'
+                    % (len(not_done), len(futures), timeout)
+                )
+
+    def start(self):
+        '''
+        Poll on a background daemon thread every poll_interval seconds.
+        '''
+        if self._thread is not None:
+            return
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._stop_event,),
+            name='dydx-receipt-tracker',
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        '''
+        Stop the background thread started with start(). Pending
+        transactions stay tracked.
+        '''
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._stop_event = None
@@ -0,0 +1,169 @@
+import calendar
+import sys
+from decimal import Decimal
+
+
+def iso_to_epoch_ms(value):
+    '''
+    Parse an API timestamp such as '2020-03-08T17:42:36.037Z' into
+    milliseconds since the epoch.
+
+    :param value: required
+    :type value: str
+
+    :returns: number
+
+    :raises: ValueError
+    '''
+    if len(value) < 20 or value[-1] != 'Z':
+        raise ValueError('Unsupported timestamp: %s' % value)
+    seconds = calendar.timegm((
+        int(value[0:4]),
+        int(value[5:7]),
+        int(value[8:10]),
+        int(value[11:13]),
+        int(value[14:16]),
+        int(value[17:19]),
+    ))
+    fraction = value[20:-1] if value[19] == '.' else ''
+    return seconds * 1000 + int((fraction + '000')[:3])
+
+
+def _amount(value):
+    # Base-unit amounts are integers; anything else is kept exact
+    try:
+        return int(value)
+    except ValueError:
+        return Decimal(value)
+
+
+def _same(value):
+    return value
+
+
+_text = sys.intern
+
+
+class _Record(object):
+    '''
+    Fixed-field record parsed once from an API response row. Amounts are
+    ints, prices Decimals, timestamps epoch milliseconds, and repeated
+    strings such as markets and addresses are interned.
+    '''
+    __slots__ = ()
+    # (field name, parser), in response order
+    FIELDS = ()
+
+    @classmethod
+    def from_json(cls, row):
+        '''
+        :param row: required, one row of an API response
+        :type row: dict
+
+        :returns: record, with None for fields missing from the row
+        '''
+        record = cls.__new__(cls)
+        get = row.get
+        for name, parse in cls.FIELDS:
+            value = get(name)
+            setattr(record, name, None if value is None else parse(value))
+        return record
+
+    @classmethod
+    def from_json_list(cls, rows):
+        return [cls.from_json(row) for row in rows]
+
+    def __getitem__(self, name):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name)
+            for name in self.__slots__
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '%s(%s)' % (
+            type(self).__name__,
+            ', '.join(
+                '%s=%r' % (name, getattr(self, name))
+                for name in self.__slots__
+            ),
+        )
+
+    def as_dict(self):
+        '''
+        :returns: dict of the parsed fields
+        '''
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+class Order(_Record):
+    FIELDS = (
+        ('uuid', _same),
+        ('id', _same),
+        ('clientId', _same),
+        ('status', _text),
+        ('accountOwner', _text),
+        ('accountNumber', int),
+        ('orderType', _text),
+        ('fillOrKill', _same),
+        ('postOnly', _same),
+        ('triggerPrice', Decimal),
+        ('market', _text),
+        ('side', _text),
+        ('baseAmount', _amount),
+        ('quoteAmount', _amount),
+        ('filledAmount', _amount),
+        ('price', Decimal),
+        ('cancelReason', _text),
+        ('createdAt', iso_to_epoch_ms),
+        ('updatedAt', iso_to_epoch_ms),
+        ('expiresAt', iso_to_epoch_ms),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class Fill(_Record):
+    FIELDS = (
+        ('uuid', _same),
+        ('createdAt', iso_to_epoch_ms),
+        ('transactionHash', _same),
+        ('status', _text),
+        ('market', _text),
+        ('side', _text),
+        ('feeAmount', _amount),
+        ('orderClientId', _same),
+        ('price', Decimal),
+        ('amount', _amount),
+        ('orderId', _same),
+        ('accountOwner', _text),
+        ('accountNumber', int),
+        ('liquidity', _text),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class Trade(_Record):
+    FIELDS = (
+        ('uuid', _same),
+        ('createdAt', iso_to_epoch_ms),
+        ('transactionHash', _same),
+        ('status', _text),
+        ('market', _text),
+        ('side', _text),
+        ('price', Decimal),
+        ('amount', _amount),
+        ('makerOrderId', _same),
+        ('makerAccountOwner', _text),
+        ('makerAccountNumber', int),
+        ('takerOrderId', _same),
+        ('takerAccountOwner', _text),
+        ('takerAccountNumber', int),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
@@ -0,0 +1,151 @@
+import threading
+import time
+
+DEFAULT_TTL = 60
+DEFAULT_STALE_TTL = 300
+
+
+class ResponseCache(object):
+    '''
+    Stores API responses for slow-changing endpoints such as market
+    metadata.
+
+    A response is fresh for the ttl of its endpoint. After that it is
+    stale for another stale_ttl seconds: it is still served, while the
+    client refreshes it in the background. Past both it is fetched again
+    before being returned. Responses are shared between callers and should
+    be treated as read-only. All methods are thread safe.
+    '''
+
+    def __init__(
+        self,
+        ttl=DEFAULT_TTL,
+        stale_ttl=DEFAULT_STALE_TTL,
+        ttls=None
+    ):
+        '''
+        :param ttl: optional, seconds a response is fresh, defaults to 60
+        :type ttl: number
+
+        :param stale_ttl: optional, seconds a response is served while it is
+            refreshed in the background, defaults to 300
+        :type stale_ttl: number
+
+        :param ttls: optional, ttl per endpoint, keyed by Client method name,
+            e.g. {'get_perpetual_markets': 10}
+        :type ttls: dict
+        '''
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.ttls = dict(ttls or {})
+        self._lock = threading.Lock()
+        # uri => (response, fetched at)
+        self._entries = {}
+        # uris being refreshed in the background
+        self._refreshing = set()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_ttl(
+        self,
+        endpoint
+    ):
+        '''
+        :param endpoint: required, Client method name
+        :type endpoint: str
+
+        :returns: number, seconds a response of the endpoint is fresh
+        '''
+        return self.ttls.get(endpoint, self.ttl)
+
+    def lookup(
+        self,
+        endpoint,
+        uri
+    ):
+        '''
+        :param endpoint: required, Client method name
+        :type endpoint: str
+
+        :param uri: required
+        :type uri: str
+
+        :returns: (response, is_stale), or None if the response must be
+            fetched before it is returned
+        '''
+        with self._lock:
+            entry = self._entries.get(uri)
+        if entry is None:
+            return None
+        response, fetched_at = entry
+        age = time.monotonic() - fetched_at
+        ttl = self.get_ttl(endpoint)
+        if age < ttl:
+            return response, False
+        if age < ttl + self.stale_ttl:
+            return response, True
+        return None
+
+    def begin_refresh(
+        self,
+        uri
+    ):
+        '''
+        Claim the background refresh of a stale response.
+
+        :returns: bool, False if a refresh is already in flight
+        '''
+        with self._lock:
+            if uri in self._refreshing:
+                return False
+            self._refreshing.add(uri)
+            return True
+
+    def end_refresh(
+        self,
+        uri,
+        response=None
+    ):
+        '''
+        Finish a background refresh, storing the response if there is one.
+        The response is dropped if the uri was invalidated meanwhile.
+        '''
+        with self._lock:
+            if uri not in self._refreshing:
+                return
+            self._refreshing.discard(uri)
+            if response is not None:
+                self._entries[uri] = (response, time.monotonic())
+
+    def store(
+        self,
+        uri,
+        response
+    ):
+        with self._lock:
+            self._entries[uri] = (response, time.monotonic())
+
+    def invalidate(
+        self,
+        uri=None
+    ):
+        '''
+        Drop cached responses so they are fetched again on the next call.
+
+        :param uri: optional, drops every response whose uri starts with
+            it, e.g. '/v2/markets'. Defaults to dropping everything.
+        :type uri: str
+        '''
+        with self._lock:
+            if uri is None:
+                self._entries = {}
+                self._refreshing = set()
+                return
+            for cached_uri in list(self._entries):
+                if cached_uri.startswith(uri):
+                    del self._entries[cached_uri]
+            self._refreshing = set(
+                refreshing for refreshing in self._refreshing
+                if not refreshing.startswith(uri)
+            )
@@ -1,5 +1,5 @@
-from web3 import Web3
 import dydx.constants as consts
+import dydx.eip712 as eip712
 import dydx.util as utils
 
 EIP712_ORDER_STRUCT_STRING = \
@@ -16,13 +16,7 @@ EIP712_ORDER_STRUCT_STRING = \
   'uint256 expiration' + \
   ')'
 
-EIP712_DOMAIN_STRING = \
-  'EIP712Domain(' + \
-  'string name,' + \
-  'string version,' + \
-  'uint256 chainId,' + \
-  'address verifyingContract' + \
-  ')'
+EIP712_DOMAIN_STRING = eip712.EIP712_DOMAIN_STRING
 
 EIP712_CANCEL_ORDER_STRUCT_STRING = \
   'CancelLimitOrder(' + \
@@ -33,95 +27,128 @@ EIP712_CANCEL_ORDER_STRUCT_STRING = \
 EIP712_CANCEL_ACTION = 'Cancel Orders'
 
 
+_order_hasher = eip712.StructHasher(EIP712_ORDER_STRUCT_STRING)
+_cancel_order_hasher = eip712.StructHasher(EIP712_CANCEL_ORDER_STRUCT_STRING)
+
+
+def get_domain_separator():
+    '''
+    Returns the EIP712 domain separator for CanonicalOrders as raw bytes.
+    '''
+    return eip712.get_domain_separator(
+        'CanonicalOrders',
+        '1.1',
+        consts.NETWORK_ID,
+        consts.CANONICAL_ORDERS_ADDRESS
+    )
+
+
 def get_domain_hash():
-    return Web3.solidityKeccak(
-        [
-            'bytes32',
-            'bytes32',
-            'bytes32',
-            'uint256',
-            'bytes32'
-        ],
-        [
-            utils.hash_string(EIP712_DOMAIN_STRING),
-            utils.hash_string('CanonicalOrders'),
-            utils.hash_string('1.1'),
-            consts.NETWORK_ID,
-            utils.address_to_bytes32(consts.CANONICAL_ORDERS_ADDRESS)
-        ]
-    ).hex()
+    return '0x' + get_domain_separator().hex()
+
+
+def get_order_digest(order):
+    '''
+    Returns the final signable EIP712 hash for an order as raw bytes.
+    '''
+    struct_hash = _order_hasher.hash([
+        get_order_flags(order['salt'], order['isBuy'], order['limitFee']),
+        int(order['baseMarket']),
+        int(order['quoteMarket']),
+        int(order['amount']),
+        int(order['limitPrice'] * consts.BASE_DECIMAL),
+        int(order['triggerPrice'] * consts.BASE_DECIMAL),
+        int(abs(order['limitFee']) * consts.BASE_DECIMAL),
+        order['makerAccountOwner'],
+        int(order['makerAccountNumber']),
+        int(order['expiration'])
+    ])
+    return eip712.hash_typed_data(get_domain_separator(), struct_hash)
 
 
 def get_order_hash(order):
     '''
     Returns the final signable EIP712 hash for an order.
     '''
-    struct_hash = Web3.solidityKeccak(
-        [
-            'bytes32',
-            'bytes32',
-            'uint256',
-            'uint256',
-            'uint256',
-            'uint256',
-            'uint256',
-            'uint256',
-            'bytes32',
-            'uint256',
-            'uint256'
-        ],
-        [
-            utils.hash_string(EIP712_ORDER_STRUCT_STRING),
-            get_order_flags(order['salt'], order['isBuy'], order['limitFee']),
-            int(order['baseMarket']),
-            int(order['quoteMarket']),
-            int(order['amount']),
-            int(order['limitPrice'] * consts.BASE_DECIMAL),
-            int(order['triggerPrice'] * consts.BASE_DECIMAL),
-            int(abs(order['limitFee']) * consts.BASE_DECIMAL),
-            utils.address_to_bytes32(order['makerAccountOwner']),
-            int(order['makerAccountNumber']),
-            int(order['expiration'])
-        ]
-    ).hex()
-    return utils.get_eip712_hash(get_domain_hash(), struct_hash)
+    return '0x' + get_order_digest(order).hex()
+
+
+def get_cancel_orders_digest(order_hashes):
+    '''
+    Returns the final signable EIP712 hash for cancelling many orders with one
+    API call as raw bytes.
+    '''
+    struct_hash = _cancel_order_hasher.hash([
+        EIP712_CANCEL_ACTION,
+        order_hashes,
+    ])
+    return eip712.hash_typed_data(get_domain_separator(), struct_hash)
+
+
+def get_cancel_order_digest(order_hash):
+    '''
+    Returns the final signable EIP712 hash for a cancel order API call as raw
+    bytes.
+    '''
+    return get_cancel_orders_digest([order_hash])
 
 
 def get_cancel_order_hash(order_hash):
     '''
     Returns the final signable EIP712 hash for a cancel order API call.
     '''
-    action_hash = Web3.solidityKeccak(
-        ['string'],
-        [EIP712_CANCEL_ACTION]
-    ).hex()
-    orders_hash = Web3.solidityKeccak(
-        ['bytes32'],
-        [order_hash]
-    ).hex()
-    struct_hash = Web3.solidityKeccak(
-        [
-            'bytes32',
-            'bytes32',
-            'bytes32',
-        ],
-        [
-            utils.hash_string(EIP712_CANCEL_ORDER_STRUCT_STRING),
-            action_hash,
-            orders_hash,
-        ]
-    ).hex()
-    return utils.get_eip712_hash(get_domain_hash(), struct_hash)
+    return '0x' + get_cancel_order_digest(order_hash).hex()
+
+
+def get_cancel_orders_hash(order_hashes):
+    '''
+    Returns the final signable EIP712 hash for cancelling many orders with one
+    API call.
+    '''
+    return '0x' + get_cancel_orders_digest(order_hashes).hex()
 
 
 def sign_order(order, private_key):
-    order_hash = get_order_hash(order)
-    return utils.sign_hash(order_hash, private_key)
+    return utils.get_signer(private_key).sign_digest(
+        get_order_digest(order)
+    )
+
+
+def sign_orders(orders, private_key, executor=None):
+    '''
+    Signs many orders and returns copies of them with typedSignature set, in
+    input order.
+
+    :param orders: required
+    :type orders: list of Order
+
+    :param private_key: required
+    :type private_key: bytearray or utils.Signer
+
+    :param executor: optional, process pool to sign across, see
+        utils.sign_hashes
+    :type executor: concurrent.futures.Executor
+
+    :returns: list of Order
+    '''
+    hashes = [get_order_digest(order) for order in orders]
+    signatures = utils.sign_hashes(hashes, private_key, executor)
+    return [
+        dict(order, typedSignature=signature)
+        for order, signature in zip(orders, signatures)
+    ]
 
 
 def sign_cancel_order(order_hash, private_key):
-    cancel_order_hash = get_cancel_order_hash(order_hash)
-    return utils.sign_hash(cancel_order_hash, private_key)
+    return utils.get_signer(private_key).sign_digest(
+        get_cancel_order_digest(order_hash)
+    )
+
+
+def sign_cancel_orders(order_hashes, private_key):
+    return utils.get_signer(private_key).sign_digest(
+        get_cancel_orders_digest(order_hashes)
+    )
 
 
 def get_order_flags(salt, isBuy, limitFee):
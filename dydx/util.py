@@ -1,27 +1,22 @@
-from web3 import Web3
-import eth_keys
-import eth_account
+import functools
+import os
 import time
 import dydx.constants as consts
+import dydx.eip712 as eip712
+from eth_hash.auto import keccak
+
+ETH_SIGNED_MESSAGE_PREFIX = b'\x19Ethereum Signed Message:\n32'
 
 
 def get_eip712_hash(domain_hash, struct_hash):
-    return Web3.solidityKeccak(
-        [
-            'bytes2',
-            'bytes32',
-            'bytes32'
-        ],
-        [
-            '0x1901',
-            domain_hash,
-            struct_hash
-        ]
+    return '0x' + eip712.hash_typed_data(
+        eip712.encode_bytes32(domain_hash),
+        eip712.encode_bytes32(struct_hash)
     ).hex()
 
 
 def hash_string(input):
-    return Web3.solidityKeccak(['string'], [input]).hex()
+    return '0x' + eip712.encode_string(input).hex()
 
 
 def strip_hex_prefix(input):
@@ -45,6 +40,7 @@ def normalize_private_key(private_key):
 
 
 def private_key_to_address(key):
+    import eth_keys
     eth_keys_key = eth_keys.keys.PrivateKey(key)
     return eth_keys_key.public_key.to_checksum_address()
 
@@ -62,6 +58,23 @@ def dict_to_query_params(param_dict):
     )
 
 
+def iso_after(timestamp):
+    '''
+    :param timestamp: required, such as '2020-03-08T17:42:36.037Z'
+    :type timestamp: str
+
+    :returns: str, the UTC timestamp one millisecond later
+
+    :raises: ValueError
+    '''
+    from dydx.records import iso_to_epoch_ms
+    epoch_ms = iso_to_epoch_ms(timestamp) + 1
+    return time.strftime(
+        '%Y-%m-%dT%H:%M:%S',
+        time.gmtime(epoch_ms // 1000),
+    ) + '.%03dZ' % (epoch_ms % 1000)
+
+
 def epoch_in_four_weeks():
     return int(time.time()) + consts.FOUR_WEEKS_IN_SECONDS
 
@@ -120,9 +133,96 @@ def decimalToStr(d):
     return '{:f}'.format(d.normalize())
 
 
-def sign_hash(hash, private_key):
-    result = eth_account.account.Account.sign_message(
-        eth_account.messages.encode_defunct(hexstr=hash),
+class Signer(object):
+    '''
+    Holds a private key that is parsed once and reused for every order,
+    cancel and transaction signature.
+
+    eth_keys is imported on first construction and eth_account on the first
+    transaction signature, so that importing dydx stays fast.
+    '''
+
+    def __init__(
+        self,
         private_key
-    )
-    return result['signature'].hex() + '01'
+    ):
+        import eth_keys
+        if isinstance(private_key, bytes):
+            private_key = bytearray(private_key)
+        self.private_key = normalize_private_key(private_key)
+        self.key = eth_keys.keys.PrivateKey(bytes(self.private_key))
+        self.address = self.key.public_key.to_checksum_address()
+
+    def __reduce__(self):
+        # Send only the raw key to worker processes
+        return (Signer, (self.private_key,))
+
+    def sign_digest(self, digest):
+        '''
+        Signs a raw 32-byte hash as an Ethereum signed message.
+
+        :param digest: required
+        :type digest: bytes
+
+        :returns: str (typed signature)
+        '''
+        signature = self.key.sign_msg_hash(
+            keccak(ETH_SIGNED_MESSAGE_PREFIX + digest)
+        )
+        v, r, s = signature.vrs
+        return '0x' + (
+            r.to_bytes(32, 'big') +
+            s.to_bytes(32, 'big') +
+            bytes([v + 27])
+        ).hex() + '01'
+
+    def sign_hash(self, hash):
+        return self.sign_digest(bytes(eip712.encode_bytes32(hash)))
+
+    def sign_transaction(self, transaction):
+        import eth_account
+        return eth_account.Account.sign_transaction(transaction, self.key)
+
+
+def get_signer(private_key):
+    if isinstance(private_key, Signer):
+        return private_key
+    return Signer(private_key)
+
+
+def sign_hash(hash, private_key):
+    return get_signer(private_key).sign_hash(hash)
+
+
+def sign_hashes(hashes, private_key, executor=None, chunksize=None):
+    '''
+    Signs many hashes and returns the signatures in input order.
+
+    :param hashes: required
+    :type hashes: list of str or bytes
+
+    :param private_key: required
+    :type private_key: bytearray or Signer
+
+    :param executor: optional, a concurrent.futures.ProcessPoolExecutor to
+        spread the signatures over. Signs serially when None. The executor
+        should outlive the call; starting a pool costs more than signing a
+        small batch.
+    :type executor: concurrent.futures.Executor
+
+    :param chunksize: optional, hashes sent to a worker at a time, defaults
+        to an even split over twice the number of CPUs
+    :type chunksize: number
+
+    :returns: list of str
+    '''
+    signer = get_signer(private_key)
+    if executor is None or len(hashes) <= 1:
+        return [signer.sign_hash(hash) for hash in hashes]
+    if chunksize is None:
+        chunksize = max(1, -(-len(hashes) // (2 * (os.cpu_count() or 1))))
+    return list(executor.map(
+        functools.partial(sign_hash, private_key=signer),
+        hashes,
+        chunksize=chunksize
+    ))
@@ -19,6 +19,11 @@ setup(
     license='Apache 2.0',
     author_email='contact@dydx.exchange',
     install_requires=REQUIREMENTS,
+    extras_require={
+        'async': ['aiohttp>=3.6.0,<4.0.0'],
+        'json': ['orjson>=3.0.0'],
+        'numpy': ['numpy>=1.16.0'],
+    },
     keywords='dydx exchange rest api defi ethereum eth',
     classifiers=[
         'Intended Audience :: Developers',
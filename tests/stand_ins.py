@@ -0,0 +1,169 @@
+'''
+Stand-ins for an Ethereum node shared by the tests.
+'''
+import json
+import dydx.constants as consts
+from hexbytes import HexBytes
+
+
+def stand_in_node(results, errors=(), reverse=False):
+    '''
+    Returns a requests_mock json callback that answers JSON-RPC requests,
+    single or batched, like a node would. eth_chainId is answered with
+    0x1. Every request is recorded in callback.requests, and every batched
+    body in callback.batches.
+
+    :param results: required, maps each JSON-RPC method to a function of
+        the request's params that returns the result
+    :type results: dict
+
+    :param errors: optional, methods answered with an execution reverted
+        error instead
+    :type errors: list of str
+
+    :param reverse: optional, answer batches in reverse order, which nodes
+        are allowed to do
+    :type reverse: bool
+    '''
+    requests = []
+    batches = []
+
+    def answer(request):
+        requests.append(request)
+        if request['method'] in errors:
+            return {
+                'jsonrpc': '2.0',
+                'id': request['id'],
+                'error': {'code': -32000, 'message': 'execution reverted'},
+            }
+        if request['method'] == 'eth_chainId':
+            result = '0x1'
+        else:
+            result = results[request['method']](request['params'])
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+
+    def callback(request, context):
+        body = json.loads(request.body)
+        if not isinstance(body, list):
+            return answer(body)
+        batches.append(body)
+        answers = [answer(item) for item in body]
+        return answers[::-1] if reverse else answers
+
+    callback.requests = requests
+    callback.batches = batches
+    return callback
+
+
+class StandInWeb3(object):
+    '''
+    Stand-in for web3 that serves a transaction count, accepts raw
+    transactions and returns receipts. Counts the transaction count calls
+    and records every raw transaction sent.
+    '''
+
+    def __init__(
+        self,
+        count=0,
+        address=None,
+        nonce_too_low=0,
+        insufficient_funds=0,
+        status=1,
+        gas_used=40000
+    ):
+        '''
+        :param count: optional, the transaction count served
+        :type count: number
+
+        :param address: optional, the only address whose count is served
+        :type address: str
+
+        :param nonce_too_low: optional, how many of the first sends are
+            rejected with nonce too low
+        :type nonce_too_low: number
+
+        :param insufficient_funds: optional, how many of the sends after
+            those are rejected with insufficient funds
+        :type insufficient_funds: number
+
+        :param status: optional, status of every receipt
+        :type status: number
+
+        :param gas_used: optional, gasUsed of every receipt
+        :type gas_used: number
+        '''
+        self.count = count
+        self.address = address
+        self.nonce_too_low = nonce_too_low
+        self.insufficient_funds = insufficient_funds
+        self.status = status
+        self.gas_used = gas_used
+        self.calls = 0
+        self.sent = []
+        self.eth = self
+
+    def getTransactionCount(self, address, block_identifier):
+        assert self.address is None or address == self.address
+        assert block_identifier == 'pending'
+        self.calls += 1
+        return self.count
+
+    def sendRawTransaction(self, raw_transaction):
+        self.sent.append(raw_transaction)
+        if len(self.sent) <= self.nonce_too_low:
+            raise ValueError({'code': -32000, 'message': 'nonce too low'})
+        if len(self.sent) <= self.nonce_too_low + self.insufficient_funds:
+            raise ValueError({
+                'code': -32000,
+                'message': 'insufficient funds for gas * price + value',
+            })
+        return HexBytes(bytes([len(self.sent)]) * 32)
+
+    def waitForTransactionReceipt(self, tx_hash):
+        return {'status': self.status, 'gasUsed': self.gas_used}
+
+
+class StandInMethod(object):
+    '''
+    Stand-in for a contract function call, DAI's approve, that estimates
+    gas and builds transactions, recording the gas and nonce of each.
+    '''
+    address = consts.DAI_ADDRESS
+    abi = {
+        'type': 'function',
+        'name': 'approve',
+        'inputs': [
+            {'name': 'spender', 'type': 'address'},
+            {'name': 'amount', 'type': 'uint256'},
+        ],
+    }
+
+    def __init__(self, estimate=50000):
+        '''
+        :param estimate: optional, the gas estimate, or None to fail
+            estimation
+        :type estimate: number
+        '''
+        self.estimate = estimate
+        self.estimate_calls = 0
+        self.gas = []
+        self.nonces = []
+
+    def estimateGas(self, options):
+        self.estimate_calls += 1
+        if self.estimate is None:
+            raise ValueError('execution reverted')
+        return self.estimate
+
+    def buildTransaction(self, options):
+        self.gas.append(options['gas'])
+        self.nonces.append(options['nonce'])
+        return {
+            'to': self.address,
+            'value': options['value'],
+            'gas': options['gas'],
+            'gasPrice': options['gasPrice'],
+            'nonce': options['nonce'],
+            'chainId': 1,
+            'data': b'',
+        }
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import pytest
+import tests.test_json
+import dydx.solo_orders as solo_orders
+from decimal import Decimal
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+from dydx.async_client import AsyncClient  # noqa: E402
+from dydx.exceptions import DydxAPIError  # noqa: E402
+from dydx.response_cache import ResponseCache  # noqa: E402
+
+PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+ORDER_HASH = '0x50538cce27ddd08a8a3732aaedb90b5ef55fd92a6819f5798edc043833776405'  # noqa: E501
+FILLED_HASH = '0x' + '1' * 64
+CANCEL_ORDER_SIGNATURE = '0xe760368bbdb904809d2383606e27b9ab8ed57f47ce37dc67d4f87e59bb9102c46447f7ce20f1751cd7d670f2b7e4dec61da3288f242d3a003cc70b13a8560f7c1b01'  # noqa: E501
+
+
+def _run(handler):
+    '''
+    Runs handler(client) against a local stand-in for the dYdX API.
+    '''
+    requests = []
+
+    async def get_orderbook(request):
+        requests.append(request.path)
+        return web.json_response(tests.test_json.mock_get_orders_json)
+
+    async def get_markets(request):
+        return web.json_response(status=400, data={'error': 'bad'})
+
+    async def post_order(request):
+        body = json.loads(await request.text())
+        order = body['order']
+        expected_signature = solo_orders.sign_order({
+            'isBuy': order['isBuy'],
+            'baseMarket': int(order['baseMarket']),
+            'quoteMarket': int(order['quoteMarket']),
+            'amount': int(order['amount']),
+            'limitPrice': Decimal(order['limitPrice']),
+            'triggerPrice': Decimal(order['triggerPrice']),
+            'limitFee':  Decimal(order['limitFee']),
+            'makerAccountOwner': order['makerAccountOwner'],
+            'makerAccountNumber': int(order['makerAccountNumber']),
+            'expiration': int(order['expiration']),
+            'salt': int(order['salt'])
+        }, PRIVATE_KEY_1)
+        assert order['typedSignature'] == expected_signature
+        return web.json_response(tests.test_json.mock_place_order_json)
+
+    async def delete_order(request):
+        if request.match_info['hash'] != ORDER_HASH:
+            return web.json_response(status=400, data={'error': 'filled'})
+        assert request.headers['Authorization'] == \
+            'Bearer ' + CANCEL_ORDER_SIGNATURE
+        return web.json_response(tests.test_json.mock_cancel_order_json)
+
+    async def delete_orders(request):
+        return web.json_response(status=404, data={'error': 'not found'})
+
+    async def get_perpetual_market(request):
+        requests.append(request.path)
+        return web.json_response(tests.test_json.mock_get_market_json)
+
+    async def get_fills(request):
+        before = request.query.get('startingBefore', '9')
+        limit = int(request.query['limit'])
+        # Two fills at 00:04, which a page boundary falls between
+        fills = [
+            {'uuid': uuid, 'createdAt': '2020-01-01T00:00:0%s.000Z' % second}
+            for uuid, second in zip('abcde', '54432')
+        ]
+        fills = [
+            fill for fill in fills if fill['createdAt'] < before
+        ][:limit]
+        requests.append(request.path_qs)
+        return web.json_response({'fills': fills})
+
+    async def main():
+        app = web.Application()
+        app.router.add_get('/v1/orderbook/{market}', get_orderbook)
+        app.router.add_get('/v2/markets', get_markets)
+        app.router.add_get('/v2/fills', get_fills)
+        app.router.add_get(
+            '/v1/perpetual-markets/{market}',
+            get_perpetual_market,
+        )
+        app.router.add_post('/v2/orders', post_order)
+        app.router.add_delete('/v2/orders', delete_orders)
+        app.router.add_delete('/v2/orders/{hash}', delete_order)
+        async with TestServer(app) as server:
+            async with AsyncClient(PRIVATE_KEY_1) as client:
+                client.BASE_API_URI = str(server.make_url('')).rstrip('/')
+                return await handler(client), requests
+
+    return asyncio.run(main())
+
+
+class TestAsyncClient():
+
+    def test_get_orderbook_concurrent(self):
+
+        async def handler(client):
+            return await asyncio.gather(*[
+                client.get_orderbook(market)
+                for market in ['WETH-DAI', 'WETH-USDC', 'DAI-USDC']
+            ])
+
+        result, requests = _run(handler)
+        assert result == [tests.test_json.mock_get_orders_json] * 3
+        assert sorted(requests) == [
+            '/v1/orderbook/DAI-USDC',
+            '/v1/orderbook/WETH-DAI',
+            '/v1/orderbook/WETH-USDC',
+        ]
+
+    def test_request_fail(self):
+
+        async def handler(client):
+            with pytest.raises(DydxAPIError) as error:
+                await client.get_markets()
+            return error.value
+
+        error, _ = _run(handler)
+        assert error.status_code == 400
+        assert error.msg == {'error': 'bad'}
+
+    def test_place_order_success(self):
+
+        async def handler(client):
+            return await client.place_order(
+                market='WETH-DAI',
+                side='BUY',
+                amount=10000,
+                price=Decimal('250.01')
+            )
+
+        result, _ = _run(handler)
+        assert result == tests.test_json.mock_place_order_json
+
+    def test_cancel_order_success(self):
+
+        async def handler(client):
+            return await client.cancel_order(hash=ORDER_HASH)
+
+        result, _ = _run(handler)
+        assert result == tests.test_json.mock_cancel_order_json
+
+    def test_cancel_orders_fallback(self):
+
+        async def handler(client):
+            return await client.cancel_orders([ORDER_HASH, ORDER_HASH])
+
+        result, _ = _run(handler)
+        assert result == {
+            'orders': tests.test_json.mock_cancel_order_json['orders'] * 2,
+            'failures': [],
+        }
+
+    def test_cancel_orders_partial_failure(self):
+
+        async def handler(client):
+            return await client.cancel_orders([ORDER_HASH, FILLED_HASH])
+
+        result, _ = _run(handler)
+        assert result['orders'] == \
+            tests.test_json.mock_cancel_order_json['orders']
+        assert [failure['hash'] for failure in result['failures']] == \
+            [FILLED_HASH]
+        assert isinstance(result['failures'][0]['error'], DydxAPIError)
+        assert result['failures'][0]['error'].status_code == 400
+
+    def test_iter_fills_prefetch(self):
+
+        async def handler(client):
+            return [
+                fill['uuid']
+                async for fill in client.iter_fills(limit=2, prefetch=True)
+            ]
+
+        result, requests = _run(handler)
+        assert result == ['a', 'b', 'c', 'd', 'e']
+        assert requests == [
+            '/v2/fills?limit=2',
+            '/v2/fills?limit=2&startingBefore=2020-01-01T00:00:04.001Z',
+            '/v2/fills?limit=2&startingBefore=2020-01-01T00:00:04.000Z',
+            '/v2/fills?limit=2&startingBefore=2020-01-01T00:00:02.001Z',
+        ]
+
+    def test_response_cache(self):
+
+        async def handler(client):
+            client.response_cache = ResponseCache(ttl=60)
+            first = await client.get_perpetual_market('PBTC-USDC')
+            second = await client.get_perpetual_market('PBTC-USDC')
+
+            # A stale response is returned and refreshed in the background
+            client.response_cache.ttl = 0
+            third = await client.get_perpetual_market('PBTC-USDC')
+            assert len(client._refresh_tasks) == 1
+            await asyncio.sleep(0.1)
+            assert not client._refresh_tasks
+            return [first, second, third]
+
+        result, requests = _run(handler)
+        assert result == [tests.test_json.mock_get_market_json] * 3
+        assert requests == ['/v1/perpetual-markets/PBTC-USDC'] * 2
+
+    def test_close_cancels_refresh(self):
+        cache = ResponseCache(ttl=0)
+
+        async def handler(client):
+            client.response_cache = cache
+            await client.get_perpetual_market('PBTC-USDC')
+            await client.get_perpetual_market('PBTC-USDC')
+            tasks = list(client._refresh_tasks)
+            await client.close()
+            return tasks
+
+        tasks, _ = _run(handler)
+        assert len(tasks) == 1
+        assert tasks[0].cancelled()
+        # The cancelled refresh released the URI for the next one
+        assert cache.begin_refresh('/v1/perpetual-markets/PBTC-USDC')
@@ -0,0 +1,163 @@
+import pytest
+import requests_mock
+import dydx.constants as consts
+from eth_abi import encode_abi
+from eth_utils import function_abi_to_4byte_selector
+from dydx.batch import _get_type
+from dydx.contracts import load_abi
+from dydx.eth import Eth
+from tests.stand_ins import stand_in_node
+
+PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+ADDRESS_1 = '0x90F8bf6A479f320ead074411a4B0e7944Ea8c9C1'
+LOCAL_NODE = 'http://localhost:8545'
+SOLO = 'abi/solomargin.json'
+PERP = 'abi/perpetualv1.json'
+ERC20 = 'abi/erc20.json'
+
+
+def _contract_node(outputs, errors=()):
+    '''
+    Returns a stand_in_node callback answering eth_call and eth_getBalance.
+    outputs maps (contract address, ABI file, function name) to the values
+    the function returns. Batches are answered in reverse order.
+    '''
+    functions = {}
+    for (address, file_path, name), values in outputs.items():
+        fn_abi = [
+            entry for entry in load_abi(file_path) if entry.get('name') == name
+        ][0]
+        selector = '0x' + function_abi_to_4byte_selector(fn_abi).hex()
+        functions[(address.lower(), selector)] = encode_abi(
+            [_get_type(output) for output in fn_abi['outputs']],
+            values,
+        )
+
+    def call(params):
+        transaction = params[0]
+        return '0x' + functions[(
+            transaction['to'].lower(),
+            transaction['data'][:10],
+        )].hex()
+
+    return stand_in_node(
+        {
+            'eth_call': call,
+            'eth_getBalance': lambda params: hex(5 * 10 ** 18),
+        },
+        errors=errors,
+        reverse=True,
+    )
+
+
+class TestBatch():
+
+    def test_batch_getters(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        callback = _contract_node({
+            (consts.SOLO_MARGIN_ADDRESS, SOLO, 'getMarketPrice'):
+                [(2 * consts.PRICE_ORACLE_USD_MULTIPLIER,)],
+            (consts.SOLO_MARGIN_ADDRESS, SOLO, 'getAccountValues'):
+                [(300,), (100,)],
+            (consts.SOLO_MARGIN_ADDRESS, SOLO, 'getAccountBalances'): [
+                [consts.WETH_ADDRESS, consts.DAI_ADDRESS],
+                [(True, 1), (True, 1)],
+                [(True, 7), (False, 8)],
+            ],
+            (consts.BTC_PERPETUAL_ADDRESS, PERP, 'getAccountBalance'):
+                [(True, False, 10, 20)],
+            (consts.ETH_PERPETUAL_ADDRESS, PERP, 'getOraclePrice'):
+                [3 * 10 ** 18],
+            (consts.DAI_ADDRESS, ERC20, 'balanceOf'): [42],
+        })
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            batch = eth.batch()
+            positions = [
+                eth.solo.get_oracle_price(consts.MARKET_WETH, batch=batch),
+                eth.solo.get_my_collateralization(batch=batch),
+                eth.solo.get_my_balances(batch=batch),
+                eth.perp.get_my_balances(consts.PAIR_PBTC_USDC, batch=batch),
+                eth.perp.get_oracle_price(consts.PAIR_WETH_PUSD, batch=batch),
+                eth.get_my_wallet_balance(consts.MARKET_DAI, batch=batch),
+                eth.get_my_wallet_balance(consts.MARKET_ETH, batch=batch),
+            ]
+            assert positions == list(range(7))
+            assert len(batch) == 7
+            assert rm.call_count == 0
+            results = batch.execute()
+            assert rm.call_count == 1
+        assert len(callback.batches[0]) == 7
+        assert results == [
+            2,
+            3,
+            [7, -8],
+            {'margin': 10, 'position': -20},
+            3,
+            42,
+            5 * 10 ** 18,
+        ]
+        assert len(batch) == 0
+        assert batch.execute() == []
+
+    def test_batch_call_checksums_addresses(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        callback = _contract_node({
+            (consts.SOLO_MARGIN_ADDRESS, SOLO, 'getAccountBalances'): [
+                [consts.WETH_ADDRESS.lower(), consts.DAI_ADDRESS.lower()],
+                [(True, 1), (True, 1)],
+                [(True, 7), (False, 8)],
+            ],
+        })
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            batch = eth.batch()
+            batch.add_call(
+                eth.solo.solo_margin.functions.getAccountBalances(
+                    [ADDRESS_1, 0],
+                ),
+            )
+            [(addresses, pars, weis)] = batch.execute()
+        assert list(addresses) == [consts.WETH_ADDRESS, consts.DAI_ADDRESS]
+        assert list(weis) == [(True, 7), (False, 8)]
+
+    def test_get_type(self):
+        assert _get_type({'type': 'uint256'}) == 'uint256'
+        assert _get_type({
+            'type': 'tuple[]',
+            'components': [
+                {'type': 'bool'},
+                {'type': 'tuple', 'components': [{'type': 'address'}]},
+            ],
+        }) == '(bool,(address))[]'
+
+    def test_batch_block_identifier(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        callback = _contract_node({})
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            batch = eth.batch(block_identifier=1234)
+            eth.get_my_wallet_balance(consts.MARKET_ETH, batch=batch)
+            assert batch.execute() == [5 * 10 ** 18]
+        assert callback.batches[0][0]['params'] == [ADDRESS_1, '0x4d2']
+
+    def test_batch_error(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        callback = _contract_node({}, errors=['eth_getBalance'])
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            batch = eth.batch()
+            eth.get_my_wallet_balance(consts.MARKET_ETH, batch=batch)
+            with pytest.raises(ValueError) as error:
+                batch.execute()
+        assert 'execution reverted' in str(error.value)
+
+    def test_unbatched_getter(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        callback = _contract_node({
+            (consts.SOLO_MARGIN_ADDRESS, SOLO, 'getAccountValues'):
+                [(300,), (0,)],
+        })
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            assert eth.solo.get_my_collateralization() == float('inf')
@@ -0,0 +1,102 @@
+import requests_mock
+import dydx.constants as consts
+from eth_abi import encode_abi
+from dydx.block_cache import BlockCache
+from dydx.eth import Eth
+from tests.stand_ins import stand_in_node
+
+PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+ADDRESS_1 = '0x90F8bf6A479f320ead074411a4B0e7944Ea8c9C1'
+ADDRESS_2 = '0xFFcf8FDEE72ac11b5c542428B35EEF5769C409f0'
+LOCAL_NODE = 'http://localhost:8545'
+
+
+def _price_node(state):
+    '''
+    Returns a stand_in_node callback answering eth_blockNumber,
+    eth_getBalance and eth_call. Every eth_call returns state['price'] as
+    a single uint256, and every balance is state['balance'].
+    '''
+    return stand_in_node({
+        'eth_blockNumber': lambda params: hex(state['block']),
+        'eth_getBalance': lambda params: hex(state['balance']),
+        'eth_call': lambda params: '0x' + encode_abi(
+            ['uint256'],
+            [state['price']],
+        ).hex(),
+    })
+
+
+def _methods(callback, method):
+    return [
+        request for request in callback.requests
+        if request['method'] == method
+    ]
+
+
+class TestBlockCache():
+
+    def test_call_cached_within_block(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        eth.call_cache = BlockCache(eth.web3, block_poll_interval=0)
+        state = {'block': 10, 'price': 2 * 10 ** 18}
+        callback = _price_node(state)
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            assert eth.perp.get_oracle_price(consts.PAIR_WETH_PUSD) == 2
+            assert eth.perp.get_oracle_price(consts.PAIR_WETH_PUSD) == 2
+            calls = _methods(callback, 'eth_call')
+            assert len(calls) == 1
+            assert calls[0]['params'][1] == '0xa'
+
+            # Different arguments are a different key
+            eth.get_wallet_balance(ADDRESS_1, consts.MARKET_DAI)
+            eth.get_wallet_balance(ADDRESS_2, consts.MARKET_DAI)
+            eth.get_wallet_balance(ADDRESS_2, consts.MARKET_DAI)
+            assert len(_methods(callback, 'eth_call')) == 3
+
+            # A new block drops every entry
+            state['block'] = 11
+            state['price'] = 3 * 10 ** 18
+            assert eth.perp.get_oracle_price(consts.PAIR_WETH_PUSD) == 3
+            assert len(_methods(callback, 'eth_call')) == 4
+        assert eth.call_cache.stats() == {
+            'hits': 2,
+            'misses': 4,
+            'hit_rate': 2 / 6,
+            'entries': 1,
+            'block_number': 11,
+        }
+
+    def test_block_poll_interval(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        eth.call_cache = BlockCache(eth.web3, block_poll_interval=60)
+        state = {'block': 10, 'price': 0, 'balance': 5}
+        callback = _price_node(state)
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            assert eth.get_my_wallet_balance(consts.MARKET_ETH) == 5
+            state['block'] = 11
+            state['balance'] = 6
+            # The block number is trusted for 60 seconds
+            assert eth.get_my_wallet_balance(consts.MARKET_ETH) == 5
+            assert len(_methods(callback, 'eth_blockNumber')) == 1
+            assert len(_methods(callback, 'eth_getBalance')) == 1
+
+            eth.call_cache.clear()
+            assert len(eth.call_cache) == 0
+            assert eth.get_my_wallet_balance(consts.MARKET_ETH) == 6
+            assert len(_methods(callback, 'eth_blockNumber')) == 2
+        assert _methods(callback, 'eth_getBalance')[1]['params'] == \
+            [ADDRESS_1, '0xb']
+
+    def test_uncached_by_default(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        assert eth.call_cache is None
+        callback = _price_node({'block': 10, 'price': 10 ** 18})
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            eth.perp.get_oracle_price(consts.PAIR_WETH_PUSD)
+            eth.perp.get_oracle_price(consts.PAIR_WETH_PUSD)
+        assert len(_methods(callback, 'eth_call')) == 2
+        assert _methods(callback, 'eth_blockNumber') == []
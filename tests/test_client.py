@@ -2,6 +2,7 @@ import datetime
 import json
 import pytest
 import requests_mock
+import time
 import tests.test_json
 import dydx.util as utils
 import dydx.constants as consts
@@ -9,6 +10,10 @@ import dydx.perp_orders as perp_orders
 import dydx.solo_orders as solo_orders
 from decimal import Decimal
 from dydx.client import Client
+from dydx.exceptions import DydxAPIError
+from dydx.records import Fill
+from dydx.response_cache import ResponseCache
+from urllib.parse import parse_qs, urlparse
 
 PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
 PRIVATE_KEY_2 = '0x6cbed15c793ce57650b9877cf6fa156fbef513c4e6134f022a85b1ffdd59b2a1'  # noqa: E501
@@ -28,6 +33,28 @@ PERPETUAL_MARKETS = ['PBTC-USDC']
 LOCAL_NODE = 'http://0.0.0.0:8545'
 
 
+def _paginated(key, rows, cursor='createdAt', wrap=None):
+    '''
+    Returns a requests_mock json callback that serves rows newest first,
+    honoring limit and startingBefore, and records every query it answers.
+    '''
+    queries = []
+
+    def callback(request, context):
+        query = parse_qs(urlparse(request.url).query)
+        queries.append(query)
+        limit = int(query['limit'][0])
+        before = query.get('startingBefore', [None])[0]
+        page = [
+            row for row in rows
+            if before is None or row[cursor] < before
+        ][:limit]
+        return wrap(page) if wrap else {key: page}
+
+    callback.queries = queries
+    return callback
+
+
 # ------------ Helper Functions ------------
 
 def _create_solo_order_matcher(client, args):
@@ -148,10 +175,58 @@ class TestClient():
         with pytest.raises(TypeError):
             Client()
 
+    def test_constructor_lazy_eth(self):
+        with requests_mock.mock() as rm:
+            rm.get(
+                'https://api.dydx.exchange/v1/orderbook/WETH-DAI',
+                json=tests.test_json.mock_get_orders_json
+            )
+            client = Client(PRIVATE_KEY_1, node=LOCAL_NODE)
+            client.get_orderbook(market='WETH-DAI')
+            # Any JSON-RPC request to the node would fail to match
+            assert rm.call_count == 1
+        assert client._eth is None
+        eth = client.eth
+        assert eth.public_address == ADDRESS_1
+        assert eth.account_number == 0
+        assert eth.signer is client.signer
+        assert client.eth is eth
+
     # -----------------------------------------------------------
     # Public API
     # -----------------------------------------------------------
 
+    # ------------ sign_orders ------------
+
+    def test_sign_orders_success(self):
+        client = Client(PRIVATE_KEY_1)
+        orders = client.sign_orders([
+            {
+                'market': 'WETH-DAI',
+                'side': 'BUY',
+                'amount': 10000,
+                'price': Decimal('250.01'),
+            },
+            {
+                'market': 'PBTC-USDC',
+                'side': 'SELL',
+                'amount': 100000000,
+                'price': Decimal('9000'),
+                'limitFee': Decimal('-0.00025'),
+            },
+        ])
+        assert orders[0]['baseMarket'] == consts.MARKET_WETH
+        assert orders[0]['typedSignature'] == solo_orders.sign_order(
+            {k: v for k, v in orders[0].items() if k != 'typedSignature'},
+            client.private_key
+        )
+        assert orders[1]['maker'] == client.public_address
+        assert orders[1]['typedSignature'] == perp_orders.sign_order(
+            {k: v for k, v in orders[1].items() if k != 'typedSignature'},
+            consts.PAIR_PBTC_USDC,
+            client.private_key
+        )
+
     # ------------ get_pairs ------------
 
     def test_get_pairs_success(self):
@@ -466,6 +541,154 @@ class TestClient():
             )
             assert result == json_obj
 
+    # ------------ iter_fills ------------
+
+    def test_iter_fills_pages(self):
+        client = Client(PRIVATE_KEY_1)
+        rows = [
+            {'uuid': str(i), 'createdAt': '2020-01-01T00:00:%02d.000Z' % i}
+            for i in range(10, 6, -1)
+        ]
+        callback = _paginated('fills', rows)
+        with requests_mock.mock() as rm:
+            rm.get('https://api.dydx.exchange/v2/fills', json=callback)
+            result = list(client.iter_fills(limit=2))
+        assert result == rows
+        # Each page starts just after the last row of the one before
+        assert [query.get('startingBefore') for query in callback.queries] == [
+            None,
+            ['2020-01-01T00:00:09.001Z'],
+            ['2020-01-01T00:00:08.001Z'],
+            ['2020-01-01T00:00:07.001Z'],
+        ]
+
+    def test_iter_fills_shared_timestamps(self):
+        client = Client(PRIVATE_KEY_1)
+        # Fills from one match share a timestamp, across page boundaries
+        rows = [
+            {
+                'uuid': str(i),
+                'createdAt': '2020-01-01T00:00:%02d.000Z' % (20 - i // 4),
+            }
+            for i in range(20)
+        ]
+        callback = _paginated('fills', rows)
+        with requests_mock.mock() as rm:
+            rm.get('https://api.dydx.exchange/v2/fills', json=callback)
+            result = list(client.iter_fills(limit=6))
+        assert result == rows
+
+    def test_iter_fills_page_of_one_timestamp(self):
+        client = Client(PRIVATE_KEY_1)
+        rows = [
+            {'uuid': str(i), 'createdAt': '2020-01-01T00:00:05.000Z'}
+            for i in range(5)
+        ] + [
+            {'uuid': 'b%d' % i, 'createdAt': '2020-01-01T00:00:0%d.000Z' % i}
+            for i in range(4, 0, -1)
+        ]
+        callback = _paginated('fills', rows)
+        with requests_mock.mock() as rm:
+            rm.get('https://api.dydx.exchange/v2/fills', json=callback)
+            result = list(client.iter_fills(limit=3))
+        # The rows at 00:05 beyond the first page cannot be reached, but
+        # iteration moves past them instead of repeating the page
+        assert result == rows[:3] + rows[5:]
+        assert callback.queries[1]['startingBefore'] == \
+            ['2020-01-01T00:00:05.000Z']
+
+    def test_iter_fills_limit_above_page_limit(self):
+        client = Client(PRIVATE_KEY_1)
+        rows = [
+            {
+                'uuid': str(i),
+                'createdAt': '2020-01-01T00:%02d:%02d.000Z' % divmod(i, 60),
+            }
+            for i in range(300, 0, -1)
+        ]
+        callback = _paginated('fills', rows)
+        with requests_mock.mock() as rm:
+            rm.get('https://api.dydx.exchange/v2/fills', json=callback)
+            result = list(client.iter_fills(limit=500))
+        assert result == rows
+        assert callback.queries[0]['limit'] == [str(Client.PAGE_LIMIT)]
+
+    def test_iter_fills_prefetch(self):
+        client = Client(PRIVATE_KEY_1)
+        rows = [
+            {'uuid': str(i), 'createdAt': '2020-01-01T00:00:%02d.000Z' % i}
+            for i in range(50, 0, -1)
+        ]
+        callback = _paginated('fills', rows)
+        with requests_mock.mock() as rm:
+            rm.get('https://api.dydx.exchange/v2/fills', json=callback)
+            fills = client.iter_fills(
+                accountOwner=ADDRESS_1,
+                limit=20,
+                startingBefore='2020-01-01T00:00:45.000Z',
+                prefetch=True,
+            )
+            result = list(fills)
+        assert result == rows[6:]
+        assert len(callback.queries) == 3
+        assert callback.queries[0]['accountOwner'] == [ADDRESS_1]
+
+    def test_iter_fills_lazy(self):
+        client = Client(PRIVATE_KEY_1)
+        rows = [
+            {'uuid': str(i), 'createdAt': '2020-01-01T00:00:%02d.000Z' % i}
+            for i in range(50, 0, -1)
+        ]
+        callback = _paginated('fills', rows)
+        with requests_mock.mock() as rm:
+            rm.get('https://api.dydx.exchange/v2/fills', json=callback)
+            fills = client.iter_fills(limit=10)
+            assert len(callback.queries) == 0
+            assert next(fills) == rows[0]
+            assert len(callback.queries) == 1
+            fills.close()
+        assert len(callback.queries) == 1
+
+    def test_iter_fills_records(self):
+        client = Client(PRIVATE_KEY_1)
+        rows = [
+            {
+                'uuid': str(i),
+                'createdAt': '2020-01-01T00:00:%02d.000Z' % i,
+                'market': 'PBTC-USDC',
+                'price': '9000.5',
+                'amount': str(i),
+            }
+            for i in range(10, 0, -1)
+        ]
+        callback = _paginated('fills', rows)
+        with requests_mock.mock() as rm:
+            rm.get('https://api.dydx.exchange/v2/fills', json=callback)
+            result = list(client.iter_fills(limit=4, records=True))
+        assert result == Fill.from_json_list(rows)
+        assert [fill.amount for fill in result] == list(range(10, 0, -1))
+        assert result[0].createdAt == 1577836810000
+        # The cursor is still read from the API's timestamp string
+        assert callback.queries[1]['startingBefore'] == \
+            ['2020-01-01T00:00:07.001Z']
+
+    def test_get_fills_records(self):
+        client = Client(PRIVATE_KEY_1)
+        fill = {
+            'uuid': 'a',
+            'createdAt': '2020-01-01T00:00:01.000Z',
+            'price': '1.5',
+            'amount': '20',
+        }
+        with requests_mock.mock() as rm:
+            rm.get(
+                'https://api.dydx.exchange/v2/fills',
+                json={'fills': [fill]},
+            )
+            result = client.get_my_fills(market=['PBTC-USDC'], records=True)
+        assert result == {'fills': [Fill.from_json(fill)]}
+        assert result['fills'][0].price == Decimal('1.5')
+
     # ------------ get_trades ------------
 
     def test_get_trades_default_success(self):
@@ -558,6 +781,63 @@ class TestClient():
             result = client.get_perpetual_markets()
             assert result == json_obj
 
+    # ------------ response_cache ------------
+
+    def test_response_cache(self):
+        cache = ResponseCache(ttl=60)
+        client = Client(PRIVATE_KEY_1, response_cache=cache)
+        with requests_mock.mock() as rm:
+            json_obj = tests.test_json.mock_get_markets_json
+            rm.get('https://api.dydx.exchange/v2/markets', json=json_obj)
+            rm.get(
+                'https://api.dydx.exchange/v1/perpetual-markets/PBTC-USDC',
+                json=tests.test_json.mock_get_market_json,
+            )
+            assert client.get_markets() == json_obj
+            assert client.get_pairs() == json_obj
+            assert client.get_markets() == json_obj
+            client.get_perpetual_market('PBTC-USDC')
+            client.get_perpetual_market('PBTC-USDC')
+            assert rm.call_count == 2
+
+            cache.invalidate('/v2/markets')
+            client.get_markets()
+            client.get_perpetual_market('PBTC-USDC')
+            assert rm.call_count == 3
+
+    def test_response_cache_stale_while_revalidate(self):
+        cache = ResponseCache(ttl=0, ttls={'get_markets': 60})
+        client = Client(PRIVATE_KEY_1, response_cache=cache)
+        uri = 'https://api.dydx.exchange/v2/markets/WETH-DAI'
+        with requests_mock.mock() as rm:
+            rm.get(uri, json={'market': 1})
+            assert client.get_market('WETH-DAI') == {'market': 1}
+            rm.get(uri, json={'market': 2})
+            # The stale response is returned while it is refreshed
+            assert client.get_market('WETH-DAI') == {'market': 1}
+            deadline = time.monotonic() + 5
+            while cache.lookup('get_markets', '/v2/markets/WETH-DAI')[0] \
+                    != {'market': 2}:
+                assert time.monotonic() < deadline
+                time.sleep(0.001)
+            assert client.get_market('WETH-DAI') == {'market': 2}
+
+    def test_response_cache_refresh_fail(self):
+        cache = ResponseCache(ttl=0)
+        client = Client(PRIVATE_KEY_1, response_cache=cache)
+        uri = 'https://api.dydx.exchange/v1/perpetual-markets'
+        with requests_mock.mock() as rm:
+            rm.get(uri, json={'markets': 1})
+            client.get_perpetual_markets()
+            rm.get(uri, status_code=500, json={'error': 'down'})
+            assert client.get_perpetual_markets() == {'markets': 1}
+            deadline = time.monotonic() + 5
+            while not cache.begin_refresh('/v1/perpetual-markets'):
+                assert time.monotonic() < deadline
+                time.sleep(0.001)
+        assert cache.lookup('get_perpetual_markets', '/v1/perpetual-markets') \
+            == ({'markets': 1}, True)
+
     # ------------ place_order ------------
 
     def test_place_order_success_weth_dai(self):
@@ -689,6 +969,105 @@ class TestClient():
             )
             assert result == json_obj
 
+    # ------------ cancel_orders / cancel_perpetual_orders ------------
+
+    def test_cancel_orders_success(self):
+        hashes = [ORDER_HASH, PERP_ORDER_HASH]
+
+        def additional_matcher(request):
+            assert json.loads(request.body) == {'orderHashes': hashes}
+            return 'Bearer ' + solo_orders.sign_cancel_orders(
+                hashes,
+                PRIVATE_KEY_1,
+            ) == request.headers['Authorization']
+
+        client = Client(PRIVATE_KEY_1)
+        with requests_mock.mock() as rm:
+            json_obj = tests.test_json.mock_cancel_order_json
+            rm.delete(
+                'https://api.dydx.exchange/v2/orders',
+                additional_matcher=additional_matcher,
+                json=json_obj
+            )
+            result = client.cancel_orders(hashes)
+            assert result == dict(json_obj, failures=[])
+            assert rm.call_count == 1
+
+    def test_cancel_orders_fallback(self):
+        client = Client(PRIVATE_KEY_1)
+        with requests_mock.mock() as rm:
+            json_obj = tests.test_json.mock_cancel_order_json
+            rm.delete('https://api.dydx.exchange/v2/orders', status_code=404)
+            rm.delete(
+                'https://api.dydx.exchange/v2/orders/' + ORDER_HASH,
+                request_headers={
+                    'Authorization': 'Bearer ' + CANCEL_ORDER_SIGNATURE,
+                },
+                json=json_obj
+            )
+            rm.delete(
+                'https://api.dydx.exchange/v2/orders/' + PERP_ORDER_HASH,
+                json=json_obj
+            )
+            result = client.cancel_orders([ORDER_HASH, PERP_ORDER_HASH])
+            assert result == {'orders': json_obj['orders'] * 2, 'failures': []}
+            assert rm.call_count == 3
+            assert client.batch_cancel_supported is False
+
+            client.cancel_orders([ORDER_HASH])
+            assert rm.call_count == 4
+
+    def test_cancel_orders_partial_failure(self):
+        client = Client(PRIVATE_KEY_1)
+        with requests_mock.mock() as rm:
+            json_obj = tests.test_json.mock_cancel_order_json
+            # One already filled order makes the whole batch fail
+            rm.delete('https://api.dydx.exchange/v2/orders', status_code=400)
+            rm.delete(
+                'https://api.dydx.exchange/v2/orders/' + ORDER_HASH,
+                json=json_obj
+            )
+            rm.delete(
+                'https://api.dydx.exchange/v2/orders/' + PERP_ORDER_HASH,
+                status_code=400,
+                json={'errors': [{'msg': 'Order is already filled'}]}
+            )
+            result = client.cancel_orders([ORDER_HASH, PERP_ORDER_HASH])
+            assert rm.call_count == 3
+        assert result['orders'] == json_obj['orders']
+        assert len(result['failures']) == 1
+        failure = result['failures'][0]
+        assert failure['hash'] == PERP_ORDER_HASH
+        assert isinstance(failure['error'], DydxAPIError)
+        assert failure['error'].status_code == 400
+        # A 400 only rejects this batch, so later calls batch again
+        assert client.batch_cancel_supported is True
+
+    def test_cancel_orders_no_fallback(self):
+        client = Client(PRIVATE_KEY_1)
+        with requests_mock.mock() as rm:
+            rm.delete('https://api.dydx.exchange/v2/orders', status_code=404)
+            with pytest.raises(Exception) as error:
+                client.cancel_orders([ORDER_HASH], fallback=False)
+            assert '404' in str(error.value)
+
+    def test_cancel_perpetual_orders_success(self):
+
+        def additional_matcher(request):
+            return 'Bearer ' + CANCEL_PERP_ORDER_SIGNATURE == \
+                request.headers['Authorization']
+
+        client = Client(PRIVATE_KEY_1)
+        with requests_mock.mock() as rm:
+            json_obj = tests.test_json.mock_cancel_order_json
+            rm.delete(
+                'https://api.dydx.exchange/v2/orders',
+                additional_matcher=additional_matcher,
+                json=json_obj
+            )
+            result = client.cancel_perpetual_orders([PERP_ORDER_HASH])
+            assert result == dict(json_obj, failures=[])
+
     # ------------ get_funding_rates ------------
 
     def test_get_funding_rates_no_params(self):
@@ -751,6 +1130,39 @@ class TestClient():
             )
             assert result == json_obj
 
+    # ------------ iter_historical_funding_rates ------------
+
+    def test_iter_historical_funding_rates(self):
+        client = Client(PRIVATE_KEY_1)
+        rows = [
+            {
+                'market': 'PBTC-USDC',
+                'effectiveAt': '2020-05-11T%02d:00:00.000Z' % i,
+            }
+            for i in range(23, 18, -1)
+        ]
+        callback = _paginated(
+            None,
+            rows,
+            cursor='effectiveAt',
+            wrap=lambda page: {'PBTC-USDC': {'history': page}},
+        )
+        with requests_mock.mock() as rm:
+            rm.get(
+                'https://api.dydx.exchange/v1/historical-funding-rates',
+                json=callback,
+            )
+            result = list(client.iter_historical_funding_rates(
+                'PBTC-USDC',
+                limit=3,
+                prefetch=True,
+            ))
+        assert result == rows
+        assert len(callback.queries) == 3
+        assert callback.queries[0]['markets'] == ['PBTC-USDC']
+        assert callback.queries[1]['startingBefore'] == \
+            ['2020-05-11T21:00:00.001Z']
+
     # ------------ get_funding_index_price ------------
 
     def test_get_funding_index_price_no_params(self):
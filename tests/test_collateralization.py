@@ -0,0 +1,174 @@
+import threading
+import requests_mock
+from eth_abi import encode_abi
+from dydx.collateralization import CollateralizationScanner
+from dydx.eth import Eth
+from tests.stand_ins import stand_in_node
+
+PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+ADDRESS_1 = '0x90F8bf6A479f320ead074411a4B0e7944Ea8c9C1'
+ADDRESS_2 = '0xFFcf8FDEE72ac11b5c542428B35EEF5769C409f0'
+LOCAL_NODE = 'http://localhost:8545'
+
+
+def _account_node(state):
+    '''
+    Returns a stand_in_node callback answering eth_blockNumber and
+    getAccountValues calls. state maps 'block' to the latest block number
+    and (owner, number) to (supply, borrow).
+    '''
+
+    def get_account_values(params):
+        data = params[0]['data']
+        owner = '0x' + data[34:74]
+        number = int(data[74:138], 16)
+        supply, borrow = [
+            value for key, value in state.items()
+            if key != 'block' and key[0].lower() == owner and
+            key[1] == number
+        ][0]
+        return '0x' + encode_abi(
+            ['(uint256)', '(uint256)'],
+            [(supply,), (borrow,)],
+        ).hex()
+
+    return stand_in_node({
+        'eth_blockNumber': lambda params: hex(state['block']),
+        'eth_call': get_account_values,
+    })
+
+
+class TestCollateralization():
+
+    def test_scan(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        state = {
+            'block': 10,
+            (ADDRESS_1, 0): (300, 100),
+            (ADDRESS_1, 1): (100, 100),
+            (ADDRESS_2, 0): (200, 100),
+            (ADDRESS_2, 1): (500, 0),
+            (ADDRESS_2, 2): (120, 100),
+        }
+        callback = _account_node(state)
+        scanner = CollateralizationScanner(
+            eth,
+            accounts=[account for account in state if account != 'block'],
+            chunk_size=2,
+        )
+        assert len(scanner) == 5
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            changed = scanner.scan()
+        assert len(changed) == 5
+        assert scanner.block_number == 10
+        # Five accounts in chunks of two, each chunk pinned to block 10
+        assert sorted(len(batch) for batch in callback.batches) == [1, 2, 2]
+        assert all(
+            item['params'][1] == '0xa'
+            for batch in callback.batches for item in batch
+        )
+        assert scanner.get_collateralization(ADDRESS_1, 0) == 3
+        assert scanner.get_collateralization(ADDRESS_2, 1) == float('inf')
+        assert scanner.riskiest(3) == [
+            ((ADDRESS_1, 1), 1),
+            ((ADDRESS_2, 2), 1.2),
+            ((ADDRESS_2, 0), 2),
+        ]
+        # MINIMUM_COLLATERALIZATION is 1.15
+        assert scanner.undercollateralized() == [((ADDRESS_1, 1), 1)]
+
+    def test_refresh(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        state = {
+            'block': 10,
+            (ADDRESS_1, 0): (300, 100),
+            (ADDRESS_2, 0): (200, 100),
+        }
+        callback = _account_node(state)
+        scanner = CollateralizationScanner(eth, accounts=[(ADDRESS_1, 0)])
+        scanner.add_accounts([(ADDRESS_2, 0), (ADDRESS_1, 0)])
+        assert len(scanner) == 2
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            assert len(scanner.refresh()) == 2
+            assert scanner.refresh() is None
+            assert len(callback.batches) == 1
+
+            state['block'] = 11
+            state[(ADDRESS_2, 0)] = (100, 100)
+            assert scanner.refresh() == [(ADDRESS_2, 0)]
+            assert len(callback.batches) == 2
+        assert scanner.undercollateralized() == [((ADDRESS_2, 0), 1)]
+
+    def test_remove_accounts(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        state = {
+            'block': 10,
+            (ADDRESS_1, 0): (100, 100),
+            (ADDRESS_2, 0): (200, 100),
+        }
+        callback = _account_node(state)
+        scanner = CollateralizationScanner(
+            eth,
+            accounts=[(ADDRESS_1, 0), (ADDRESS_2, 0)],
+        )
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            scanner.scan()
+            scanner.remove_accounts([(ADDRESS_1, 0)])
+            assert len(scanner) == 1
+            assert scanner.get_collateralization(ADDRESS_1, 0) is None
+            assert scanner.undercollateralized() == []
+            scanner.scan(block_number=11)
+        assert len(callback.batches[1]) == 1
+        assert scanner.riskiest(5) == [((ADDRESS_2, 0), 2)]
+
+    def test_start_stop(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        callback = _account_node({
+            'block': 10,
+            (ADDRESS_1, 0): (100, 100),
+        })
+        scanned = []
+        done = threading.Event()
+
+        def on_scan(scanner):
+            scanned.append(scanner)
+            done.set()
+
+        scanner = CollateralizationScanner(eth, accounts=[(ADDRESS_1, 0)])
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            scanner.start(interval=0.01, callback=on_scan)
+            scanner.start(interval=0.01)
+            assert done.wait(5)
+            scanner.stop()
+        assert scanned == [scanner]
+        assert scanner.block_number == 10
+        scanner.stop()
+
+    def test_start_recovers_from_errors(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        callback = _account_node({
+            'block': 10,
+            (ADDRESS_1, 0): (100, 100),
+        })
+        failures = []
+        done = threading.Event()
+
+        def flaky(request, context):
+            if not failures:
+                failures.append(request)
+                raise ConnectionError('node unreachable')
+            return callback(request, context)
+
+        scanner = CollateralizationScanner(eth, accounts=[(ADDRESS_1, 0)])
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=flaky)
+            scanner.start(interval=0.01, callback=lambda _: done.set())
+            assert done.wait(5)
+            scanner.stop()
+        assert len(failures) == 1
+        assert scanner.block_number == 10
+        assert scanner.get_collateralization(ADDRESS_1, 0) == 1
@@ -0,0 +1,127 @@
+import pytest
+import requests_mock
+from decimal import Decimal
+from tests.test_client import _paginated
+
+numpy = pytest.importorskip('numpy')
+from dydx.client import Client  # noqa: E402
+from dydx.columns import (  # noqa: E402
+    FILL_COLUMNS, FUNDING_RATE_COLUMNS, MISSING, MISSING_TIME, ColumnBuilder,
+)
+
+PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+API = 'https://api.dydx.exchange'
+
+
+def _fill(i, market='PBTC-USDC', side='BUY'):
+    return {
+        'uuid': str(i),
+        'createdAt': '2020-01-01T00:00:%02d.500Z' % i,
+        'market': market,
+        'side': side,
+        'liquidity': 'TAKER',
+        'price': '9000.%d' % i,
+        'amount': str(i * 1000),
+        'feeAmount': '-%d' % i,
+    }
+
+
+class TestColumns():
+
+    def test_columns(self):
+        columns = ColumnBuilder(FILL_COLUMNS, chunk_size=2)
+        columns.extend([_fill(3), _fill(2, 'WETH-PUSD', 'SELL')])
+        columns.append(_fill(1, side=None))
+        assert len(columns) == 3
+        assert columns['createdAt'].dtype == numpy.int64
+        assert list(columns['createdAt']) == \
+            [1577836803500, 1577836802500, 1577836801500]
+        assert columns['price'].dtype == numpy.float64
+        assert list(columns['price']) == [9000.3, 9000.2, 9000.1]
+        assert list(columns['feeAmount']) == [-3, -2, -1]
+        assert list(columns['market']) == [0, 1, 0]
+        assert columns.categories['market'] == ['PBTC-USDC', 'WETH-PUSD']
+        assert list(columns['side']) == [0, 1, MISSING]
+        assert list(columns.labels('side')) == ['BUY', 'SELL', None]
+        assert sorted(columns.arrays()) == sorted(
+            name for name, _ in FILL_COLUMNS
+        )
+
+    def test_incremental(self):
+        columns = ColumnBuilder(FILL_COLUMNS, chunk_size=3)
+        columns.extend([_fill(i) for i in range(10, 6, -1)])
+        assert list(columns['amount']) == [10000, 9000, 8000, 7000]
+        columns.extend([_fill(i, 'PLINK-USDC') for i in range(6, 0, -1)])
+        assert len(columns['amount']) == 10
+        assert list(columns['amount'][4:6]) == [6000, 5000]
+        assert list(columns['market']) == [0] * 4 + [1] * 6
+
+    def test_exact(self):
+        columns = ColumnBuilder(FILL_COLUMNS, exact=True)
+        columns.append(dict(
+            _fill(1),
+            price='0.004962779156327543424317617866',
+            amount='2015000000000000000123',
+        ))
+        columns.append(dict(_fill(2), price=None))
+        assert list(columns['price']) == [
+            Decimal('0.004962779156327543424317617866'),
+            None,
+        ]
+        assert columns['amount'][0] == Decimal('2015000000000000000123')
+
+    def test_empty(self):
+        columns = ColumnBuilder(FUNDING_RATE_COLUMNS)
+        assert len(columns) == 0
+        assert columns['effectiveAt'].dtype == numpy.int64
+        assert columns['rate'].shape == (0,)
+
+        columns.append({'rate': '0.1'})
+        assert list(columns['effectiveAt']) == [MISSING_TIME]
+        assert numpy.isnan(columns['price'][0])
+
+    def test_get_fill_columns(self):
+        client = Client(PRIVATE_KEY_1)
+        rows = [_fill(i) for i in range(25, 0, -1)]
+        callback = _paginated('fills', rows)
+        with requests_mock.mock() as rm:
+            rm.get(API + '/v2/fills', json=callback)
+            columns = client.get_fill_columns(market=['PBTC-USDC'], limit=10)
+            assert len(columns) == 25
+            assert len(callback.queries) == 3
+            assert callback.queries[0]['market'] == ['PBTC-USDC']
+
+            # Later pages can be added to the same columns
+            client.get_fill_columns(
+                startingBefore='2020-01-01T00:00:03.000Z',
+                columns=columns,
+            )
+        assert len(columns) == 27
+        assert list(columns['amount'][-3:]) == [1000, 2000, 1000]
+
+    def test_get_historical_funding_rate_columns(self):
+        client = Client(PRIVATE_KEY_1)
+        rows = [
+            {
+                'effectiveAt': '2020-01-01T%02d:00:00.000Z' % i,
+                'rate': '0.0000%d' % i,
+                'price': '9000',
+            }
+            for i in range(5, 0, -1)
+        ]
+        callback = _paginated(
+            'history',
+            rows,
+            cursor='effectiveAt',
+            wrap=lambda page: {'PBTC-USDC': {'history': page}},
+        )
+        with requests_mock.mock() as rm:
+            rm.get(API + '/v1/historical-funding-rates', json=callback)
+            columns = client.get_historical_funding_rate_columns(
+                'PBTC-USDC',
+                limit=2,
+            )
+        assert list(columns['effectiveAt']) == [
+            1577854800000 - 3600000 * i for i in range(5)
+        ]
+        assert columns['rate'][0] == 0.00005
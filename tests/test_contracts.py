@@ -0,0 +1,63 @@
+import dydx.constants as consts
+from eth_abi import encode_abi
+from eth_utils import function_abi_to_4byte_selector
+from dydx.contracts import LazyContract, get_call_data, load_abi
+from dydx.eth import Eth
+
+PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+ADDRESS_1 = '0x90F8bf6A479f320ead074411a4B0e7944Ea8c9C1'
+
+
+class TestContracts():
+
+    # ------------ load_abi ------------
+
+    def test_load_abi(self):
+        abi = load_abi('abi/erc20.json')
+        assert isinstance(abi, list)
+        assert 'approve' in [entry.get('name') for entry in abi]
+        assert load_abi('abi/erc20.json') is abi
+
+    # ------------ LazyContract ------------
+
+    def test_lazy_contracts(self):
+        eth = Eth(None, PRIVATE_KEY_1, ADDRESS_1, 0)
+        assert 'dai_contract' not in vars(eth)
+        assert 'solo_margin' not in vars(eth.solo)
+        assert 'btc_perpetual' not in vars(eth.perp)
+        assert isinstance(Eth.dai_contract, LazyContract)
+
+        dai_contract = eth.dai_contract
+        assert dai_contract.address == consts.DAI_ADDRESS
+        assert eth.dai_contract is dai_contract
+        assert eth.get_token_contract(consts.MARKET_DAI) is dai_contract
+        assert 'weth_contract' not in vars(eth)
+
+        assert eth.solo.solo_margin.address == consts.SOLO_MARGIN_ADDRESS
+        assert eth.perp._get_perpetual_by_market(consts.PAIR_PBTC_USDC) \
+            .address == consts.BTC_PERPETUAL_ADDRESS
+        assert 'link_perpetual' not in vars(eth.perp)
+
+    def test_abis_shared(self):
+        eth_1 = Eth(None, PRIVATE_KEY_1, ADDRESS_1, 0)
+        eth_2 = Eth(None, PRIVATE_KEY_1, ADDRESS_1, 0)
+        assert eth_1.dai_contract is not eth_2.dai_contract
+        assert eth_1.dai_contract.abi is eth_2.usdc_contract.abi
+        assert eth_1.perp.btc_perpetual.abi is eth_2.perp.link_perpetual.abi
+
+    # ------------ get_call_data ------------
+
+    def test_get_call_data(self):
+        eth = Eth(None, PRIVATE_KEY_1, ADDRESS_1, 0)
+        method = eth.solo.solo_margin.functions.getAccountValues(
+            [ADDRESS_1, 3],
+        )
+        selector = function_abi_to_4byte_selector(method.abi)
+        assert get_call_data(method) == '0x' + (
+            selector + encode_abi(['(address,uint256)'], [(ADDRESS_1, 3)])
+        ).hex()
+
+        other = Eth(None, PRIVATE_KEY_1, ADDRESS_1, 0)
+        assert get_call_data(
+            other.dai_contract.functions.balanceOf(ADDRESS_1),
+        ) == get_call_data(eth.usdc_contract.functions.balanceOf(ADDRESS_1))
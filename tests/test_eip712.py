@@ -0,0 +1,44 @@
+import pytest
+import dydx.eip712 as eip712
+import dydx.util as utils
+
+ADDRESS_1 = '0x90F8bf6A479f320ead074411a4B0e7944Ea8c9C1'
+ORDER_HASH = '0x50538cce27ddd08a8a3732aaedb90b5ef55fd92a6819f5798edc043833776405'  # noqa: E501
+
+
+class TestEip712():
+
+    def test_encode_address(self):
+        assert eip712.encode_address(ADDRESS_1).hex() == \
+            utils.strip_hex_prefix(utils.address_to_bytes32(ADDRESS_1)).lower()
+        with pytest.raises(ValueError):
+            eip712.encode_address('0x1234')
+
+    def test_encode_bytes32(self):
+        assert eip712.encode_bytes32(ORDER_HASH) == \
+            bytes.fromhex(ORDER_HASH[2:])
+        with pytest.raises(ValueError):
+            eip712.encode_bytes32('0x1234')
+
+    def test_struct_hasher_type_hash(self):
+        hasher = eip712.StructHasher(eip712.EIP712_DOMAIN_STRING)
+        assert '0x' + hasher.type_hash.hex() == \
+            utils.hash_string(eip712.EIP712_DOMAIN_STRING)
+
+    def test_struct_hasher_wrong_number_of_values(self):
+        hasher = eip712.StructHasher(eip712.EIP712_DOMAIN_STRING)
+        with pytest.raises(ValueError) as error:
+            hasher.hash(['name', '1.0'])
+        assert 'Expected 4 values' in str(error.value)
+
+    def test_get_domain_separator_cached(self):
+        domain_separator = eip712.get_domain_separator(
+            'Test', '1.0', 1, ADDRESS_1,
+        )
+        assert domain_separator is eip712.get_domain_separator(
+            'Test', '1.0', 1, ADDRESS_1,
+        )
+        assert len(domain_separator) == 32
+        assert domain_separator != eip712.get_domain_separator(
+            'Test', '1.1', 1, ADDRESS_1,
+        )
@@ -177,6 +177,83 @@ class TestEth():
             client.eth.solo.withdraw_to_zero(market=consts.MARKET_INVALID)
         assert 'Invalid market number' in str(error.value)
 
+    # ------------ operation ------------
+
+    def test_eth_solo_operation_success(self):
+        client = Client(PRIVATE_KEY_1, node=LOCAL_NODE)
+        tx_hash = client.eth.solo.operation() \
+            .deposit(market=consts.MARKET_WETH, wei=1000) \
+            .deposit(market=consts.MARKET_DAI, wei=1000) \
+            .withdraw(market=consts.MARKET_DAI, wei=500, to=ADDRESS_2) \
+            .withdraw(market=consts.MARKET_WETH, wei=500) \
+            .send()
+        self._validate_tx_hash(client, tx_hash)
+
+    def test_eth_solo_operation_without_proxy_success(self):
+        client = Client(PRIVATE_KEY_1, node=LOCAL_NODE)
+        tx_hash = client.eth.solo.operation() \
+            .deposit(market=consts.MARKET_DAI, wei=1000) \
+            .withdraw_to_zero(market=consts.MARKET_DAI) \
+            .send()
+        self._validate_tx_hash(client, tx_hash)
+
+    def test_eth_solo_operation_routing(self):
+        client = Client(PRIVATE_KEY_1)
+        sent = []
+        client.eth.send_eth_transaction = \
+            lambda method, options, profile_key: sent.append(
+                (method, options, profile_key)
+            )
+        operation = client.eth.solo.operation() \
+            .deposit(market=consts.MARKET_WETH, wei=1000) \
+            .deposit(market=consts.MARKET_WETH, wei=500) \
+            .withdraw(market=consts.MARKET_DAI, wei=10, to=ADDRESS_2) \
+            .withdraw(market=consts.MARKET_WETH, wei=100, to=ADDRESS_2)
+        assert len(operation) == 4
+        operation.send()
+        method, options, profile_key = sent[0]
+        assert method.address == consts.PAYABLE_PROXY_ADDRESS
+        assert options == {'value': 1500}
+        accounts, actions, send_eth_to = method.args
+        assert accounts == [{'owner': ADDRESS_1, 'number': 0}]
+        assert send_eth_to == ADDRESS_2
+        assert [action['otherAddress'] for action in actions] == [
+            consts.PAYABLE_PROXY_ADDRESS,
+            consts.PAYABLE_PROXY_ADDRESS,
+            ADDRESS_2,
+            consts.PAYABLE_PROXY_ADDRESS,
+        ]
+        assert profile_key.endswith(':0.0,0.0,1.3,1.0')
+
+        client.eth.solo.operation() \
+            .deposit(market=consts.MARKET_WETH, wei=1000, asEth=False) \
+            .send()
+        method, options, profile_key = sent[1]
+        assert method.address == consts.SOLO_MARGIN_ADDRESS
+        assert options == {'value': 0}
+        assert profile_key.endswith(':0.0')
+
+        # Single actions on different markets learn separate gas limits
+        client.eth.solo.withdraw_to_zero(market=consts.MARKET_USDC)
+        method, options, profile_key = sent[2]
+        assert profile_key.endswith(':1.%d' % consts.MARKET_USDC)
+        assert profile_key.split(':')[:2] == sent[1][2].split(':')[:2]
+
+    def test_eth_solo_operation_failure(self):
+        client = Client(PRIVATE_KEY_1)
+        with pytest.raises(ValueError) as error:
+            client.eth.solo.operation().send()
+        assert 'No actions to send' in str(error.value)
+        with pytest.raises(ValueError) as error:
+            client.eth.solo.operation() \
+                .withdraw(market=consts.MARKET_WETH, wei=1) \
+                .withdraw(market=consts.MARKET_WETH, wei=1, to=ADDRESS_2)
+        assert 'one address' in str(error.value)
+        with pytest.raises(ValueError) as error:
+            client.eth.solo.operation() \
+                .deposit(market=consts.MARKET_INVALID, wei=1)
+        assert 'Invalid market number' in str(error.value)
+
     # -----------------------------------------------------------
     # Perp Transactions
     # -----------------------------------------------------------
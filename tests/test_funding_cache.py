@@ -0,0 +1,176 @@
+import threading
+import requests_mock
+import dydx.funding_cache as funding_cache
+from dydx.client import Client
+from dydx.funding_cache import FundingCache
+
+PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+API = 'https://api.dydx.exchange'
+FUNDING_RATES = {
+    'PBTC-USDC': {'current': {'rate': '1'}, 'predicted': {'rate': '2'}},
+    'WETH-PUSD': {'current': {'rate': '3'}, 'predicted': None},
+}
+INDEX_PRICES = {
+    'PBTC-USDC': {'price': '9000'},
+    'WETH-PUSD': {'price': '200'},
+}
+
+
+class _Clock(object):
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestFundingCache():
+
+    def test_minute_schedule(self, monkeypatch):
+        clock = _Clock(1000 * 60 + 30)
+        monkeypatch.setattr(funding_cache.time, 'time', clock)
+        cache = FundingCache(Client(PRIVATE_KEY_1), grace=2)
+        with requests_mock.mock() as rm:
+            rm.get(API + '/v1/funding-rates', json=FUNDING_RATES)
+            assert cache.get_funding_rates() == FUNDING_RATES
+            assert cache.get_funding_rates(['PBTC-USDC']) == \
+                {'PBTC-USDC': FUNDING_RATES['PBTC-USDC']}
+            assert cache.get_funding_rates(['WETH-PUSD', 'UNKNOWN']) == \
+                {'WETH-PUSD': FUNDING_RATES['WETH-PUSD']}
+            # One request for every market
+            assert rm.call_count == 1
+            assert rm.request_history[0].qs == {}
+
+            # The grace period has not passed
+            clock.now = 1001 * 60 + 1
+            cache.get_funding_rates()
+            assert rm.call_count == 1
+
+            clock.now = 1001 * 60 + 2
+            cache.get_funding_rates()
+            cache.get_funding_rates()
+            assert rm.call_count == 2
+
+    def test_hour_schedule(self, monkeypatch):
+        clock = _Clock(10 * 3600 + 5)
+        monkeypatch.setattr(funding_cache.time, 'time', clock)
+        cache = FundingCache(Client(PRIVATE_KEY_1))
+        history = {'PBTC-USDC': {'history': [{'rate': '1'}]}}
+        with requests_mock.mock() as rm:
+            rm.get(API + '/v1/historical-funding-rates', json=history)
+            rm.get(API + '/v1/index-price', json=INDEX_PRICES)
+            cache.get_historical_funding_rates(['PBTC-USDC'])
+            cache.get_funding_index_price()
+            clock.now = 10 * 3600 + 59 * 60 + 30
+            assert cache.get_historical_funding_rates() == history
+            assert cache.get_funding_index_price(['WETH-PUSD']) == \
+                {'WETH-PUSD': INDEX_PRICES['WETH-PUSD']}
+            assert [
+                request.path for request in rm.request_history
+            ] == [
+                '/v1/historical-funding-rates',
+                '/v1/index-price',
+                '/v1/index-price',
+            ]
+
+            clock.now = 11 * 3600 + 5
+            cache.get_historical_funding_rates()
+            assert rm.call_count == 4
+
+            cache.invalidate()
+            cache.get_historical_funding_rates()
+            assert rm.call_count == 5
+
+    def test_hour_schedule_pending(self, monkeypatch):
+        clock = _Clock(11 * 3600 + 2)
+        monkeypatch.setattr(funding_cache.time, 'time', clock)
+        cache = FundingCache(Client(PRIVATE_KEY_1), pending_interval=15)
+        previous = {'PBTC-USDC': {'history': [
+            {'rate': '1', 'effectiveAt': '1970-01-01T10:00:00.000Z'},
+        ]}}
+        mined = {'PBTC-USDC': {'history': [
+            {'rate': '2', 'effectiveAt': '1970-01-01T11:00:00.000Z'},
+            {'rate': '1', 'effectiveAt': '1970-01-01T10:00:00.000Z'},
+        ]}}
+        with requests_mock.mock() as rm:
+            rm.get(API + '/v1/historical-funding-rates', [
+                {'json': previous},
+                {'json': previous},
+                {'json': mined},
+            ])
+            # The rate of the new hour has not been mined yet
+            assert cache.get_historical_funding_rates() == previous
+            clock.now += 10
+            assert cache.get_historical_funding_rates() == previous
+            assert rm.call_count == 1
+
+            clock.now += 5
+            assert cache.get_historical_funding_rates() == previous
+            assert rm.call_count == 2
+
+            clock.now += 15
+            cache.refresh()
+            assert cache.get_historical_funding_rates() == mined
+            assert rm.call_count == 3
+
+            # Up to date until the next hour
+            clock.now = 11 * 3600 + 59 * 60
+            assert cache.get_historical_funding_rates() == mined
+            assert rm.call_count == 3
+
+    def test_shared_fetch(self, monkeypatch):
+        monkeypatch.setattr(funding_cache.time, 'time', _Clock(1000 * 60))
+        cache = FundingCache(Client(PRIVATE_KEY_1))
+        calls = []
+        results = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def get_funding_rates():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return FUNDING_RATES
+
+        cache._fetchers['funding_rates'] = get_funding_rates
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_funding_rates())
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        assert started.wait(5)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert calls == [1]
+        assert results == [FUNDING_RATES] * 5
+
+    def test_refresh(self, monkeypatch):
+        clock = _Clock(1000 * 60 + 30)
+        monkeypatch.setattr(funding_cache.time, 'time', clock)
+        cache = FundingCache(Client(PRIVATE_KEY_1))
+        with requests_mock.mock() as rm:
+            rm.get(API + '/v1/funding-rates', json=FUNDING_RATES)
+            cache.refresh()
+            assert rm.call_count == 0
+            cache.get_funding_rates()
+            clock.now += 60
+            cache.refresh()
+            assert rm.call_count == 2
+
+            # Errors are left for the next read
+            rm.get(API + '/v1/funding-rates', status_code=500, json={})
+            clock.now += 60
+            cache.refresh()
+            assert rm.call_count == 3
+
+    def test_start_stop(self):
+        cache = FundingCache(Client(PRIVATE_KEY_1))
+        cache.start()
+        cache.start()
+        cache.stop()
+        cache.stop()
@@ -0,0 +1,117 @@
+import time
+import pytest
+import dydx.constants as consts
+from dydx.gas_price import GasPriceProvider, PercentileGasPrice
+
+
+class _Node(object):
+    '''
+    Stand-in for web3 serving a gas price and blocks, counting the calls.
+    '''
+
+    def __init__(self, gas_price=100, blocks=None):
+        self.gas_price = gas_price
+        self.blocks = blocks or {}
+        self.gas_price_calls = 0
+        self.block_calls = []
+        self.eth = self
+
+    @property
+    def gasPrice(self):
+        self.gas_price_calls += 1
+        if self.gas_price is None:
+            raise ValueError('node unavailable')
+        return self.gas_price
+
+    @property
+    def blockNumber(self):
+        return max(self.blocks)
+
+    def getBlock(self, number, full_transactions=False):
+        assert full_transactions
+        self.block_calls.append(number)
+        return {
+            'transactions': [
+                {'gasPrice': price} for price in self.blocks.get(number, [])
+            ],
+        }
+
+
+class TestGasPrice():
+
+    # ------------ GasPriceProvider ------------
+
+    def test_get_gas_price_cached(self):
+        node = _Node(100)
+        provider = GasPriceProvider(node, ttl=60)
+        assert provider.get_gas_price() == \
+            100 + consts.DEFAULT_GAS_PRICE_ADDITION
+        node.gas_price = 200
+        assert provider.get_gas_price() == \
+            100 + consts.DEFAULT_GAS_PRICE_ADDITION
+        assert node.gas_price_calls == 1
+        assert provider.refresh() == 200 + consts.DEFAULT_GAS_PRICE_ADDITION
+
+    def test_get_gas_price_expired(self):
+        node = _Node(100)
+        provider = GasPriceProvider(node, ttl=0, addition=0)
+        assert provider.get_gas_price() == 100
+        node.gas_price = 200
+        assert provider.get_gas_price() == 200
+        assert node.gas_price_calls == 2
+
+    def test_get_gas_price_failure(self):
+        node = _Node(None)
+        provider = GasPriceProvider(node, ttl=0, addition=0)
+        assert provider.get_gas_price() == consts.DEFAULT_GAS_PRICE
+        node.gas_price = 100
+        assert provider.get_gas_price() == 100
+        node.gas_price = None
+        assert provider.get_gas_price() == 100
+
+    def test_start_stop(self):
+        node = _Node(100)
+        provider = GasPriceProvider(node, ttl=60, addition=0)
+        provider.start(interval=0.01)
+        try:
+            deadline = time.monotonic() + 5
+            while node.gas_price_calls < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            node.gas_price = 200
+            while provider.get_gas_price() != 200 and \
+                    time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            provider.stop()
+        assert provider.get_gas_price() == 200
+        calls = node.gas_price_calls
+        time.sleep(0.05)
+        assert node.gas_price_calls == calls
+
+    # ------------ PercentileGasPrice ------------
+
+    def test_percentile(self):
+        node = _Node(blocks={
+            1: [10, 20],
+            2: [30, 40, 50],
+            3: [60],
+        })
+        assert PercentileGasPrice(percentile=0)(node) == 10
+        assert PercentileGasPrice(percentile=50)(node) == 30
+        assert PercentileGasPrice(percentile=100)(node) == 60
+        with pytest.raises(ValueError):
+            PercentileGasPrice(percentile=101)
+
+    def test_percentile_fetches_new_blocks_only(self):
+        node = _Node(blocks={1: [10], 2: [20], 3: [30]})
+        strategy = PercentileGasPrice(percentile=0, block_count=2)
+        provider = GasPriceProvider(node, strategy=strategy, ttl=0, addition=0)
+        assert provider.get_gas_price() == 20
+        assert node.block_calls == [2, 3]
+        node.blocks[4] = [5]
+        assert provider.get_gas_price() == 5
+        assert node.block_calls == [2, 3, 4]
+
+    def test_percentile_empty_blocks(self):
+        node = _Node(77, blocks={1: [], 2: []})
+        assert PercentileGasPrice()(node) == 77
@@ -0,0 +1,128 @@
+import json
+import pytest
+import dydx.constants as consts
+from web3 import Web3
+from dydx.eth import Eth
+from dydx.gas_profiles import GasProfiles, get_profile_key
+from tests.stand_ins import StandInMethod, StandInWeb3
+
+PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+ADDRESS_1 = '0x90F8bf6A479f320ead074411a4B0e7944Ea8c9C1'
+ADDRESS_2 = '0xFFcf8FDEE72ac11b5c542428B35EEF5769C409f0'
+APPROVE_KEY = consts.DAI_ADDRESS.lower() + ':0x095ea7b3'
+
+
+def _make_eth(node, gas_profiles=None):
+    eth = Eth(
+        None,
+        PRIVATE_KEY_1,
+        ADDRESS_1,
+        0,
+        gas_profiles=gas_profiles,
+    )
+    eth.web3 = node
+    eth.nonce_manager.web3 = node
+    return eth
+
+
+class TestGasProfiles():
+
+    # ------------ get_profile_key ------------
+
+    def test_get_profile_key(self):
+        eth = Eth(None, PRIVATE_KEY_1, ADDRESS_1, 0)
+        method = eth.dai_contract.functions.approve(ADDRESS_2, 1)
+        assert get_profile_key(method) == APPROVE_KEY
+        assert get_profile_key(StandInMethod()) == APPROVE_KEY
+        web3 = Web3(None)
+        contract = web3.eth.contract(
+            address=consts.DAI_ADDRESS,
+            abi=eth.dai_contract.abi,
+        )
+        method = contract.functions.transfer(ADDRESS_2, 1)
+        assert get_profile_key(method) == \
+            consts.DAI_ADDRESS.lower() + ':0xa9059cbb'
+
+    # ------------ GasProfiles ------------
+
+    def test_gas_limit(self):
+        profiles = GasProfiles(multiplier=2)
+        assert profiles.get_gas_limit(APPROVE_KEY) is None
+        profiles.record_estimate(APPROVE_KEY, 50000)
+        assert profiles.get_gas_limit(APPROVE_KEY) == 100000
+        profiles.record_gas_used(APPROVE_KEY, 40000)
+        assert profiles.get_gas_limit(APPROVE_KEY) == 100000
+        profiles.record_gas_used(APPROVE_KEY, 60000)
+        profiles.record_gas_used(APPROVE_KEY, 45000)
+        assert profiles.get_gas_limit(APPROVE_KEY) == 120000
+        assert len(profiles) == 1
+        assert APPROVE_KEY in profiles
+
+    def test_persist(self, tmp_path):
+        path = str(tmp_path / 'gas.json')
+        profiles = GasProfiles(path=path)
+        profiles.record_estimate(APPROVE_KEY, 50000)
+        with open(path, 'r') as profiles_file:
+            assert json.load(profiles_file) == {
+                APPROVE_KEY: {'estimate': 50000},
+            }
+        loaded = GasProfiles(path=path, multiplier=1)
+        assert loaded.get_gas_limit(APPROVE_KEY) == 50000
+        loaded.forget(APPROVE_KEY)
+        assert len(GasProfiles(path=path)) == 0
+        with pytest.raises(ValueError):
+            GasProfiles().save()
+
+    # ------------ Eth.send_eth_transaction ------------
+
+    def test_send_estimates_once(self):
+        eth = _make_eth(StandInWeb3())
+        method = StandInMethod()
+        for _ in range(3):
+            eth.send_eth_transaction(method, {'gasPrice': 1})
+        assert method.estimate_calls == 1
+        assert method.gas == [
+            int(50000 * consts.DEFAULT_GAS_MULTIPLIER)
+        ] * 3
+
+    def test_send_estimate_failure(self):
+        eth = _make_eth(StandInWeb3())
+        method = StandInMethod(estimate=None)
+        eth.send_eth_transaction(method, {'gasPrice': 1})
+        eth.send_eth_transaction(method, {'gasPrice': 1})
+        assert method.estimate_calls == 2
+        assert method.gas == [consts.DEFAULT_GAS_AMOUNT] * 2
+
+    def test_get_receipt_refines_profile(self):
+        profiles = GasProfiles(multiplier=1)
+        eth = _make_eth(StandInWeb3(), gas_profiles=profiles)
+        method = StandInMethod(estimate=30000)
+        tx_hash = eth.send_eth_transaction(method, {'gasPrice': 1})
+        assert profiles.get_gas_limit(APPROVE_KEY) == 30000
+        eth.get_receipt(bytes.fromhex(tx_hash[2:]))
+        assert profiles.get_gas_limit(APPROVE_KEY) == 40000
+        eth.send_eth_transaction(method, {'gasPrice': 1})
+        assert method.gas == [30000, 40000]
+
+    def test_get_receipt_out_of_gas(self):
+        profiles = GasProfiles(multiplier=1)
+        node = StandInWeb3(status=0, gas_used=30000)
+        eth = _make_eth(node, gas_profiles=profiles)
+        method = StandInMethod(estimate=30000)
+        tx_hash = eth.send_eth_transaction(method, {'gasPrice': 1})
+        eth.get_receipt(tx_hash)
+        # The learned limit was too low, so the next send estimates again
+        assert APPROVE_KEY not in profiles
+        method.estimate = 45000
+        eth.send_eth_transaction(method, {'gasPrice': 1})
+        assert method.estimate_calls == 2
+        assert method.gas == [30000, 45000]
+
+    def test_get_receipt_ignores_revert(self):
+        profiles = GasProfiles(multiplier=1)
+        node = StandInWeb3(status=0, gas_used=20000)
+        eth = _make_eth(node, gas_profiles=profiles)
+        method = StandInMethod(estimate=30000)
+        tx_hash = eth.send_eth_transaction(method, {'gasPrice': 1})
+        eth.get_receipt(tx_hash)
+        assert profiles.get_gas_limit(APPROVE_KEY) == 30000
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+
+DEFERRED_MODULES = ['web3', 'eth_account', 'eth_keys']
+
+
+def _loaded_after_import(statement):
+    output = subprocess.check_output([
+        sys.executable,
+        '-c',
+        statement + '; import sys; ' +
+        'print(",".join(m for m in %r if m in sys.modules))'
+        % DEFERRED_MODULES,
+    ])
+    return [name for name in output.decode('utf-8').strip().split(',') if name]
+
+
+class TestImport():
+
+    def test_import_client_defers_dependencies(self):
+        assert _loaded_after_import('import dydx.client') == []
+
+    def test_order_signing_defers_web3(self):
+        loaded = _loaded_after_import(
+            'import dydx.solo_orders as o; ' +
+            'o.sign_cancel_order("0x" + "00" * 32, "0x" + "11" * 32)'
+        )
+        assert loaded == ['eth_keys']
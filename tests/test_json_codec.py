@@ -0,0 +1,83 @@
+import json
+import pytest
+import requests_mock
+import tests.test_json
+from dydx.client import Client
+from dydx.json_codec import CODEC_NAMES, JsonCodec, get_codec
+
+PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+
+
+def _installed_codecs():
+    codecs = []
+    for name in CODEC_NAMES:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            pass
+    return codecs
+
+
+PAYLOADS = [
+    tests.test_json.mock_get_orders_json,
+    tests.test_json.mock_get_fills_json,
+    tests.test_json.mock_get_trades_json,
+    tests.test_json.mock_get_markets_json,
+]
+
+
+class TestJsonCodec():
+
+    @pytest.mark.parametrize(
+        'codec',
+        _installed_codecs(),
+        ids=lambda codec: codec.name,
+    )
+    def test_round_trip(self, codec):
+        for payload in PAYLOADS:
+            data = codec.dumps(payload)
+            assert isinstance(data, bytes)
+            assert json.loads(data.decode('utf-8')) == payload
+            assert codec.loads(data) == payload
+            assert codec.loads(data.decode('utf-8')) == payload
+
+    @pytest.mark.parametrize(
+        'codec',
+        _installed_codecs(),
+        ids=lambda codec: codec.name,
+    )
+    def test_big_integers(self, codec):
+        payload = {'accountNumber': 2 ** 255, 'amount': -2 ** 70}
+        assert codec.loads(codec.dumps(payload)) == payload
+        assert codec.loads(json.dumps(payload)) == payload
+
+    @pytest.mark.parametrize(
+        'codec',
+        _installed_codecs(),
+        ids=lambda codec: codec.name,
+    )
+    def test_invalid(self, codec):
+        with pytest.raises(ValueError):
+            codec.loads(b'{"fills": [')
+
+    def test_get_codec(self):
+        assert get_codec().name == _installed_codecs()[0].name
+        assert get_codec('json').name == 'json'
+        with pytest.raises(ValueError) as error:
+            get_codec('yaml')
+        assert 'Unknown JSON codec' in str(error.value)
+
+    def test_client_codec(self):
+        assert Client(PRIVATE_KEY_1).json_codec.name == get_codec().name
+        assert Client(PRIVATE_KEY_1, json_codec='json').json_codec.name == \
+            'json'
+        codec = JsonCodec()
+        client = Client(PRIVATE_KEY_1, json_codec=codec)
+        assert client.json_codec is codec
+        with requests_mock.mock() as rm:
+            rm.get(
+                'https://api.dydx.exchange/v1/perpetual-markets',
+                text='{"markets": [], "number": %d}' % 2 ** 100,
+            )
+            assert client.get_perpetual_markets() == \
+                {'markets': [], 'number': 2 ** 100}
@@ -0,0 +1,172 @@
+import threading
+import pytest
+from dydx.eth import Eth
+from dydx.nonce_manager import NonceManager, is_nonce_too_low
+from tests.stand_ins import StandInMethod, StandInWeb3
+
+PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+ADDRESS_1 = '0x90F8bf6A479f320ead074411a4B0e7944Ea8c9C1'
+
+
+class TestNonceManager():
+
+    # ------------ get_nonce ------------
+
+    def test_get_nonce_syncs_once(self):
+        node = StandInWeb3(7, address=ADDRESS_1)
+        manager = NonceManager(node, ADDRESS_1)
+        assert node.calls == 0
+        assert [manager.get_nonce() for _ in range(3)] == [7, 8, 9]
+        assert node.calls == 1
+
+    def test_get_nonce_sync_interval(self):
+        node = StandInWeb3(7, address=ADDRESS_1)
+        manager = NonceManager(node, ADDRESS_1, sync_interval=0)
+        assert manager.get_nonce() == 7
+        node.count = 20
+        assert manager.get_nonce() == 20
+        assert node.calls == 2
+
+    def test_get_nonce_threads(self):
+        node = StandInWeb3(0, address=ADDRESS_1)
+        manager = NonceManager(node, ADDRESS_1)
+        nonces = []
+
+        def allocate():
+            for _ in range(200):
+                nonces.append(manager.get_nonce())
+
+        threads = [threading.Thread(target=allocate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(nonces) == list(range(1600))
+        assert node.calls == 1
+
+    # ------------ reserve ------------
+
+    def test_reserve(self):
+        manager = NonceManager(StandInWeb3(3, address=ADDRESS_1), ADDRESS_1)
+        assert list(manager.reserve(4)) == [3, 4, 5, 6]
+        assert manager.get_nonce() == 7
+        with pytest.raises(ValueError):
+            manager.reserve(0)
+
+    # ------------ mark_used / resync ------------
+
+    def test_mark_used(self):
+        node = StandInWeb3(3, address=ADDRESS_1)
+        manager = NonceManager(node, ADDRESS_1)
+        manager.mark_used(10)
+        assert manager.get_nonce() == 11
+        manager.mark_used(5)
+        assert manager.get_nonce() == 12
+
+    def test_release(self):
+        node = StandInWeb3(3, address=ADDRESS_1)
+        manager = NonceManager(node, ADDRESS_1)
+        assert manager.get_nonce() == 3
+        assert manager.get_nonce() == 4
+        assert not manager.release(3)
+        assert manager.release(4)
+        assert manager.get_nonce() == 4
+
+    def test_resync(self):
+        node = StandInWeb3(3, address=ADDRESS_1)
+        manager = NonceManager(node, ADDRESS_1)
+        assert manager.get_nonce() == 3
+        manager.resync()
+        assert manager.get_nonce() == 4
+        node.count = 10
+        manager.resync()
+        assert manager.get_nonce() == 10
+        node.count = 2
+        manager.resync(reset=True)
+        assert manager.get_nonce() == 2
+
+    def test_is_nonce_too_low(self):
+        assert is_nonce_too_low(
+            ValueError({'code': -32000, 'message': 'nonce too low'})
+        )
+        assert not is_nonce_too_low(ValueError('insufficient funds'))
+
+    # ------------ Eth.send_eth_transaction ------------
+
+    def test_send_eth_transaction_no_count_per_send(self):
+        eth = Eth(None, PRIVATE_KEY_1, ADDRESS_1, 0)
+        node = StandInWeb3(4, address=ADDRESS_1)
+        eth.nonce_manager.web3 = node
+        eth.web3 = node
+        method = StandInMethod()
+        for _ in range(3):
+            eth.send_eth_transaction(method, {'gasPrice': 1, 'gas': 21000})
+        assert method.nonces == [4, 5, 6]
+        assert node.calls == 1
+
+    def test_send_eth_transaction_nonce_too_low(self):
+        eth = Eth(None, PRIVATE_KEY_1, ADDRESS_1, 0)
+        node = StandInWeb3(4, address=ADDRESS_1, nonce_too_low=1)
+        eth.nonce_manager.web3 = node
+        eth.web3 = node
+        eth.nonce_manager.resync()
+        node.count = 9
+        method = StandInMethod()
+        tx_hash = eth.send_eth_transaction(
+            method,
+            {'gasPrice': 1, 'gas': 21000},
+        )
+        assert tx_hash == '0x' + '02' * 32
+        assert method.nonces == [4, 9]
+        assert len(node.sent) == 2
+
+    def test_send_eth_transaction_failure_releases_nonce(self):
+        eth = Eth(None, PRIVATE_KEY_1, ADDRESS_1, 0)
+        node = StandInWeb3(5, address=ADDRESS_1, insufficient_funds=1)
+        eth.nonce_manager.web3 = node
+        eth.web3 = node
+        method = StandInMethod()
+        with pytest.raises(ValueError, match='insufficient funds'):
+            eth.send_eth_transaction(method, {'gasPrice': 1, 'gas': 21000})
+        eth.send_eth_transaction(method, {'gasPrice': 1, 'gas': 21000})
+        assert method.nonces == [5, 5]
+        assert node.calls == 1
+
+    def test_send_eth_transaction_failure_resyncs(self):
+        eth = Eth(None, PRIVATE_KEY_1, ADDRESS_1, 0)
+        node = StandInWeb3(5, address=ADDRESS_1, insufficient_funds=1)
+        eth.nonce_manager.web3 = node
+        eth.web3 = node
+        method = StandInMethod()
+        eth.nonce_manager.resync()
+        # Another thread allocated the next nonce before the send failed
+        original_get_nonce = eth.nonce_manager.get_nonce
+
+        def get_nonce():
+            nonce = original_get_nonce()
+            original_get_nonce()
+            return nonce
+
+        eth.nonce_manager.get_nonce = get_nonce
+        with pytest.raises(ValueError, match='insufficient funds'):
+            eth.send_eth_transaction(method, {'gasPrice': 1, 'gas': 21000})
+        del eth.nonce_manager.get_nonce
+        eth.send_eth_transaction(method, {'gasPrice': 1, 'gas': 21000})
+        assert method.nonces == [5, 5]
+        assert node.calls == 2
+
+    def test_send_eth_transaction_gas_price_failure_releases_nonce(self):
+        eth = Eth(None, PRIVATE_KEY_1, ADDRESS_1, 0)
+        node = StandInWeb3(5, address=ADDRESS_1)
+        eth.nonce_manager.web3 = node
+        eth.web3 = node
+        method = StandInMethod()
+
+        def get_gas_price():
+            raise ConnectionError('node unreachable')
+
+        eth.gas_price_provider.get_gas_price = get_gas_price
+        with pytest.raises(ConnectionError):
+            eth.send_eth_transaction(method, {'gas': 21000})
+        eth.send_eth_transaction(method, {'gasPrice': 1, 'gas': 21000})
+        assert method.nonces == [5]
@@ -0,0 +1,164 @@
+import pytest
+from decimal import Decimal
+from dydx.orderbook import OrderBook
+
+SNAPSHOT = {
+    'bids': [
+        {'id': '0xb1', 'uuid': 'b1', 'amount': '100', 'price': '160.08'},
+        {'id': '0xb2', 'uuid': 'b2', 'amount': '200', 'price': '160.07'},
+        {'id': '0xb3', 'uuid': 'b3', 'amount': '50', 'price': '160.08'},
+    ],
+    'asks': [
+        {'id': '0xa1', 'uuid': 'a1', 'amount': '120', 'price': '160.40'},
+        {'id': '0xa2', 'uuid': 'a2', 'amount': '80', 'price': '160.30'},
+    ],
+}
+
+
+class TestOrderBook():
+
+    # ------------ snapshot ------------
+
+    def test_from_snapshot(self):
+        book = OrderBook('WETH-DAI', SNAPSHOT)
+        assert len(book) == 5
+        assert '0xb3' in book
+        assert book.best_bid() == (Decimal('160.08'), Decimal(150))
+        assert book.best_ask() == (Decimal('160.30'), Decimal(80))
+        assert book.spread() == Decimal('0.22')
+
+    def test_empty(self):
+        book = OrderBook('WETH-DAI')
+        assert book.best_bid() is None
+        assert book.best_ask() is None
+        assert book.spread() is None
+        assert book.depth(3) == {'bids': [], 'asks': []}
+
+    def test_load_snapshot_replaces(self):
+        book = OrderBook('WETH-DAI', SNAPSHOT)
+        book.load_snapshot({'bids': [], 'asks': SNAPSHOT['asks'][:1]})
+        assert len(book) == 1
+        assert book.best_bid() is None
+        assert book.best_ask() == (Decimal('160.40'), Decimal(120))
+
+    # ------------ depth / vwap ------------
+
+    def test_depth(self):
+        book = OrderBook('WETH-DAI', SNAPSHOT)
+        assert book.depth(1) == {
+            'bids': [(Decimal('160.08'), Decimal(150))],
+            'asks': [(Decimal('160.30'), Decimal(80))],
+        }
+        assert book.depth(10)['bids'] == [
+            (Decimal('160.08'), Decimal(150)),
+            (Decimal('160.07'), Decimal(200)),
+        ]
+
+    def test_vwap(self):
+        book = OrderBook('WETH-DAI', SNAPSHOT)
+        assert book.vwap(40) == Decimal('160.30')
+        assert book.vwap(100) == (
+            Decimal('160.30') * 80 + Decimal('160.40') * 20
+        ) / 100
+        assert book.vwap(250, side='SELL') == (
+            Decimal('160.08') * 150 + Decimal('160.07') * 100
+        ) / 250
+
+    def test_vwap_not_enough_liquidity(self):
+        book = OrderBook('WETH-DAI', SNAPSHOT)
+        with pytest.raises(ValueError):
+            book.vwap(201)
+        with pytest.raises(ValueError):
+            book.vwap(0)
+
+    # ------------ updates ------------
+
+    def test_apply_update_new(self):
+        book = OrderBook('WETH-DAI', SNAPSHOT)
+        book.apply_update({
+            'type': 'NEW',
+            'id': '0xb4',
+            'side': 'BUY',
+            'amount': '10',
+            'price': '160.20',
+        })
+        assert book.best_bid() == (Decimal('160.20'), Decimal(10))
+
+    def test_apply_update_update(self):
+        book = OrderBook('WETH-DAI', SNAPSHOT)
+        book.apply_update({'type': 'UPDATE', 'id': '0xb1', 'amount': '30'})
+        assert book.best_bid() == (Decimal('160.08'), Decimal(80))
+        book.apply_update({'type': 'UPDATE', 'id': '0xa2', 'amount': '0'})
+        assert '0xa2' not in book
+        assert book.best_ask() == (Decimal('160.40'), Decimal(120))
+        book.apply_update({'type': 'UPDATE', 'id': '0xzz', 'amount': '5'})
+        assert len(book) == 4
+
+    def test_apply_update_removed(self):
+        book = OrderBook('WETH-DAI', SNAPSHOT)
+        book.apply_update({'type': 'REMOVED', 'id': '0xb1', 'side': 'BUY'})
+        book.apply_update({'type': 'REMOVED', 'id': '0xb3', 'side': 'BUY'})
+        assert book.best_bid() == (Decimal('160.07'), Decimal(200))
+        book.apply_update({'type': 'REMOVED', 'id': '0xb3', 'side': 'BUY'})
+        assert len(book) == 3
+
+    def test_apply_update_invalid(self):
+        book = OrderBook('WETH-DAI', SNAPSHOT)
+        with pytest.raises(ValueError):
+            book.apply_update({'type': 'MOVED', 'id': '0xb1'})
+        with pytest.raises(ValueError):
+            book.add('0xc1', 'BOTH', '1', '1')
+
+    def test_consume(self):
+        book = OrderBook('WETH-DAI', SNAPSHOT)
+        feed = iter([
+            {'type': 'REMOVED', 'id': '0xa2'},
+            [
+                {'type': 'UPDATE', 'id': '0xa1', 'amount': '20'},
+                {
+                    'type': 'NEW',
+                    'id': '0xa3',
+                    'side': 'SELL',
+                    'amount': '5',
+                    'price': '160.35',
+                },
+            ],
+            {
+                'type': 'channel_data',
+                'connection_id': '1d8a53b8-2d2b-4b39-8e9d-ab6a0a2c7b6e',
+                'message_id': 3,
+                'channel': 'orderbook',
+                'id': 'WETH-DAI',
+                'contents': {
+                    'updates': [{'type': 'REMOVED', 'id': '0xb2'}],
+                },
+            },
+        ])
+        book.consume(feed)
+        assert book.depth(5) == {
+            'bids': [(Decimal('160.08'), Decimal(150))],
+            'asks': [
+                (Decimal('160.35'), Decimal(5)),
+                (Decimal('160.40'), Decimal(20)),
+            ],
+        }
+
+    def test_consume_subscribed(self):
+        book = OrderBook('WETH-DAI', SNAPSHOT)
+        book.consume([
+            {
+                'type': 'subscribed',
+                'connection_id': '1d8a53b8-2d2b-4b39-8e9d-ab6a0a2c7b6e',
+                'message_id': 1,
+                'channel': 'orderbook',
+                'id': 'WETH-DAI',
+                'contents': {
+                    'bids': [],
+                    'asks': [
+                        {'id': '0xa9', 'price': '161', 'amount': '3'},
+                    ],
+                },
+            },
+        ])
+        assert book.best_bid() is None
+        assert book.best_ask() == (Decimal('161'), Decimal(3))
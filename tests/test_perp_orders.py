@@ -51,6 +51,10 @@ class TestPerpOrders():
         hash = perp_orders.get_cancel_order_hash(BTC_ORDER_HASH)
         assert hash == BTC_CANCEL_ORDER_HASH
 
+    def test_perp_orders_get_cancel_orders_hash(self):
+        hash = perp_orders.get_cancel_orders_hash([BTC_ORDER_HASH])
+        assert hash == BTC_CANCEL_ORDER_HASH
+
     def test_perp_orders_sign_order(self):
         signature = perp_orders.sign_order(
             order=BTC_ORDER,
@@ -72,3 +76,17 @@ class TestPerpOrders():
             private_key=PRIVATE_KEY_1
         )
         assert signature == BTC_CANCEL_ORDER_SIGNATURE
+
+    def test_perp_orders_sign_orders(self):
+        signed_orders = perp_orders.sign_orders(
+            orders=[BTC_ORDER, dict(BTC_ORDER, salt=1)],
+            pair=consts.PAIR_PBTC_USDC,
+            private_key=PRIVATE_KEY_1
+        )
+        assert signed_orders[0]['typedSignature'] == BTC_ORDER_SIGNATURE
+        assert signed_orders[1]['salt'] == 1
+        assert signed_orders[1]['typedSignature'] == perp_orders.sign_order(
+            order=dict(BTC_ORDER, salt=1),
+            pair=consts.PAIR_PBTC_USDC,
+            private_key=PRIVATE_KEY_1
+        )
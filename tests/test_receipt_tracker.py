@@ -0,0 +1,102 @@
+import pytest
+import requests_mock
+from web3.exceptions import TimeExhausted
+from dydx.eth import Eth
+from tests.stand_ins import stand_in_node
+from dydx.receipt_tracker import ReceiptTracker
+
+PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
+ADDRESS_1 = '0x90F8bf6A479f320ead074411a4B0e7944Ea8c9C1'
+LOCAL_NODE = 'http://localhost:8545'
+TX_HASH_1 = '0x' + '11' * 32
+TX_HASH_2 = '0x' + '22' * 32
+TX_HASH_3 = '0x' + '33' * 32
+
+
+def _receipt_node(mined):
+    '''
+    Returns a stand_in_node callback answering eth_getTransactionReceipt.
+    mined maps the hashes of mined transactions to their gasUsed.
+    '''
+
+    def get_receipt(params):
+        tx_hash = params[0]
+        if tx_hash not in mined:
+            return None
+        return {
+            'transactionHash': tx_hash,
+            'blockNumber': '0xa',
+            'gasUsed': hex(mined[tx_hash]),
+            'status': '0x1',
+        }
+
+    return stand_in_node({'eth_getTransactionReceipt': get_receipt})
+
+
+class TestReceiptTracker():
+
+    def test_poll(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        eth._track_gas_used(TX_HASH_1, 'key', 60000)
+        mined = {TX_HASH_1: 50000}
+        callback = _receipt_node(mined)
+        received = []
+        tracker = ReceiptTracker(eth)
+        future_1 = tracker.track(TX_HASH_1, callback=received.append)
+        future_2 = tracker.track(bytes.fromhex('22' * 32))
+        assert tracker.track(TX_HASH_1) is future_1
+        assert len(tracker) == 2
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            assert tracker.poll() == 1
+            assert len(callback.batches[0]) == 2
+            assert future_1.result(0)['gasUsed'] == 50000
+            assert future_1.result(0)['blockNumber'] == 10
+            assert received == [future_1.result(0)]
+            assert not future_2.done()
+
+            mined[TX_HASH_2] = 60000
+            assert tracker.poll() == 1
+            assert len(callback.batches[1]) == 1
+            assert future_2.result(0)['status'] == 1
+            assert tracker.poll() == 0
+            assert len(callback.batches) == 2
+        assert eth.gas_profiles.get_gas_limit('key') == \
+            int(50000 * eth.gas_profiles.multiplier)
+
+    def test_get_receipts(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        callback = _receipt_node({TX_HASH_1: 1, TX_HASH_2: 2, TX_HASH_3: 3})
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            receipts = eth.get_receipts([TX_HASH_3, TX_HASH_1, TX_HASH_2])
+        assert len(callback.batches) == 1
+        assert [receipt['gasUsed'] for receipt in receipts] == [3, 1, 2]
+
+    def test_wait_timeout(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        callback = _receipt_node({TX_HASH_1: 1})
+        tracker = ReceiptTracker(eth, poll_interval=0.01)
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            with pytest.raises(TimeExhausted) as error:
+                tracker.wait([TX_HASH_1, TX_HASH_2], timeout=0.05)
+        assert '1 of 2' in str(error.value)
+        assert len(tracker) == 1
+
+    def test_start_stop(self):
+        eth = Eth(LOCAL_NODE, PRIVATE_KEY_1, ADDRESS_1, 0)
+        mined = {}
+        callback = _receipt_node(mined)
+        tracker = ReceiptTracker(eth, poll_interval=0.01)
+        with requests_mock.mock() as rm:
+            rm.post(LOCAL_NODE, json=callback)
+            tracker.start()
+            tracker.start()
+            future = tracker.track(TX_HASH_1)
+            mined[TX_HASH_1] = 21000
+            assert future.result(5)['gasUsed'] == 21000
+            assert tracker.wait([TX_HASH_1], timeout=1) == [future.result()]
+            tracker.stop()
+        assert len(tracker) == 0
+        tracker.stop()
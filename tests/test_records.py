@@ -0,0 +1,134 @@
+import pytest
+from decimal import Decimal
+from dydx.records import Fill, Order, Trade, iso_to_epoch_ms
+
+FILL = {
+    'uuid': 'c389c0de-a193-49c3-843a-eebee25d1bfa',
+    'createdAt': '2020-03-08T17:42:36.037Z',
+    'transactionHash': '0x811cf67aca5fb8d085efcc47cd8213e767410866c7c840f2177391bf6e6b2fd0',  # noqa: E501
+    'status': 'CONFIRMED',
+    'market': 'PBTC-USDC',
+    'side': 'BUY',
+    'feeAmount': '-27',
+    'orderClientId': None,
+    'price': '8813.81',
+    'amount': '10000',
+    'orderId': '0x66a5b2d4bca3414ed902bd7cda0500df5947fadbfd48c280a206d44606c1c906',  # noqa: E501
+    'accountOwner': '0x0913017c740260fea4b2c62828a4008ca8b0d6e4',
+    'accountNumber': '0',
+    'liquidity': 'TAKER',
+}
+TRADE = {
+    'uuid': '9c575414-503f-4d19-97ba-7e329ce7c1f0',
+    'createdAt': '2020-03-08T17:42:36Z',
+    'transactionHash': '0x6376e4af2c2429a1f9fdb0bd46d022c074713c58007f4c36825ed2228cbf6ce2',  # noqa: E501
+    'status': 'CONFIRMED',
+    'market': 'WETH-PUSD',
+    'side': 'SELL',
+    'price': '0.004962779156327543424317617866',
+    'amount': '2015000000000000000',
+    'makerOrderId': '0xb5576698cd7ecca927bba833c60e66ae55585c3f9a722cef5fe6fd5cf80eee2a',  # noqa: E501
+    'makerAccountOwner': '0x5f5a46a8471f60b1e9f2ed0b8fc21ba8b48887d8',
+    'makerAccountNumber': '0',
+    'takerOrderId': '0x20cab002ade434d4e21cc7ff6144339c4b4f199bd1d35ec93813b19c7a03162b',  # noqa: E501
+    'takerAccountOwner': '0xf809e07870dca762b9536d61a4fbef1a17178092',
+    'takerAccountNumber': '2',
+}
+ORDER = {
+    'uuid': 'd13aadc8-49fb-4420-a5a0-03c15b668705',
+    'id': '0x2c45cdcd3bce2dd0f2b40502e6bea7975f6daa642d12d28620deb18736619fa2',  # noqa: E501
+    'clientId': 'my-order',
+    'status': 'OPEN',
+    'accountOwner': '0x0913017c740260fea4b2c62828a4008ca8b0d6e4',
+    'accountNumber': '0',
+    'orderType': 'PERPETUAL_LIMIT',
+    'fillOrKill': False,
+    'postOnly': True,
+    'triggerPrice': None,
+    'market': 'PBTC-USDC',
+    'side': 'BUY',
+    'baseAmount': '10000',
+    'quoteAmount': '881381',
+    'filledAmount': '0',
+    'price': '88.1381',
+    'cancelReason': None,
+    'createdAt': '2020-03-08T17:42:36.037Z',
+    'updatedAt': '2020-03-08T17:42:37.5Z',
+    'expiresAt': '2020-04-08T17:42:36.000Z',
+    'rawData': '{}',
+}
+
+
+class TestRecords():
+
+    # ------------ iso_to_epoch_ms ------------
+
+    def test_iso_to_epoch_ms(self):
+        assert iso_to_epoch_ms('2020-03-08T17:42:36.037Z') == 1583689356037
+        assert iso_to_epoch_ms('2020-03-08T17:42:36Z') == 1583689356000
+        assert iso_to_epoch_ms('2020-03-08T17:42:36.5Z') == 1583689356500
+        assert iso_to_epoch_ms('1970-01-01T00:00:00.000Z') == 0
+
+    def test_iso_to_epoch_ms_invalid(self):
+        for value in ['2020-03-08', '2020-03-08T17:42:36.037+01:00', 'x' * 24]:
+            with pytest.raises(ValueError):
+                iso_to_epoch_ms(value)
+
+    # ------------ Records ------------
+
+    def test_fill(self):
+        fill = Fill.from_json(FILL)
+        assert fill.createdAt == 1583689356037
+        assert fill.price == Decimal('8813.81')
+        assert fill.amount == 10000
+        assert fill.feeAmount == -27
+        assert fill.accountNumber == 0
+        assert fill.orderClientId is None
+        assert fill['market'] == 'PBTC-USDC'
+        assert not hasattr(fill, '__dict__')
+        with pytest.raises(AttributeError):
+            fill.extra = 1
+
+    def test_trade(self):
+        trade = Trade.from_json(TRADE)
+        assert trade.createdAt == 1583689356000
+        assert trade.price == Decimal('0.004962779156327543424317617866')
+        assert trade.amount == 2015000000000000000
+        assert trade.takerAccountNumber == 2
+
+    def test_order(self):
+        order = Order.from_json(ORDER)
+        assert order.postOnly is True
+        assert order.triggerPrice is None
+        assert order.cancelReason is None
+        assert order.updatedAt == 1583689357500
+        assert order.quoteAmount == 881381
+        assert 'rawData' not in order.as_dict()
+        with pytest.raises(KeyError):
+            order['rawData']
+
+    def test_missing_fields(self):
+        fill = Fill.from_json({'uuid': 'a'})
+        assert fill.uuid == 'a'
+        assert fill.price is None
+        assert fill.createdAt is None
+
+    def test_fractional_amount(self):
+        fill = Fill.from_json(dict(FILL, amount='0.5'))
+        assert fill.amount == Decimal('0.5')
+
+    def test_interned_strings(self):
+        first, second = Fill.from_json_list([
+            FILL,
+            dict(FILL, market=''.join(['PBTC', '-', 'USDC'])),
+        ])
+        assert first.market is second.market
+        assert first.accountOwner is second.accountOwner
+
+    def test_equality(self):
+        fill = Fill.from_json(FILL)
+        assert fill == Fill.from_json(dict(FILL))
+        assert fill != Fill.from_json(dict(FILL, amount='1'))
+        assert fill != Trade.from_json(FILL)
+        assert fill.as_dict()['price'] == Decimal('8813.81')
+        assert repr(fill).startswith("Fill(uuid='c389c0de")
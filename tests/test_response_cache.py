@@ -0,0 +1,59 @@
+import time
+from dydx.response_cache import ResponseCache
+
+
+class TestResponseCache():
+
+    def test_lookup(self):
+        cache = ResponseCache(ttl=60, stale_ttl=60, ttls={'get_market': 0})
+        assert cache.lookup('get_markets', '/v2/markets') is None
+        cache.store('/v2/markets', {'markets': {}})
+        cache.store('/v2/markets/WETH-DAI', {'market': {}})
+        assert len(cache) == 2
+        assert cache.lookup('get_markets', '/v2/markets') == \
+            ({'markets': {}}, False)
+        assert cache.lookup('get_market', '/v2/markets/WETH-DAI') == \
+            ({'market': {}}, True)
+
+        cache.stale_ttl = 0
+        assert cache.lookup('get_market', '/v2/markets/WETH-DAI') is None
+
+    def test_refresh(self):
+        cache = ResponseCache()
+        assert cache.begin_refresh('/v2/markets')
+        assert not cache.begin_refresh('/v2/markets')
+        cache.end_refresh('/v2/markets', {'markets': {}})
+        assert cache.lookup('get_markets', '/v2/markets') == \
+            ({'markets': {}}, False)
+
+        # A failed refresh keeps the old response
+        assert cache.begin_refresh('/v2/markets')
+        cache.end_refresh('/v2/markets')
+        assert cache.lookup('get_markets', '/v2/markets') == \
+            ({'markets': {}}, False)
+
+        # A refresh that finishes after invalidation is dropped
+        assert cache.begin_refresh('/v2/markets/WETH-DAI')
+        cache.invalidate('/v2/markets')
+        cache.end_refresh('/v2/markets/WETH-DAI', {'market': {}})
+        assert len(cache) == 0
+        assert cache.begin_refresh('/v2/markets/WETH-DAI')
+
+    def test_invalidate(self):
+        cache = ResponseCache()
+        cache.store('/v2/markets', {})
+        cache.store('/v2/markets/WETH-DAI', {})
+        cache.store('/v1/perpetual-markets', {})
+        cache.invalidate('/v2/markets/')
+        assert cache.lookup('get_markets', '/v2/markets') is not None
+        assert cache.lookup('get_market', '/v2/markets/WETH-DAI') is None
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def test_expiry(self):
+        cache = ResponseCache(ttl=0.01, stale_ttl=0.01)
+        cache.store('/v2/markets', {})
+        time.sleep(0.01)
+        assert cache.lookup('get_markets', '/v2/markets') == ({}, True)
+        time.sleep(0.01)
+        assert cache.lookup('get_markets', '/v2/markets') is None
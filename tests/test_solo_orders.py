@@ -1,4 +1,5 @@
 import dydx.solo_orders as solo_orders
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
 
 PRIVATE_KEY_1 = '0x4f3edf983ac636a65a842ce7c78d9aa706d3b113bce9c46f30d7d21715b23b1d'  # noqa: E501
@@ -36,6 +37,12 @@ class TestSoloOrders():
         hash = solo_orders.get_cancel_order_hash(ORDER_HASH)
         assert hash == CANCEL_ORDER_HASH
 
+    def test_solo_orders_get_cancel_orders_hash(self):
+        hash = solo_orders.get_cancel_orders_hash([ORDER_HASH])
+        assert hash == CANCEL_ORDER_HASH
+        hash = solo_orders.get_cancel_orders_hash([ORDER_HASH, ORDER_HASH])
+        assert hash != CANCEL_ORDER_HASH
+
     def test_solo_orders_sign_order(self):
         signature = solo_orders.sign_order(
             order=ORDER,
@@ -49,3 +56,35 @@ class TestSoloOrders():
             private_key=PRIVATE_KEY_1
         )
         assert signature == CANCEL_ORDER_SIGNATURE
+
+    def test_solo_orders_sign_cancel_orders(self):
+        signature = solo_orders.sign_cancel_orders(
+            order_hashes=[ORDER_HASH],
+            private_key=PRIVATE_KEY_1
+        )
+        assert signature == CANCEL_ORDER_SIGNATURE
+
+    def test_solo_orders_sign_orders(self):
+        orders = [ORDER, dict(ORDER, salt=1), dict(ORDER, isBuy=False)]
+        signed_orders = solo_orders.sign_orders(
+            orders=orders,
+            private_key=PRIVATE_KEY_1
+        )
+        assert signed_orders[0]['typedSignature'] == ORDER_SIGNATURE
+        for order, signed_order in zip(orders, signed_orders):
+            assert 'typedSignature' not in order
+            assert signed_order['typedSignature'] == \
+                solo_orders.sign_order(order, PRIVATE_KEY_1)
+
+    def test_solo_orders_sign_orders_executor(self):
+        orders = [dict(ORDER, salt=salt) for salt in range(5)]
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            signed_orders = solo_orders.sign_orders(
+                orders=orders,
+                private_key=PRIVATE_KEY_1,
+                executor=executor
+            )
+        assert signed_orders == solo_orders.sign_orders(
+            orders=orders,
+            private_key=PRIVATE_KEY_1
+        )
@@ -1,3 +1,4 @@
+import pickle
 import pytest
 import dydx.util as utils
 import dydx.constants as consts
@@ -55,6 +56,20 @@ class TestUtil():
         )
         assert signature == CANCEL_ORDER_SIGNATURE
 
+    def test_signer(self):
+        signer = utils.Signer(PRIVATE_KEY_1)
+        assert signer.address == ADDRESS_1
+        assert signer.sign_digest(bytes.fromhex(ORDER_HASH[2:])) == \
+            ORDER_SIGNATURE
+        assert signer.sign_hash(CANCEL_ORDER_HASH) == CANCEL_ORDER_SIGNATURE
+        assert utils.get_signer(signer) is signer
+        assert utils.sign_hash(ORDER_HASH, signer) == ORDER_SIGNATURE
+
+    def test_signer_pickle(self):
+        signer = pickle.loads(pickle.dumps(utils.Signer(PRIVATE_KEY_1)))
+        assert signer.address == ADDRESS_1
+        assert signer.sign_hash(ORDER_HASH) == ORDER_SIGNATURE
+
     def test_token_to_wei(self):
         assert utils.token_to_wei(11, consts.MARKET_WETH) == \
             11 * (10 ** 18)
@@ -62,3 +77,11 @@ class TestUtil():
             22 * (10 ** 18)
         assert utils.token_to_wei(33, consts.MARKET_USDC) == \
             33 * (10 ** 6)
+
+    def test_iso_after(self):
+        assert utils.iso_after('2020-03-08T17:42:36.037Z') == \
+            '2020-03-08T17:42:36.038Z'
+        assert utils.iso_after('2020-12-31T23:59:59.999Z') == \
+            '2021-01-01T00:00:00.000Z'
+        assert utils.iso_after('2020-03-08T17:42:36Z') == \
+            '2020-03-08T17:42:36.001Z'